@@ -0,0 +1,303 @@
+"""Benchmark the datamodels and the client offline, and catch regressions."""
+
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pydantic
+
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.base import _type_adapter
+from voltage_park_sdk.datamodel.baremetal import (
+    BaremetalRentalCreatePayload,
+    BaremetalRentals,
+)
+from voltage_park_sdk.datamodel.billing import (
+    BillingTransactionsResponse,
+    MonthlyBillingReport,
+)
+from voltage_park_sdk.datamodel.virtual_machines import (
+    VirtualMachineDeployPayload,
+    VirtualMachines,
+)
+from voltage_park_sdk.recording import Cassette, ReplayAdapter, replay_traffic
+from voltage_park_sdk.testing import payloads
+
+BASELINE = Path(__file__).parent.parent / "benchmarks" / "baseline.json"
+
+# Each benchmark returns how many items it processed per call.
+type Benchmark = Callable[[], int]
+
+
+def reference_benchmark(size: int) -> Benchmark:
+    # Round-trips a response body through the standard library's json module,
+    # which involves none of the SDK. Results are saved as ratios to its
+    # throughput so that baselines carry over between machines.
+    content = json.dumps(payloads.virtual_machines(size))
+    return lambda: (json.dumps(json.loads(content)), size)[1]
+
+
+def validation_benchmarks(size: int) -> dict[str, Benchmark]:
+    # Validates the raw JSON body of a response, as the client does.
+    def validate(model: Any, payload: dict[str, Any]) -> Benchmark:
+        content = json.dumps(payload).encode()
+        adapter = _type_adapter(model)
+        return lambda: (adapter.validate_json(content), size)[1]
+
+    return {
+        "validate VirtualMachines": validate(
+            VirtualMachines, payloads.virtual_machines(size)
+        ),
+        "validate BaremetalRentals": validate(
+            BaremetalRentals, payloads.baremetal_rentals(size)
+        ),
+        "validate BillingTransactionsResponse": validate(
+            BillingTransactionsResponse, payloads.billing_transactions(size)
+        ),
+        "validate MonthlyBillingReport": validate(
+            MonthlyBillingReport, payloads.monthly_billing_report(size)
+        ),
+    }
+
+
+def serialization_benchmarks(size: int) -> dict[str, Benchmark]:
+    # Builds and encodes create payloads from keyword arguments, as the
+    # post_* methods do.
+    vm_kwargs = [payloads.virtual_machine_deploy_kwargs(i) for i in range(size)]
+    rental_kwargs = [payloads.baremetal_rental_create_kwargs(i) for i in range(size)]
+
+    def serialize(model: Any, batch: list[dict[str, Any]]) -> Benchmark:
+        def run() -> int:
+            for kwargs in batch:
+                json.dumps(model(**kwargs).model_dump())
+            return size
+
+        return run
+
+    return {
+        "serialize VirtualMachineDeployPayload": serialize(
+            VirtualMachineDeployPayload, vm_kwargs
+        ),
+        "serialize BaremetalRentalCreatePayload": serialize(
+            BaremetalRentalCreatePayload, rental_kwargs
+        ),
+    }
+
+
+def client_benchmarks(client: VoltageParkClient) -> dict[str, Benchmark]:
+    # Whole client calls against the local stub, so these include the HTTP
+    # round trip over loopback.
+    def post_virtual_machine() -> int:
+        client.post_virtual_machine(**payloads.virtual_machine_deploy_kwargs(0))
+        return 1
+
+    return {
+        "client get_virtual_machines": lambda: len(
+            client.get_virtual_machines().results
+        ),
+        "client get_baremetal_rentals": lambda: len(
+            client.get_baremetal_rentals().results
+        ),
+        "client get_billing_transactions": lambda: len(
+            client.get_billing_transactions().results
+        ),
+        "client get_monthly_billing_report": lambda: len(
+            client.get_monthly_billing_report(2025, 1).transactions
+        ),
+        "client stream_billing_transactions": lambda: sum(
+            1 for _ in client.stream_billing_transactions()
+        ),
+        "client post_virtual_machine": post_virtual_machine,
+    }
+
+
+def replay_benchmark(path: Path) -> Benchmark:
+    # Replays recorded traffic as fast as possible, with no network, so this
+    # only measures the SDK's own overhead per request.
+    cassette = Cassette.load(path)
+    transport = ReplayAdapter(cassette, speed=None)
+    client = VoltageParkClient(token="benchmark", transport=transport)  # noqa: S106
+    return lambda: len(replay_traffic(client, cassette, speed=None).latencies)
+
+
+def measure(benchmark: Benchmark, min_time: float, repeat: int) -> float:
+    # Returns the best throughput, in items per second, of `repeat` rounds
+    # that each run the benchmark for at least min_time seconds.
+    benchmark()
+    best = 0.0
+    for _ in range(repeat):
+        items = 0
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < min_time:
+            items += benchmark()
+        best = max(best, items / elapsed)
+    return best
+
+
+@contextmanager
+def stub_server(size: int) -> Iterator[str]:
+    # Serves canned responses for the endpoints benchmarked above.
+    responses = {
+        "/virtual-machines/": payloads.virtual_machines(size),
+        "/bare-metal/": payloads.baremetal_rentals(size),
+        "/billing/transactions/": payloads.billing_transactions(size),
+        "/billing/reports/2025/1/transactions": payloads.monthly_billing_report(size),
+        "/virtual-machines/instant": {"vm_id": "vm-1"},
+    }
+    bodies = {path: json.dumps(body).encode() for path, body in responses.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Otherwise the body waits for the ACK of the headers, which the
+        # client delays by ~40 ms, and that would swamp everything else.
+        disable_nagle_algorithm = True
+
+        def respond(self) -> None:
+            # The client sends its parameters as a JSON body, even on GET.
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            body = bodies.get(self.path, b"{}")
+            self.send_response(200 if self.path in bodies else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = respond  # noqa: N815
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    # Returns the benchmarks whose throughput, relative to the reference,
+    # dropped by more than tolerance.
+    return [
+        name
+        for name, value in results.items()
+        if name in baseline and value < baseline[name] * (1 - tolerance)
+    ]
+
+
+def environment(size: int) -> dict[str, Any]:
+    # Saved with the results: they are only comparable between runs with the
+    # same payload size, and can shift with the Python or pydantic version.
+    return {
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "size": size,
+    }
+
+
+def check_baseline(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    # Refuses to compare against results for another payload size, and warns
+    # when they come from another environment.
+    if baseline.get("size") != current["size"]:
+        sys.exit(
+            f"The baseline was measured with --size {baseline.get('size')}, "
+            f"not {current['size']}; run with the same size to compare."
+        )
+    if "reference" not in baseline:
+        sys.exit(
+            "The baseline holds absolute throughput from an older version of "
+            "this script; save it again with --save."
+        )
+    for key in ("python", "pydantic"):
+        if baseline.get(key) != current[key]:
+            print(  # noqa: T201
+                f"Warning: the baseline was measured with {key} "
+                f"{baseline.get(key)}, this run uses {current[key]}.",
+                file=sys.stderr,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1000, help="Items per payload.")
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-k", "--filter", default="", help="Only run these.")
+    parser.add_argument("--save", type=Path, help="Write the results here.")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=BASELINE,
+        help=f"Fail on regressions against saved results. Defaults to {BASELINE}.",
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--cassette",
+        type=Path,
+        action="append",
+        default=[],
+        help="Also replay the traffic recorded in this cassette.",
+    )
+    args = parser.parse_args()
+    current = environment(args.size)
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        check_baseline(baseline, current)
+
+    reference = reference_benchmark(args.size)
+    with (
+        stub_server(args.size) as url,
+        VoltageParkClient(token="benchmark", api_url=url) as client,  # noqa: S106
+    ):
+        benchmarks = (
+            validation_benchmarks(args.size)
+            | serialization_benchmarks(args.size)
+            | client_benchmarks(client)
+        )
+        for path in args.cassette:
+            benchmarks[f"replay {path.name}"] = replay_benchmark(path)
+        # The reference is measured before and after the others, and the
+        # best of both kept, to even out frequency scaling during the run.
+        before = measure(reference, args.min_time, args.repeat)
+        throughput: dict[str, float] = {}
+        for name, benchmark in benchmarks.items():
+            if args.filter in name:
+                throughput[name] = measure(benchmark, args.min_time, args.repeat)
+        speed = max(before, measure(reference, args.min_time, args.repeat))
+
+    results = {name: value / speed for name, value in throughput.items()}
+    print(f"{'reference json round-trip':45} {speed:12,.0f} items/s")  # noqa: T201
+    for name, value in throughput.items():
+        print(  # noqa: T201
+            f"{name:45} {value:12,.0f} items/s {results[name]:8.3f}x reference"
+        )
+
+    if args.save:
+        saved = current | {"reference": speed, "results": results}
+        args.save.write_text(json.dumps(saved, indent=2) + "\n")
+    if args.compare:
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for name in regressions:
+            print(  # noqa: T201
+                f"Regression: {name} dropped from {baseline['results'][name]:.3f}x "
+                f"to {results[name]:.3f}x the reference throughput"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Measure how long it takes to import the SDK in a fresh interpreter.
+
+With --max-ms, exit with an error if any module takes longer than that.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = [
+    "voltage_park_sdk",
+    "voltage_park_sdk.cli",
+    "voltage_park_sdk.client",
+    "voltage_park_sdk.async_client",
+]
+
+
+def import_time(module: str, runs: int) -> float:
+    # Start-up of a bare interpreter is subtracted, so that only the cost of
+    # the import itself is reported.
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+        return time.perf_counter() - start
+
+    baseline = statistics.median(run("pass") for _ in range(runs))
+    return statistics.median(run(f"import {module}") for _ in range(runs)) - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="fail if importing any of the modules takes longer than this",
+    )
+    args = parser.parse_args()
+    too_slow = []
+    for module in args.modules:
+        elapsed = import_time(module, args.runs) * 1000
+        over = args.max_ms is not None and elapsed > args.max_ms
+        if over:
+            too_slow.append(module)
+        print(f"{module:40} {elapsed:8.1f} ms{'  over budget' if over else ''}")  # noqa: T201
+    if too_slow:
+        sys.exit(f"Over the {args.max_ms} ms budget: {', '.join(too_slow)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,47 @@
-from voltage_park_sdk.client import VoltageParkClient
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["VoltageParkClient"]
+if TYPE_CHECKING:
+    from voltage_park_sdk.async_client import AsyncVoltageParkClient
+    from voltage_park_sdk.cache import DiskCache, ResponseCache
+    from voltage_park_sdk.client import VoltageParkClient
+    from voltage_park_sdk.metrics import MetricsRegistry
+    from voltage_park_sdk.profiling import Profiler
+    from voltage_park_sdk.retry import RateLimiter, RetryPolicy
+
+__all__ = [
+    "AsyncVoltageParkClient",
+    "DiskCache",
+    "MetricsRegistry",
+    "Profiler",
+    "RateLimiter",
+    "ResponseCache",
+    "RetryPolicy",
+    "VoltageParkClient",
+]
+
+# The public names are imported on first use, so that importing a submodule
+# such as voltage_park_sdk.cli doesn't pull in requests, httpx and pydantic.
+_MODULES = {
+    "AsyncVoltageParkClient": "voltage_park_sdk.async_client",
+    "DiskCache": "voltage_park_sdk.cache",
+    "MetricsRegistry": "voltage_park_sdk.metrics",
+    "Profiler": "voltage_park_sdk.profiling",
+    "RateLimiter": "voltage_park_sdk.retry",
+    "ResponseCache": "voltage_park_sdk.cache",
+    "RetryPolicy": "voltage_park_sdk.retry",
+    "VoltageParkClient": "voltage_park_sdk.client",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(_MODULES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,218 @@
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from typing import Any, Literal, Self
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as e:  # pragma: no cover
+    msg = (
+        "voltage_park_sdk.analytics requires numpy. "
+        "Install it with `pip install voltage-park-sdk[analytics]`."
+    )
+    raise ImportError(msg) from e
+
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.datamodel.billing import (
+    BillingResourceTypeOptions,
+    BillingTransactionsPayload,
+)
+from voltage_park_sdk.pagination import iter_raw_items
+
+# Amounts are stored as integer multiples of 10**-AMOUNT_SCALE so that sums
+# are exact. Amounts with more decimal places than this are rejected.
+AMOUNT_SCALE = 6
+
+GroupKey = Literal["resource", "type", "day"]
+AmountColumn = Literal["total_amount", "period_amount"]
+
+
+def parse_amount(value: str) -> int:
+    scaled = Decimal(value).scaleb(AMOUNT_SCALE)
+    if scaled != scaled.to_integral_value():
+        msg = f"{value} has more than {AMOUNT_SCALE} decimal places"
+        raise ValueError(msg)
+    return int(scaled)
+
+
+def format_amount(value: int) -> Decimal:
+    return Decimal(value).scaleb(-AMOUNT_SCALE)
+
+
+def _timestamp(value: str | None) -> np.datetime64:
+    # numpy doesn't accept the trailing Z, and None becomes NaT.
+    if value is None:
+        return np.datetime64("NaT", "us")
+    return np.datetime64(value.removesuffix("Z"), "us")
+
+
+@dataclass(frozen=True)
+class TransactionTable:
+    """Billing transactions as NumPy columns, one entry per transaction.
+
+    The `details` union is flattened into `type`, `linked_instance_id`,
+    `virtual_machine_id` and `baremetal_rental_id` columns (empty strings when
+    a transaction doesn't have one), and amounts are exact scaled integers.
+    """
+
+    id: npt.NDArray[np.str_]
+    type: npt.NDArray[np.str_]
+    linked_instance_id: npt.NDArray[np.str_]
+    virtual_machine_id: npt.NDArray[np.str_]
+    baremetal_rental_id: npt.NDArray[np.str_]
+    timestamp_creation: npt.NDArray[np.datetime64]
+    timestamp_completion: npt.NDArray[np.datetime64]
+    total_amount: npt.NDArray[np.int64]
+    period_amount: npt.NDArray[np.int64]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> Self:
+        # Build the columns straight from the decoded JSON, without creating a
+        # BillingTransaction model per row.
+        columns: dict[str, list[Any]] = {field.name: [] for field in fields(cls)}
+        for record in records:
+            details = record["details"]
+            linked_instance = details.get("linked_instance") or {}
+            columns["id"].append(record["id"])
+            columns["type"].append(details["type"])
+            columns["linked_instance_id"].append(linked_instance.get("id", ""))
+            columns["virtual_machine_id"].append(
+                linked_instance.get("virtual_machine_id", "")
+            )
+            columns["baremetal_rental_id"].append(
+                linked_instance.get("baremetal_rental_id", "")
+            )
+            columns["timestamp_creation"].append(
+                _timestamp(record["timestamp_creation"])
+            )
+            columns["timestamp_completion"].append(
+                _timestamp(record.get("timestamp_completion"))
+            )
+            columns["total_amount"].append(parse_amount(record["total_amount"]))
+            columns["period_amount"].append(parse_amount(record["period_amount"]))
+        return cls(
+            id=np.array(columns["id"], dtype=np.str_),
+            type=np.array(columns["type"], dtype=np.str_),
+            linked_instance_id=np.array(columns["linked_instance_id"], dtype=np.str_),
+            virtual_machine_id=np.array(columns["virtual_machine_id"], dtype=np.str_),
+            baremetal_rental_id=np.array(columns["baremetal_rental_id"], dtype=np.str_),
+            timestamp_creation=np.array(
+                columns["timestamp_creation"], dtype="datetime64[us]"
+            ),
+            timestamp_completion=np.array(
+                columns["timestamp_completion"], dtype="datetime64[us]"
+            ),
+            total_amount=np.array(columns["total_amount"], dtype=np.int64),
+            period_amount=np.array(columns["period_amount"], dtype=np.int64),
+        )
+
+    @classmethod
+    def from_transactions(
+        cls,
+        client: VoltageParkClient,
+        types: list[BillingResourceTypeOptions] | None = None,
+        earliest: str | None = None,
+        latest: str | None = None,
+        page_size: int = 500,
+    ) -> Self:
+        return cls.from_records(
+            _iter_raw_transactions(client, types, earliest, latest, page_size)
+        )
+
+    @classmethod
+    def from_monthly_report(
+        cls,
+        client: VoltageParkClient,
+        year: int,
+        month: int,
+    ) -> Self:
+        report = client.get(f"billing/reports/{year}/{month}/transactions")
+        return cls.from_records(report["transactions"])
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @property
+    def resource_id(self) -> npt.NDArray[np.str_]:
+        # The VM or rental a transaction is for, falling back to the linked
+        # instance (e.g. a storage volume).
+        resource = np.where(
+            self.virtual_machine_id != "",
+            self.virtual_machine_id,
+            self.baremetal_rental_id,
+        )
+        return np.where(resource != "", resource, self.linked_instance_id)
+
+    @property
+    def day(self) -> npt.NDArray[np.datetime64]:
+        return self.timestamp_creation.astype("datetime64[D]")
+
+    def filter(self, mask: npt.NDArray[np.bool_]) -> Self:
+        return type(self)(
+            **{field.name: getattr(self, field.name)[mask] for field in fields(self)}
+        )
+
+    def total(self, amount: AmountColumn = "total_amount") -> Decimal:
+        return format_amount(int(getattr(self, amount).sum()))
+
+    def group_by(
+        self,
+        key: GroupKey,
+        amount: AmountColumn = "total_amount",
+    ) -> dict[str, Decimal]:
+        keys = {
+            "resource": self.resource_id,
+            "type": self.type,
+            "day": self.day.astype(np.str_),
+        }[key]
+        groups, sums = _group_sum(keys, getattr(self, amount))
+        return {
+            str(group): format_amount(int(total))
+            for group, total in zip(groups, sums, strict=False)
+        }
+
+    def burn_rate(
+        self,
+        amount: AmountColumn = "period_amount",
+    ) -> tuple[npt.NDArray[np.datetime64], list[Decimal]]:
+        # Daily totals for every day between the first and last transaction,
+        # including days without any transactions.
+        if not len(self):
+            return np.array([], dtype="datetime64[D]"), []
+        days = self.day
+        first = days.min()
+        index = (days - first).astype(np.int64)
+        sums = np.zeros(int(index.max()) + 1, dtype=np.int64)
+        np.add.at(sums, index, getattr(self, amount))
+        series = first + np.arange(len(sums))
+        return series, [format_amount(int(total)) for total in sums]
+
+
+def _group_sum(
+    keys: npt.NDArray[Any],
+    values: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[Any], npt.NDArray[np.int64]]:
+    groups, inverse = np.unique(keys, return_inverse=True)
+    sums = np.zeros(len(groups), dtype=np.int64)
+    # np.add.at rather than np.bincount, which would sum in float64.
+    np.add.at(sums, inverse, values)
+    return groups, sums
+
+
+def _iter_raw_transactions(
+    client: VoltageParkClient,
+    types: list[BillingResourceTypeOptions] | None,
+    earliest: str | None,
+    latest: str | None,
+    page_size: int,
+) -> Iterator[dict[str, Any]]:
+    params = BillingTransactionsPayload(
+        types=types, earliest=earliest, latest=latest
+    ).model_dump(exclude={"limit", "offset"})
+    return iter_raw_items(
+        lambda limit, offset: client.get(
+            "billing/transactions/", limit=limit, offset=offset, **params
+        ),
+        page_size,
+    )
@@ -0,0 +1,880 @@
+# We are incrementally adding methods to the client as we need them, but
+# writing method signatures for the whole API, so we need to ignore unused
+# args and variables for the time being.
+# ruff: noqa: ARG002, F841
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import Any, Self
+
+import httpx
+from pydantic import BaseModel, TypeAdapter
+
+from voltage_park_sdk.base import (
+    API_URL,
+    BaseVoltageParkClient,
+    Operation,
+    _type_adapter,
+)
+from voltage_park_sdk.cache import Cache
+from voltage_park_sdk.datamodel.baremetal import (
+    BaremetalCloudInit,
+    BaremetalLocations,
+    BaremetalNetworkTypeOptions,
+    BaremetalRental,
+    BaremetalRentalCreatePayload,
+    BaremetalRentalCreateResponse,
+    BaremetalRentalPatchPayload,
+    BaremetalRentalPatchResponse,
+    BaremetalRentalPowerStatusPayload,
+    BaremetalRentalPutPowerStatusOptions,
+    BaremetalRentalRebootNodesPayload,
+    BaremetalRentalRemoveNodesPayload,
+    BaremetalRentals,
+)
+from voltage_park_sdk.datamodel.billing import (
+    BillingHourlyRate,
+    BillingResourceTypeOptions,
+    BillingTransaction,
+    BillingTransactionsPayload,
+    BillingTransactionsResponse,
+    MonthlyBillingReport,
+)
+from voltage_park_sdk.datamodel.organization import (
+    Organization,
+    OrganizationPatchPayload,
+    OrganizationPatchResponse,
+    SSHKey,
+    SSHKeyCreatePayload,
+    SSHKeyCreateResponse,
+    SSHKeys,
+)
+from voltage_park_sdk.datamodel.shared import (
+    ListResponse,
+    OrganizationSSHKey,
+    get_organization_ssh_key,
+)
+from voltage_park_sdk.datamodel.storage import (
+    StorageHourlyRate,
+    StorageVolume,
+    StorageVolumeCreatePayload,
+    StorageVolumeCreateResponse,
+    StorageVolumeGetResponse,
+    StorageVolumePatchPayload,
+    StorageVolumePatchResponse,
+    StorageVolumesGetResponse,
+)
+from voltage_park_sdk.datamodel.validation import (
+    CloudinitValidationPayload,
+    CloudinitValidationResponse,
+    CloudinitValidationTypeOptions,
+)
+from voltage_park_sdk.datamodel.virtual_machines import (
+    VirtualMachine,
+    VirtualMachineCloudInit,
+    VirtualMachineDeployPayload,
+    VirtualMachineDeployResponse,
+    VirtualMachineLocation,
+    VirtualMachineLocations,
+    VirtualMachinePatchPayload,
+    VirtualMachinePatchResponse,
+    VirtualMachinePowerStatusOptions,
+    VirtualMachinePowerStatusPayload,
+    VirtualMachinePowerStatusResponse,
+    VirtualMachines,
+)
+from voltage_park_sdk.metrics import MetricsRegistry
+from voltage_park_sdk.pagination import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    afetch_all,
+    aiter_items,
+)
+from voltage_park_sdk.profiling import CallProfile, Profiler, current_profile
+from voltage_park_sdk.retry import RateLimiter, RetryPolicy
+from voltage_park_sdk.streaming import STREAM_CHUNK_SIZE, AsyncStreamedList
+
+
+class AsyncVoltageParkClient(BaseVoltageParkClient):
+    def __init__(  # noqa: PLR0913
+        self,
+        token: str | Path,
+        *,
+        timeout: float | tuple[float, float] = 10,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: Cache | None = None,
+        metrics: MetricsRegistry | None = None,
+        profiler: Profiler | None = None,
+        api_url: str = API_URL,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+    ) -> None:
+        super().__init__(
+            token,
+            timeout=timeout,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            metrics=metrics,
+            profiler=profiler,
+            api_url=api_url,
+        )
+        self._max_connections = max_connections
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            http_timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            http_timeout = httpx.Timeout(timeout)
+
+        # Every coroutine using this client shares a single connection pool.
+        self._client = httpx.AsyncClient(
+            timeout=http_timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+    ################
+    # Organization #
+    ################
+
+    async def get_organization(self) -> Organization:
+        endpoint = "organization"
+        return await self._get_model(endpoint, Organization)
+
+    async def patch_organization(
+        self,
+        billing_notification_target_emails: list[str],
+    ) -> Organization:
+        payload = OrganizationPatchPayload(
+            billing_notification_target_emails=billing_notification_target_emails,
+        )
+        endpoint = "organization"
+        return await self._request_model(
+            "patch", endpoint, OrganizationPatchResponse, payload=payload
+        )
+
+    async def get_ssh_keys(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> SSHKeys:
+        endpoint = "organization/ssh-keys"
+        return await self._get_model(endpoint, SSHKeys, limit=limit, offset=offset)
+
+    def iter_ssh_keys(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[SSHKey]:
+        return aiter_items(
+            lambda limit, offset: self.get_ssh_keys(limit=limit, offset=offset),
+            page_size,
+        )
+
+    async def post_ssh_key(
+        self,
+        name: str,
+        content: str,
+    ) -> SSHKeyCreateResponse:
+        payload = SSHKeyCreatePayload(
+            name=name,
+            content=content,
+        )
+        endpoint = "organization/ssh-keys"
+        return await self._request_model(
+            "post", endpoint, SSHKeyCreateResponse, payload=payload
+        )
+
+    async def delete_ssh_key(self, ssh_key_id: str) -> Any:
+        endpoint = f"organization/ssh-keys/{ssh_key_id}"
+        # Don't decode the response, as it's None if the key was deleted
+        # and we want the raw response if there was an error
+        return await self.delete(endpoint)
+
+    ####################
+    # Virtual machines #
+    ####################
+
+    async def get_virtual_machine_locations(self) -> VirtualMachineLocations:
+        endpoint = "virtual-machines/instant/locations/"
+        return await self._get_model(endpoint, VirtualMachineLocations)
+
+    async def get_virtual_machine_location(
+        self,
+        location_id: str,
+    ) -> VirtualMachineLocation:
+        endpoint = f"virtual-machines/instant/locations/{location_id}"
+        return await self._get_model(endpoint, VirtualMachineLocation)
+
+    async def post_virtual_machine(  # noqa: PLR0913
+        self,
+        config_id: str,
+        name: str,
+        password: str | None = None,
+        organization_ssh_keys: OrganizationSSHKey | dict[str, Any] | None = None,
+        ssh_keys: list[str] | None = None,
+        cloud_init: VirtualMachineCloudInit | dict[str, Any] | None = None,
+        tags: list[str] | None = None,
+    ) -> VirtualMachineDeployResponse:
+        organization_ssh_keys = get_organization_ssh_key(organization_ssh_keys)
+        if isinstance(cloud_init, dict):
+            cloud_init = VirtualMachineCloudInit(**cloud_init)
+
+        payload = VirtualMachineDeployPayload(
+            config_id=config_id,
+            name=name,
+            password=password,
+            organization_ssh_keys=organization_ssh_keys,
+            ssh_keys=ssh_keys,
+            cloud_init=cloud_init,
+            tags=tags,
+        )
+        endpoint = "virtual-machines/instant"
+        return await self._request_model(
+            "post", endpoint, VirtualMachineDeployResponse, payload=payload
+        )
+
+    async def get_virtual_machines(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> VirtualMachines:
+        endpoint = "virtual-machines/"
+        return await self._get_model(
+            endpoint, VirtualMachines, limit=limit, offset=offset
+        )
+
+    def iter_virtual_machines(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[VirtualMachine]:
+        return aiter_items(
+            lambda limit, offset: self.get_virtual_machines(limit=limit, offset=offset),
+            page_size,
+        )
+
+    async def stream_virtual_machines(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> AsyncStreamedList[VirtualMachine]:
+        endpoint = "virtual-machines/"
+        return await self._stream_list(
+            endpoint,
+            "results",
+            _type_adapter(VirtualMachine),
+            limit=limit,
+            offset=offset,
+        )
+
+    async def get_virtual_machine(self, virtual_machine_id: str) -> VirtualMachine:
+        endpoint = f"virtual-machines/{virtual_machine_id}"
+        return await self._get_model(endpoint, VirtualMachine)
+
+    async def patch_virtual_machine(
+        self,
+        virtual_machine_id: str,
+        name: str | None = None,
+        tags: list[str] | None = None,
+    ) -> VirtualMachinePatchResponse:
+        payload = VirtualMachinePatchPayload(
+            name=name,
+            tags=tags,
+        )
+        endpoint = f"virtual-machines/{virtual_machine_id}"
+        return await self._request_model(
+            "patch", endpoint, VirtualMachinePatchResponse, payload=payload
+        )
+
+    async def delete_virtual_machine(self, virtual_machine_id: str) -> Any:
+        endpoint = f"virtual-machines/{virtual_machine_id}"
+        # Don't decode the response, as it's None if the VM was deleted
+        # and we want the raw response if there was an error
+        return await self.delete(endpoint)
+
+    async def put_vm_power_status(
+        self,
+        virtual_machine_id: str,
+        status: VirtualMachinePowerStatusOptions,
+    ) -> VirtualMachinePowerStatusResponse:
+        payload = VirtualMachinePowerStatusPayload(status=status)
+        endpoint = f"virtual-machines/{virtual_machine_id}/power-status"
+        return await self._request_model(
+            "put", endpoint, VirtualMachinePowerStatusResponse, payload=payload
+        )
+
+    async def post_relocate_virtual_machine(
+        self,
+        virtual_machine_id: str,
+    ) -> Any:
+        endpoint = f"virtual-machines/{virtual_machine_id}/relocate"
+        # Don't decode the response, as it's None if the VM was relocated
+        # and we want the raw response if there was an error
+        return await self.post(endpoint)
+
+    #####################
+    # Baremetal rentals #
+    #####################
+
+    async def get_baremetal_locations(self) -> BaremetalLocations:
+        endpoint = "bare-metal/locations/"
+        return await self._get_model(endpoint, BaremetalLocations)
+
+    async def post_baremetal_rental(  # noqa: PLR0913
+        self,
+        location_id: str,
+        gpu_count: int,
+        name: str,
+        network_type: BaremetalNetworkTypeOptions,
+        organization_ssh_keys: OrganizationSSHKey | dict[str, Any] | None = None,
+        ssh_keys: list[str] | None = None,
+        suborder: int | None = None,
+        storage_id: str | None = None,
+        tags: list[str] | None = None,
+        cloudinit_script: BaremetalCloudInit | dict[str, Any] | None = None,
+    ) -> BaremetalRentalCreateResponse:
+        organization_ssh_keys = get_organization_ssh_key(organization_ssh_keys)
+        if isinstance(cloudinit_script, dict):
+            cloudinit_script = BaremetalCloudInit(**cloudinit_script)
+
+        endpoint = "bare-metal/"
+        payload = BaremetalRentalCreatePayload(
+            location_id=location_id,
+            gpu_count=gpu_count,
+            name=name,
+            organization_ssh_keys=organization_ssh_keys,
+            ssh_keys=ssh_keys,
+            network_type=network_type,
+            suborder=suborder,
+            storage_id=storage_id,
+            tags=tags,
+            cloudinit_script=cloudinit_script,
+        )
+        return await self._request_model(
+            "post", endpoint, BaremetalRentalCreateResponse, payload=payload
+        )
+
+    async def get_baremetal_rentals(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> BaremetalRentals:
+        endpoint = "bare-metal/"
+        return await self._get_model(
+            endpoint, BaremetalRentals, limit=limit, offset=offset
+        )
+
+    def iter_baremetal_rentals(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[BaremetalRental]:
+        return aiter_items(
+            lambda limit, offset: self.get_baremetal_rentals(
+                limit=limit, offset=offset
+            ),
+            page_size,
+        )
+
+    async def stream_baremetal_rentals(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> AsyncStreamedList[BaremetalRental]:
+        endpoint = "bare-metal/"
+        return await self._stream_list(
+            endpoint,
+            "results",
+            _type_adapter(BaremetalRental),
+            limit=limit,
+            offset=offset,
+        )
+
+    async def put_baremetal_rental_power_status(
+        self,
+        baremetal_rental_id: str,
+        status: BaremetalRentalPutPowerStatusOptions,
+    ) -> Any:
+        payload = BaremetalRentalPowerStatusPayload(status=status)
+        endpoint = f"bare-metal/{baremetal_rental_id}/power-status"
+        # Don't decode the response as it's None if the power status was
+        # properly set and we want the raw response if there was an error
+        # or we tried to set the power status to the same value as the current
+        # power status
+        return await self._request_json("put", endpoint, payload=payload)
+
+    async def delete_baremetal_rental(self, baremetal_rental_id: str) -> Any:
+        endpoint = f"bare-metal/{baremetal_rental_id}"
+        # Don't decode the response, as it's None if the rental was deleted
+        # and we want the raw response if there was an error
+        return await self.delete(endpoint)
+
+    async def patch_baremetal_rental(
+        self,
+        baremetal_rental_id: str,
+        name: str | None = None,
+        tags: list[str] | None = None,
+    ) -> BaremetalRentalPatchResponse:
+        payload = BaremetalRentalPatchPayload(
+            name=name,
+            tags=tags,
+        )
+        endpoint = f"bare-metal/{baremetal_rental_id}"
+        return await self._request_model(
+            "patch", endpoint, BaremetalRentalPatchResponse, payload=payload
+        )
+
+    async def post_reboot_baremetal_rental_nodes(
+        self,
+        baremetal_rental_id: str,
+        public_ips: list[str],
+    ) -> Any:
+        endpoint = f"bare-metal/{baremetal_rental_id}/reboot"
+        payload = BaremetalRentalRebootNodesPayload(
+            public_ips=public_ips,
+        )
+        # Don't decode the response, as it's None if the nodes were rebooted
+        # and we want the raw response if there was an error
+        return await self._request_json("post", endpoint, payload=payload)
+
+    async def patch_remove_baremetal_rental_nodes(
+        self,
+        baremetal_rental_id: str,
+        public_ips: list[str],
+    ) -> Any:
+        endpoint = f"bare-metal/{baremetal_rental_id}/remove-nodes"
+        payload = BaremetalRentalRemoveNodesPayload(
+            public_ips=public_ips,
+        )
+        # Don't decode the response, as it's None if the nodes were removed
+        # and we want the raw response if there was an error
+        return await self._request_json("patch", endpoint, payload=payload)
+
+    ###########
+    # Billing #
+    ###########
+
+    async def get_billing_hourly_rate(self) -> BillingHourlyRate:
+        endpoint = "billing/hourly-rate"
+        return await self._get_model(endpoint, BillingHourlyRate)
+
+    async def get_billing_transactions(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        types: list[BillingResourceTypeOptions] | None = None,
+        earliest: str | None = None,
+        latest: str | None = None,
+    ) -> BillingTransactionsResponse:
+        payload = BillingTransactionsPayload(
+            limit=limit,
+            offset=offset,
+            types=types,
+            earliest=earliest,
+            latest=latest,
+        )
+        endpoint = "billing/transactions/"
+        return await self._get_model(
+            endpoint, BillingTransactionsResponse, payload=payload
+        )
+
+    def iter_billing_transactions(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        types: list[BillingResourceTypeOptions] | None = None,
+        earliest: str | None = None,
+        latest: str | None = None,
+    ) -> AsyncIterator[BillingTransaction]:
+        return aiter_items(
+            lambda limit, offset: self.get_billing_transactions(
+                limit=limit,
+                offset=offset,
+                types=types,
+                earliest=earliest,
+                latest=latest,
+            ),
+            page_size,
+        )
+
+    async def stream_billing_transactions(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        types: list[BillingResourceTypeOptions] | None = None,
+        earliest: str | None = None,
+        latest: str | None = None,
+    ) -> AsyncStreamedList[BillingTransaction]:
+        payload = BillingTransactionsPayload(
+            limit=limit,
+            offset=offset,
+            types=types,
+            earliest=earliest,
+            latest=latest,
+        )
+        endpoint = "billing/transactions/"
+        return await self._stream_list(
+            endpoint,
+            "results",
+            _type_adapter(BillingTransaction),
+            payload=payload,
+        )
+
+    async def get_monthly_billing_report(
+        self,
+        year: int,
+        month: int,
+    ) -> MonthlyBillingReport:
+        endpoint = f"billing/reports/{year}/{month}/transactions"
+        return await self._get_model(endpoint, MonthlyBillingReport)
+
+    async def stream_monthly_billing_report(
+        self,
+        year: int,
+        month: int,
+    ) -> AsyncStreamedList[BillingTransaction]:
+        # The balances are available in the stream's envelope once parsed.
+        endpoint = f"billing/reports/{year}/{month}/transactions"
+        return await self._stream_list(
+            endpoint,
+            "transactions",
+            _type_adapter(BillingTransaction),
+        )
+
+    #########################
+    # Cloudinit validation #
+    #########################
+
+    async def post_validate_cloudinit_script(
+        self,
+        type: CloudinitValidationTypeOptions,  # noqa: A002
+        content: str,
+    ) -> CloudinitValidationResponse:
+        payload = CloudinitValidationPayload(
+            type=type,
+            content=content,
+        )
+        endpoint = "validate/cloudinit"
+        return await self._request_model(
+            "post", endpoint, CloudinitValidationResponse, payload=payload
+        )
+
+    ###########
+    # Storage #
+    ###########
+
+    async def get_storage_hourly_rate(self) -> StorageHourlyRate:
+        endpoint = "storage/hourly-rate"
+        return await self._get_model(endpoint, StorageHourlyRate)
+
+    async def get_storage_volumes(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> StorageVolumesGetResponse:
+        endpoint = "storage"
+        return await self._get_model(
+            endpoint, StorageVolumesGetResponse, limit=limit, offset=offset
+        )
+
+    def iter_storage_volumes(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[StorageVolume]:
+        return aiter_items(
+            lambda limit, offset: self.get_storage_volumes(limit=limit, offset=offset),
+            page_size,
+        )
+
+    async def get_storage_volume(self, storage_id: str) -> StorageVolumeGetResponse:
+        endpoint = f"storage/{storage_id}"
+        return await self._get_model(endpoint, StorageVolumeGetResponse)
+
+    async def post_new_storage_volume(
+        self,
+        size_in_gb: int,
+        name: str,
+        order_ids: list[str],
+    ) -> StorageVolumeCreateResponse:
+        endpoint = "storage"
+        payload = StorageVolumeCreatePayload(
+            size_in_gb=size_in_gb,
+            name=name,
+            order_ids=order_ids,
+        )
+        return await self._request_model(
+            "post", endpoint, StorageVolumeCreateResponse, payload=payload
+        )
+
+    async def patch_storage_volume(
+        self,
+        storage_id: str,
+        size_in_gb: int | None = None,
+        name: str | None = None,
+        order_ids: list[str] | None = None,
+    ) -> Any:
+        endpoint = f"storage/{storage_id}"
+        payload = StorageVolumePatchPayload(
+            size_in_gb=size_in_gb,
+            name=name,
+            order_ids=order_ids,
+        )
+        # Don't decode the response, as it's None if the storage volume was
+        # patched and we want the raw response if there was an error
+        return await self._request_model(
+            "patch", endpoint, StorageVolumePatchResponse, payload=payload
+        )
+
+    async def delete_storage_volume(self, storage_id: str) -> Any:
+        endpoint = f"storage/{storage_id}"
+        # Don't decode the response, as it's None if the storage volume was
+        # deleted and we want the raw response if there was an error
+        return await self.delete(endpoint)
+
+    ##################
+    # Public helpers #
+    ##################
+
+    async def fetch_all[ItemT: BaseModel](
+        self,
+        list_method: Callable[..., Awaitable[ListResponse[ItemT]]],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        target_latency: float | None = None,
+        **filters: Any,
+    ) -> list[ItemT]:
+        # list_method is one of the paginated get_* methods, such as
+        # get_billing_transactions, and filters are passed through to it.
+        return await afetch_all(
+            lambda limit, offset: list_method(limit=limit, offset=offset, **filters),
+            page_size=page_size,
+            max_concurrency=max_concurrency,
+            target_latency=target_latency,
+        )
+
+    async def get(self, endpoint: str, **params: Any) -> Any:
+        with self._profile("get", endpoint):
+            params = self._params(None, params)
+            return self._decode(await self._get_content(endpoint, params))
+
+    async def post(self, endpoint: str, **params: Any) -> Any:
+        return await self._request_json("post", endpoint, params)
+
+    async def patch(self, endpoint: str, **params: Any) -> Any:
+        return await self._request_json("patch", endpoint, params)
+
+    async def delete(self, endpoint: str) -> Any:
+        with self._profile("delete", endpoint):
+            response = await self._request("delete", endpoint)
+            try:
+                return self._decode(response.content)
+            except json.JSONDecodeError:
+                return None
+
+    async def put(self, endpoint: str, **params: Any) -> Any:
+        return await self._request_json("put", endpoint, params)
+
+    async def warm_up(self, connections: int = 1) -> None:
+        # Open `connections` keep-alive connections up front so the first real
+        # calls don't pay for the TCP and TLS handshakes. The API root doesn't
+        # need to return a success status for the connection to be pooled.
+        connections = min(connections, self._max_connections)
+        await asyncio.gather(
+            *(
+                self._client.head(self._api_url, headers=self._headers("get"))
+                for _ in range(connections)
+            )
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    ###################
+    # Private helpers #
+    ###################
+
+    async def _get_model[ResponseT](
+        self,
+        endpoint: str,
+        response_class: type[ResponseT],
+        *,
+        payload: BaseModel | None = None,
+        **params: Any,
+    ) -> ResponseT:
+        with self._profile("get", endpoint):
+            params = self._params(payload, params)
+            content = await self._get_content(endpoint, params)
+            return self._validate_content(content, response_class)
+
+    async def _request_model[ResponseT](
+        self,
+        operation: Operation,
+        endpoint: str,
+        response_class: type[ResponseT],
+        *,
+        payload: BaseModel | None = None,
+        **params: Any,
+    ) -> ResponseT:
+        with self._profile(operation, endpoint):
+            params = self._params(payload, params)
+            response = await self._request(operation, endpoint, params)
+            return self._validate_content(response.content, response_class)
+
+    async def _request_json(
+        self,
+        operation: Operation,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        *,
+        payload: BaseModel | None = None,
+    ) -> Any:
+        with self._profile(operation, endpoint):
+            params = self._params(payload, params or {})
+            response = await self._request(operation, endpoint, params)
+            return self._decode(response.content)
+
+    async def _stream_list[ItemT](
+        self,
+        endpoint: str,
+        list_key: str,
+        item_adapter: TypeAdapter[ItemT],
+        *,
+        payload: BaseModel | None = None,
+        **params: Any,
+    ) -> AsyncStreamedList[ItemT]:
+        # Only the request is profiled, as the body is read and validated
+        # while the caller iterates over it.
+        with self._profile("get", endpoint):
+            params = self._params(payload, params)
+            response = await self._send("get", endpoint, params, stream=True)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    yield chunk
+            finally:
+                await response.aclose()
+
+        return AsyncStreamedList(chunks(), list_key, item_adapter)
+
+    async def _get_content(self, endpoint: str, params: dict[str, Any]) -> bytes:
+        entry = self._cache_entry(endpoint, params)
+        if entry is None:
+            return (await self._request("get", endpoint, params)).content
+        cache, key, ttl = entry
+        content = cache.get(key)
+        self._observe_cache(endpoint, hit=content is not None)
+        if content is None:
+            content = (await self._request("get", endpoint, params)).content
+            cache.set(key, content, ttl)
+        return content
+
+    async def _request(
+        self,
+        operation: Operation,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> httpx.Response:
+        if operation == "get":
+            return await self._send(operation, endpoint, params)
+        try:
+            return await self._send(operation, endpoint, params)
+        finally:
+            # Invalidate even if the write failed, as it may have been applied
+            # before the error (e.g. on a read timeout).
+            self._invalidate_cache(endpoint)
+
+    async def _send(
+        self,
+        operation: Operation,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
+    ) -> httpx.Response:
+        content = self._serialize(params)
+        profile = current_profile()
+        attempt = 0
+        while True:
+            await self._wait_for_rate_limit()
+            start = time.perf_counter() if profile is None else profile.start_attempt()
+            try:
+                request = self._client.build_request(
+                    operation.upper(),
+                    f"{self._api_url}{endpoint}",
+                    headers=self._headers(operation),
+                    content=content,
+                    extensions=None if profile is None else {"trace": _trace(profile)},
+                )
+                # Profiled requests read the body separately to time it.
+                response = await self._client.send(
+                    request, stream=stream or profile is not None
+                )
+            except httpx.TransportError:
+                self._observe_request(operation, endpoint, "error", start)
+                if not self._retry.should_retry(operation, attempt):
+                    raise
+                self._observe_retry(operation, endpoint)
+                await self._backoff(self._retry.delay(attempt))
+            else:
+                if profile is not None:
+                    profile.headers_received(start, response.status_code)
+                    if not stream:
+                        downloading = time.perf_counter()
+                        await response.aread()
+                        profile.add("download", time.perf_counter() - downloading)
+                self._observe_request(operation, endpoint, response.status_code, start)
+                if not self._retry.should_retry(
+                    operation, attempt, response.status_code
+                ):
+                    if stream and response.is_error:
+                        # Read the error body so it's available on the
+                        # exception, which also releases the connection.
+                        await response.aread()
+                    response.raise_for_status()
+                    return response
+                self._observe_retry(operation, endpoint)
+                retry_after = response.headers.get("Retry-After")
+                await response.aclose()
+                await self._backoff(self._retry.delay(attempt, retry_after))
+            attempt += 1
+
+    async def _wait_for_rate_limit(self) -> None:
+        if self._rate_limiter is None:
+            return
+        queued = time.perf_counter()
+        await self._rate_limiter.aacquire()
+        if (profile := current_profile()) is not None:
+            profile.add("queue", time.perf_counter() - queued)
+
+    @staticmethod
+    async def _backoff(delay: float) -> None:
+        await asyncio.sleep(delay)
+        if (profile := current_profile()) is not None:
+            profile.add("backoff", delay)
+
+
+def _trace(profile: CallProfile) -> Callable[[str, dict[str, Any]], Awaitable[None]]:
+    # An httpx trace callback that times opening a connection, including the
+    # TLS handshake, for the profile of the call that opens it.
+    started = 0.0
+
+    async def trace(event: str, _info: dict[str, Any]) -> None:
+        nonlocal started
+        if event in ("connection.connect_tcp.started", "connection.start_tls.started"):
+            started = time.perf_counter()
+        elif event in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            profile.add("connect", time.perf_counter() - started)
+
+    return trace
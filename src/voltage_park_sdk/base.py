@@ -0,0 +1,232 @@
+import json
+import time
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Literal, overload
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from voltage_park_sdk.cache import Cache, cache_key, resource_family
+from voltage_park_sdk.metrics import MetricsRegistry
+from voltage_park_sdk.profiling import CallProfile, Profiler, current_profile
+from voltage_park_sdk.retry import RateLimiter, RetryPolicy
+
+Operation = Literal["get", "post", "put", "patch", "delete"]
+
+API_URL = "https://cloud-api.voltagepark.com/api/v1/"
+
+
+_TYPE_ADAPTERS: dict[Any, TypeAdapter[Any]] = {}
+_NOT_PROFILED: nullcontext[None] = nullcontext()
+
+
+@overload
+def _type_adapter[ResponseT](
+    response_class: type[ResponseT],
+) -> TypeAdapter[ResponseT]: ...
+
+
+@overload
+def _type_adapter(response_class: Any) -> TypeAdapter[Any]: ...
+
+
+def _type_adapter(response_class: Any) -> TypeAdapter[Any]:
+    # Building a TypeAdapter isn't free, so build one per response type. This
+    # also accepts annotated unions like BaremetalRental.
+    adapter = _TYPE_ADAPTERS.get(response_class)
+    if adapter is None:
+        adapter = TypeAdapter(response_class)
+        _TYPE_ADAPTERS[response_class] = adapter
+    return adapter
+
+
+class BaseVoltageParkClient:
+    """State and helpers shared by the sync and async clients."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        token: str | Path,
+        *,
+        timeout: float | tuple[float, float] = 10,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: Cache | None = None,
+        metrics: MetricsRegistry | None = None,
+        profiler: Profiler | None = None,
+        api_url: str = API_URL,
+    ) -> None:
+        self._api_url = api_url
+        self._token = token
+        self._timeout = timeout
+        self._retry = retry if retry is not None else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._cache = cache
+        self._metrics = metrics
+        self._profiler = profiler
+        self._operation_headers = self._build_operation_headers(token)
+
+    ###################
+    # Private helpers #
+    ###################
+
+    def _cache_entry(
+        self, endpoint: str, params: dict[str, Any]
+    ) -> tuple[Cache, str, float] | None:
+        # Returns the cache, key and TTL to use for a GET request, or None if
+        # the response shouldn't be cached.
+        if self._cache is None:
+            return None
+        ttl = self._cache.ttl_for(endpoint)
+        if ttl is None:
+            return None
+        return self._cache, cache_key(self._token, endpoint, params), ttl
+
+    def _observe_request(
+        self, operation: Operation, endpoint: str, status: int | str, start: float
+    ) -> None:
+        if self._metrics is not None:
+            duration = time.perf_counter() - start
+            self._metrics.observe_request(operation, endpoint, status, duration)
+
+    def _observe_retry(self, operation: Operation, endpoint: str) -> None:
+        if self._metrics is not None:
+            self._metrics.observe_retry(operation, endpoint)
+
+    def _observe_cache(self, endpoint: str, *, hit: bool) -> None:
+        if self._metrics is not None:
+            self._metrics.observe_cache(endpoint, hit=hit)
+        if hit and (profile := current_profile()) is not None:
+            profile.cached = True
+
+    def _profile(
+        self, operation: Operation, endpoint: str
+    ) -> AbstractContextManager[CallProfile | None]:
+        # Wraps a whole client call, so that its phases are recorded together.
+        if self._profiler is None:
+            return _NOT_PROFILED
+        return self._profiler.record(operation, endpoint)
+
+    @staticmethod
+    def _params(payload: BaseModel | None, params: dict[str, Any]) -> dict[str, Any]:
+        # Endpoint methods pass their payload model undumped, so that dumping
+        # it happens inside the profiled call and counts as "serialize".
+        if payload is not None:
+            profile = current_profile()
+            start = time.perf_counter()
+            params = {**params, **payload.model_dump()}
+            if profile is not None:
+                profile.add("serialize", time.perf_counter() - start)
+        return {k: v for k, v in params.items() if v is not None}
+
+    @staticmethod
+    def _serialize(params: dict[str, Any] | None) -> str | None:
+        if params is None:
+            return None
+        profile = current_profile()
+        if profile is None:
+            return json.dumps(params)
+        start = time.perf_counter()
+        data = json.dumps(params)
+        profile.add("serialize", time.perf_counter() - start)
+        return data
+
+    @staticmethod
+    def _decode(content: bytes) -> Any:
+        profile = current_profile()
+        if profile is None:
+            return json.loads(content)
+        start = time.perf_counter()
+        try:
+            return json.loads(content)
+        finally:
+            profile.add("decode", time.perf_counter() - start)
+
+    def _invalidate_cache(self, endpoint: str) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(resource_family(endpoint))
+
+    def _headers(
+        self,
+        operation: Operation,
+        **overrides: str,
+    ) -> dict[str, str]:
+        # The per-operation headers are built once in __init__ and shared by
+        # every request, so only copy them when we actually need to override.
+        operation_headers = self._operation_headers[operation]
+        if overrides:
+            return {**operation_headers, **overrides}
+        return operation_headers
+
+    @staticmethod
+    def _build_operation_headers(
+        token: str | Path,
+    ) -> dict[Operation, dict[str, str]]:
+        return {
+            "get": {
+                "Authorization": f"Bearer {token}",
+                "Accept": "*/*",
+            },
+            "post": {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            "put": {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            "patch": {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            "delete": {
+                "Authorization": f"Bearer {token}",
+                "Accept": "*/*",
+            },
+        }
+
+    @staticmethod
+    def _validate_date_format(date_str: str | None, param_name: str) -> None:
+        if date_str is None:
+            return
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d").date()  # noqa: DTZ007
+        except ValueError as e:
+            msg = f"{param_name} must be in YYYY-MM-DD format (e.g. '2024-01-01')"
+            raise ValueError(msg) from e
+
+    def _validate_content[ResponseT](
+        self, content: bytes, response_class: type[ResponseT]
+    ) -> ResponseT:
+        # Validate the raw body in one pass rather than decoding it into dicts
+        # and then walking those again to build the models.
+        profile = current_profile()
+        if profile is not None:
+            return self._validate_profiled(content, response_class, profile)
+        try:
+            return _type_adapter(response_class).validate_json(content)
+        except ValidationError:
+            # Go through the dict path to print the decoded response and raise
+            # the same error as before.
+            return self._format_response(json.loads(content), response_class)
+
+    def _validate_profiled[ResponseT](
+        self, content: bytes, response_class: type[ResponseT], profile: CallProfile
+    ) -> ResponseT:
+        response = self._decode(content)
+        start = time.perf_counter()
+        try:
+            return _type_adapter(response_class).validate_python(response)
+        except ValidationError:
+            return self._format_response(response, response_class)
+        finally:
+            profile.add("validate", time.perf_counter() - start)
+
+    def _format_response[ResponseT](
+        self, response: Any, response_class: type[ResponseT]
+    ) -> ResponseT:
+        try:
+            return response_class(**response)
+        except ValidationError:
+            print(f"Raw response: {response}")  # noqa: T201
+            raise
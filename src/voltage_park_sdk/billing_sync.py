@@ -0,0 +1,234 @@
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from itertools import batched
+from pathlib import Path
+from typing import Self
+
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.datamodel.billing import BillingTransaction
+
+# Timestamps come back both with and without microseconds, so store them in a
+# single format that sorts correctly as text.
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    linked_instance_id TEXT,
+    resource_id TEXT,
+    timestamp_creation TEXT NOT NULL,
+    timestamp_completion TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_type ON transactions (type);
+CREATE INDEX IF NOT EXISTS transactions_linked_instance_id
+    ON transactions (linked_instance_id);
+CREATE INDEX IF NOT EXISTS transactions_resource_id ON transactions (resource_id);
+CREATE INDEX IF NOT EXISTS transactions_timestamp_creation
+    ON transactions (timestamp_creation);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    fetched: int
+    inserted: int
+    updated: int
+    earliest: str | None
+
+
+def parse_timestamp(value: str) -> datetime:
+    for timestamp_format in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.strptime(value, timestamp_format).replace(tzinfo=UTC)
+        except ValueError:
+            pass
+    msg = f"Unrecognized timestamp: {value}"
+    raise ValueError(msg)
+
+
+def _normalize_timestamp(value: str | None) -> str | None:
+    if value is None:
+        return None
+    return parse_timestamp(value).strftime(_TIMESTAMP_FORMAT)
+
+
+def _as_timestamp(value: date | datetime) -> str:
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day, tzinfo=UTC)
+    return value.astimezone(UTC).strftime(_TIMESTAMP_FORMAT)
+
+
+def _resource_ids(transaction: BillingTransaction) -> tuple[str | None, str | None]:
+    # Returns the linked instance ID and the ID of the VM, rental or storage
+    # volume that the transaction is for.
+    linked_instance = getattr(transaction.details, "linked_instance", None)
+    if linked_instance is None:
+        return None, None
+    resource_id = getattr(
+        linked_instance,
+        "virtual_machine_id",
+        getattr(linked_instance, "baremetal_rental_id", linked_instance.id),
+    )
+    return linked_instance.id, resource_id
+
+
+def _row(transaction: BillingTransaction) -> tuple[str | None, ...]:
+    linked_instance_id, resource_id = _resource_ids(transaction)
+    return (
+        transaction.id,
+        transaction.details.type,
+        linked_instance_id,
+        resource_id,
+        _normalize_timestamp(transaction.timestamp_creation),
+        _normalize_timestamp(transaction.timestamp_completion),
+        transaction.model_dump_json(),
+    )
+
+
+class BillingTransactionStore:
+    """A local, indexed SQLite copy of the organization's billing transactions.
+
+    `sync` only fetches transactions created since the last sync, minus an
+    overlap window, and re-fetches far enough back to pick up any transaction
+    that was still waiting on its `timestamp_completion`. Rows are keyed by
+    transaction ID, so re-fetched transactions replace their old versions.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    @property
+    def watermark(self) -> str | None:
+        row = self._connection.execute(
+            "SELECT value FROM metadata WHERE key = 'watermark'"
+        ).fetchone()
+        return None if row is None else str(row[0])
+
+    def sync(
+        self,
+        client: VoltageParkClient,
+        overlap: timedelta = timedelta(days=1),
+        max_pending_age: timedelta = timedelta(days=31),
+        page_size: int = 500,
+    ) -> SyncResult:
+        earliest = self._sync_start(overlap, max_pending_age)
+        transactions = client.iter_billing_transactions(
+            page_size=page_size,
+            earliest=earliest,
+        )
+        fetched, inserted, updated = self.upsert(transactions, batch_size=page_size)
+        return SyncResult(
+            fetched=fetched,
+            inserted=inserted,
+            updated=updated,
+            earliest=earliest,
+        )
+
+    def upsert(
+        self, transactions: Iterable[BillingTransaction], batch_size: int = 500
+    ) -> tuple[int, int, int]:
+        # Each batch is committed on its own, so the write lock isn't held
+        # while the next page is fetched. The watermark only moves once every
+        # transaction is stored, so an interrupted sync resumes from the old
+        # watermark and fetches the rest again.
+        fetched = inserted = updated = 0
+        for batch in batched(transactions, batch_size):
+            with self._connection:
+                for transaction in batch:
+                    fetched += 1
+                    row = _row(transaction)
+                    if self._insert(row):
+                        inserted += 1
+                    else:
+                        updated += self._update(row)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO metadata "
+                "SELECT 'watermark', MAX(timestamp_creation) FROM transactions "
+                "HAVING COUNT(*) > 0"
+            )
+        return fetched, inserted, updated
+
+    def query(
+        self,
+        resource_id: str | None = None,
+        type: str | None = None,  # noqa: A002
+        start: date | datetime | None = None,
+        end: date | datetime | None = None,
+    ) -> list[BillingTransaction]:
+        # resource_id matches either the VM/rental/volume ID or the ID of the
+        # linked instance. start is inclusive and end is exclusive.
+        clauses: list[str] = []
+        params: list[str] = []
+        if resource_id is not None:
+            clauses.append("(resource_id = ? OR linked_instance_id = ?)")
+            params += [resource_id, resource_id]
+        if type is not None:
+            clauses.append("type = ?")
+            params.append(type)
+        if start is not None:
+            clauses.append("timestamp_creation >= ?")
+            params.append(_as_timestamp(start))
+        if end is not None:
+            clauses.append("timestamp_creation < ?")
+            params.append(_as_timestamp(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection.execute(
+            f"SELECT data FROM transactions {where} ORDER BY timestamp_creation",  # noqa: S608
+            params,
+        )
+        return [BillingTransaction.model_validate_json(data) for (data,) in rows]
+
+    def _sync_start(self, overlap: timedelta, max_pending_age: timedelta) -> str | None:
+        watermark = self.watermark
+        if watermark is None:
+            return None
+        latest = parse_timestamp(watermark)
+        start = latest - overlap
+        # Reach back for transactions that haven't completed yet, but no more
+        # than max_pending_age, so one stuck transaction can't force a full
+        # resync.
+        (oldest_pending,) = self._connection.execute(
+            "SELECT MIN(timestamp_creation) FROM transactions "
+            "WHERE timestamp_completion IS NULL AND timestamp_creation >= ?",
+            (_as_timestamp(latest - max_pending_age),),
+        ).fetchone()
+        if oldest_pending is not None:
+            start = min(start, parse_timestamp(oldest_pending))
+        return start.date().isoformat()
+
+    def _insert(self, row: tuple[str | None, ...]) -> bool:
+        # Returns whether the transaction was new.
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)", row
+        )
+        return bool(cursor.rowcount)
+
+    def _update(self, row: tuple[str | None, ...]) -> int:
+        # Returns 1 if the stored transaction changed.
+        cursor = self._connection.execute(
+            "UPDATE transactions SET type = ?, linked_instance_id = ?, "
+            "resource_id = ?, timestamp_creation = ?, "
+            "timestamp_completion = ?, data = ? "
+            "WHERE id = ? AND data != ?",
+            (*row[1:], row[0], row[-1]),
+        )
+        return cursor.rowcount
@@ -0,0 +1,191 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.datamodel.baremetal import BaremetalRentalPutPowerStatusOptions
+from voltage_park_sdk.datamodel.virtual_machines import (
+    VirtualMachinePowerStatusOptions,
+)
+from voltage_park_sdk.pagination import DEFAULT_MAX_CONCURRENCY
+
+
+@dataclass(frozen=True)
+class BulkItemResult[T]:
+    id: str
+    result: T | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkResult[T]:
+    """The outcome of a bulk operation, in the order the IDs were given.
+
+    IDs that were never attempted because the operation stopped after a
+    failure are listed in `skipped`.
+    """
+
+    items: list[BulkItemResult[T]] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> list[BulkItemResult[T]]:
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> list[BulkItemResult[T]]:
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.skipped
+
+
+type ProgressCallback[T] = Callable[[BulkItemResult[T], int, int], None]
+
+
+##################
+# Public helpers #
+##################
+
+
+def run_bulk[T](
+    operation: Callable[[str], T],
+    ids: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_MAX_CONCURRENCY,
+    stop_on_failure: bool = False,
+    progress: ProgressCallback[T] | None = None,
+) -> BulkResult[T]:
+    # Calls operation(id) for every ID on a pool of max_workers threads.
+    # progress is called with each item result, the number of items done so
+    # far and the total, from the calling thread.
+    ids = list(ids)
+    outcomes: dict[str, BulkItemResult[T]] = {}
+    queue = iter(ids)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: dict[Future[T], str] = {}
+        stopped = False
+        while True:
+            # Only submit enough IDs to keep the workers busy, so that
+            # stopping on failure leaves the rest of them untouched.
+            for resource_id in () if stopped else queue:
+                pending[executor.submit(operation, resource_id)] = resource_id
+                if len(pending) == max_workers:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = _item_result(pending.pop(future), future)
+                outcomes[item.id] = item
+                if progress is not None:
+                    progress(item, len(outcomes), len(ids))
+                stopped = stopped or (stop_on_failure and not item.ok)
+    return _bulk_result(ids, outcomes)
+
+
+async def arun_bulk[T](
+    operation: Callable[[str], Awaitable[T]],
+    ids: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_MAX_CONCURRENCY,
+    stop_on_failure: bool = False,
+    progress: ProgressCallback[T] | None = None,
+) -> BulkResult[T]:
+    # Same as run_bulk, running at most max_workers operations concurrently
+    # on the event loop.
+    ids = list(ids)
+    outcomes: dict[str, BulkItemResult[T]] = {}
+    queue = iter(ids)
+    stopped = False
+
+    async def worker() -> None:
+        nonlocal stopped
+        for resource_id in queue:
+            if stopped:
+                return
+            try:
+                item = BulkItemResult[T](
+                    resource_id, result=await operation(resource_id)
+                )
+            except Exception as e:  # noqa: BLE001
+                item = BulkItemResult[T](resource_id, error=e)
+            outcomes[resource_id] = item
+            if progress is not None:
+                progress(item, len(outcomes), len(ids))
+            if not item.ok and stop_on_failure:
+                stopped = True
+
+    await asyncio.gather(*(worker() for _ in range(min(max_workers, len(ids)))))
+    return _bulk_result(ids, outcomes)
+
+
+def set_vm_power_status(
+    client: VoltageParkClient,
+    virtual_machine_ids: Iterable[str],
+    status: VirtualMachinePowerStatusOptions,
+    **options: Any,
+) -> BulkResult[Any]:
+    return run_bulk(
+        lambda vm_id: client.put_vm_power_status(vm_id, status),
+        virtual_machine_ids,
+        **options,
+    )
+
+
+def delete_virtual_machines(
+    client: VoltageParkClient, virtual_machine_ids: Iterable[str], **options: Any
+) -> BulkResult[Any]:
+    return run_bulk(client.delete_virtual_machine, virtual_machine_ids, **options)
+
+
+def set_baremetal_rental_power_status(
+    client: VoltageParkClient,
+    baremetal_rental_ids: Iterable[str],
+    status: BaremetalRentalPutPowerStatusOptions,
+    **options: Any,
+) -> BulkResult[Any]:
+    return run_bulk(
+        lambda rental_id: client.put_baremetal_rental_power_status(rental_id, status),
+        baremetal_rental_ids,
+        **options,
+    )
+
+
+def delete_baremetal_rentals(
+    client: VoltageParkClient, baremetal_rental_ids: Iterable[str], **options: Any
+) -> BulkResult[Any]:
+    return run_bulk(client.delete_baremetal_rental, baremetal_rental_ids, **options)
+
+
+###################
+# Private helpers #
+###################
+
+
+def _item_result[T](resource_id: str, future: Future[T]) -> BulkItemResult[T]:
+    error = future.exception()
+    if error is not None:
+        if not isinstance(error, Exception):
+            raise error
+        return BulkItemResult(resource_id, error=error)
+    return BulkItemResult(resource_id, result=future.result())
+
+
+def _bulk_result[T](
+    ids: list[str], outcomes: dict[str, BulkItemResult[T]]
+) -> BulkResult[T]:
+    result = BulkResult[T]()
+    for resource_id in ids:
+        if resource_id in outcomes:
+            result.items.append(outcomes[resource_id])
+        else:
+            result.skipped.append(resource_id)
+    return result
@@ -0,0 +1,291 @@
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Protocol
+
+# Endpoints that change slowly enough to be worth caching, and how long to
+# cache them for in seconds. Keys are endpoints, optionally with `*` wildcards.
+DEFAULT_TTLS: dict[str, float] = {
+    "organization": 300,
+    "virtual-machines/instant/locations/": 30,
+    "virtual-machines/instant/locations/*": 30,
+    "bare-metal/locations/": 30,
+    "billing/hourly-rate": 60,
+    "storage/hourly-rate": 3600,
+    # Reports for the current month still change. Reports for closed months
+    # never do, so they are cached forever regardless of this TTL.
+    "billing/reports/*/*/transactions": 300,
+}
+FOREVER = math.inf
+
+_BILLING_REPORT = re.compile(r"billing/reports/(\d+)/(\d+)/transactions")
+
+
+def is_immutable(endpoint: str) -> bool:
+    match = _BILLING_REPORT.fullmatch(endpoint)
+    if match is None:
+        return False
+    # Only cache a month as immutable once it's over everywhere in the world.
+    now = datetime.now(UTC) - timedelta(days=1)
+    year, month = int(match[1]), int(match[2])
+    return (year, month) < (now.year, now.month)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Cache(Protocol):
+    """What a client needs from a response cache."""
+
+    def ttl_for(self, endpoint: str) -> float | None: ...
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def invalidate(self, family: str) -> int: ...
+
+
+def cache_key(token: str | Path, endpoint: str, params: Mapping[str, Any]) -> str:
+    # Namespace keys by token so that a cache shared between clients never
+    # serves one organization's data to another.
+    namespace = hashlib.sha256(str(token).encode()).hexdigest()[:16]
+    query = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return f"{namespace}:{endpoint}?{query}"
+
+
+def resource_family(endpoint: str) -> str:
+    # Writes to e.g. virtual-machines/{id} invalidate everything cached under
+    # virtual-machines/, including the location availability.
+    return endpoint.split("/", 1)[0]
+
+
+def _key_family(key: str) -> str:
+    endpoint = key.split(":", 1)[1].split("?", 1)[0]
+    return resource_family(endpoint)
+
+
+class _EndpointTTLs:
+    def __init__(self, ttls: Mapping[str, float] | None) -> None:
+        ttls = DEFAULT_TTLS if ttls is None else ttls
+        self._exact = {k: v for k, v in ttls.items() if "*" not in k}
+        self._patterns = [(k, v) for k, v in ttls.items() if "*" in k]
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        if endpoint in self._exact:
+            return self._exact[endpoint]
+        for pattern, ttl in self._patterns:
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return FOREVER if is_immutable(endpoint) else ttl
+        return None
+
+
+class ResponseCache:
+    """A thread-safe in-memory LRU cache of raw response bodies with TTLs."""
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        maxsize: int = 256,
+    ) -> None:
+        self._ttls = _EndpointTTLs(ttls)
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        return self._ttls.ttl_for(endpoint)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, family: str) -> int:
+        with self._lock:
+            stale = [key for key in self._entries if _key_family(key) == family]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+
+def default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "voltage-park-sdk" / "responses.sqlite3"
+
+
+class DiskCache:
+    """A response cache in SQLite that can be shared between processes.
+
+    Entries are zlib-compressed and written in a single transaction, and the
+    database runs in WAL mode, so readers in other processes never see a
+    partially written entry and aren't blocked by a writer. Responses for
+    immutable endpoints, such as billing reports for closed months, never
+    expire.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttls: Mapping[str, float] | None = None,
+        timeout: float = 30,
+    ) -> None:
+        self._path = Path(path) if path is not None else default_cache_path()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttls = _EndpointTTLs(ttls)
+        self._timeout = timeout
+        # sqlite3 connections can't be shared between threads, so each
+        # thread lazily opens its own.
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "family TEXT NOT NULL, "
+                "expires_at REAL, "
+                "value BLOB NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_family ON responses (family)"
+            )
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        return self._ttls.ttl_for(endpoint)
+
+    def get(self, key: str) -> bytes | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM responses "
+                "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        with self._stats_lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return zlib.decompress(row[0])
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        # Expiry uses wall-clock time as entries are shared between processes.
+        expires_at = None if math.isinf(ttl) else time.time() + ttl
+        endpoint = key.split(":", 1)[1].split("?", 1)[0]
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, resource_family(endpoint), expires_at, zlib.compress(value)),
+            )
+
+    def invalidate(self, family: str) -> int:
+        # Immutable entries stay, as no write can change them.
+        with self._connection() as connection:
+            deleted = connection.execute(
+                "DELETE FROM responses WHERE family = ? AND expires_at IS NOT NULL",
+                (family,),
+            ).rowcount
+        with self._stats_lock:
+            self._invalidations += deleted
+        return deleted
+
+    def prune(self) -> int:
+        with self._connection() as connection:
+            return connection.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+    def clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def stats(self) -> CacheStats:
+        # Hits and misses are counted per process, the size is shared.
+        (size,) = (
+            self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()
+        )
+        with self._stats_lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=0,
+                invalidations=self._invalidations,
+                size=size,
+            )
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            del self._local.connection
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
@@ -0,0 +1,654 @@
+import json
+import sys
+from collections.abc import Callable, Iterable, Sequence
+from typing import IO, TYPE_CHECKING, Any
+
+import click
+
+# Only click and the standard library are imported up front, so that
+# `vp --help` and shell completion stay fast. The client, and with it
+# requests and the pydantic datamodels, is imported by the first command
+# that talks to the API.
+if TYPE_CHECKING:
+    import requests
+
+    from voltage_park_sdk.client import VoltageParkClient
+
+VM_POWER_STATUSES = ["started", "stopped", "stopped_disassociated"]
+BAREMETAL_POWER_STATUSES = ["started", "stopped"]
+BILLING_TYPES = ["virtual_machine", "baremetal", "storage_block", "storage"]
+NETWORK_TYPES = ["ethernet", "infiniband"]
+CLOUDINIT_TYPES = ["instant-vm", "vm", "baremetal"]
+
+_YES = click.option("-y", "--yes", is_flag=True, help="Don't ask for confirmation.")
+_TAGS = click.option("--tag", "tags", multiple=True, help="A tag. Repeat for more.")
+
+
+def _access_options[F: Callable[..., Any]](command: F) -> F:
+    # The options shared by the commands that create a VM or a rental.
+    options = [
+        click.option(
+            "--ssh-key",
+            "ssh_keys",
+            multiple=True,
+            help="A public SSH key to install. Repeat for more.",
+        ),
+        click.option(
+            "--org-ssh-key",
+            "org_ssh_key_ids",
+            multiple=True,
+            help="The ID of an organization SSH key to install. Repeat for more.",
+        ),
+        click.option(
+            "--all-org-ssh-keys",
+            is_flag=True,
+            help="Install every organization SSH key.",
+        ),
+        _TAGS,
+        click.option(
+            "--cloud-init",
+            type=click.File(),
+            help="A JSON file with the packages, write_files and runcmd to run "
+            "on first boot.",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+class _Group(click.Group):
+    # Reports API errors as a one-line message rather than a traceback.
+    def invoke(self, ctx: click.Context) -> Any:
+        try:
+            return super().invoke(ctx)
+        except Exception as e:
+            # Only an API call can raise an HTTPError, so if requests isn't
+            # loaded yet, this isn't one.
+            loaded = sys.modules.get("requests")
+            if loaded is not None and isinstance(e, loaded.HTTPError):
+                raise click.ClickException(_describe_http_error(e)) from e
+            raise
+
+
+@click.group(cls=_Group, context_settings={"help_option_names": ["-h", "--help"]})
+@click.option(
+    "--token",
+    envvar="VOLTAGE_PARK_TOKEN",
+    help="Voltage Park API token. Defaults to $VOLTAGE_PARK_TOKEN.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Choice(["table", "ndjson"]),
+    default="table",
+    show_default=True,
+    help="Output format. Both print results as they arrive.",
+)
+@click.pass_context
+def main(ctx: click.Context, token: str | None, output: str) -> None:
+    """Manage Voltage Park resources from the command line."""
+    ctx.ensure_object(dict)
+    ctx.obj.setdefault("token", token)
+    ctx.obj["output"] = output
+
+
+################
+# Organization #
+################
+
+
+@main.group()
+def org() -> None:
+    """Organization details."""
+
+
+@org.command("show")
+@click.pass_context
+def org_show(ctx: click.Context) -> None:
+    _emit(ctx, [_client(ctx).get_organization()])
+
+
+@org.command("update")
+@click.option(
+    "--billing-email",
+    "billing_emails",
+    multiple=True,
+    required=True,
+    help="Where to send billing notifications. Repeat for more.",
+)
+@click.pass_context
+def org_update(ctx: click.Context, billing_emails: tuple[str, ...]) -> None:
+    _emit(ctx, [_client(ctx).patch_organization(list(billing_emails))])
+
+
+############
+# SSH keys #
+############
+
+
+@main.group("ssh-key")
+def ssh_key() -> None:
+    """Organization SSH keys."""
+
+
+@ssh_key.command("ls")
+@click.pass_context
+def ssh_key_ls(ctx: click.Context) -> None:
+    _emit(ctx, _client(ctx).iter_ssh_keys(), ["id", "name"])
+
+
+@ssh_key.command("add")
+@click.argument("name")
+@click.argument("public_key_file", type=click.File())
+@click.pass_context
+def ssh_key_add(ctx: click.Context, name: str, public_key_file: IO[str]) -> None:
+    """Add the public key in PUBLIC_KEY_FILE, or - for stdin."""
+    content = public_key_file.read().strip()
+    _emit(ctx, [_client(ctx).post_ssh_key(name, content)])
+
+
+@ssh_key.command("rm")
+@click.argument("ssh_key_id")
+@_YES
+@click.pass_context
+def ssh_key_rm(ctx: click.Context, ssh_key_id: str, yes: bool) -> None:  # noqa: FBT001
+    _confirm(yes, f"Delete SSH key {ssh_key_id}?")
+    _client(ctx).delete_ssh_key(ssh_key_id)
+
+
+####################
+# Virtual machines #
+####################
+
+
+@main.group()
+def vm() -> None:
+    """Virtual machines."""
+
+
+@vm.command("ls")
+@click.pass_context
+def vm_ls(ctx: click.Context) -> None:
+    columns = ["id", "name", "status", "type", "public_ip", "hostnode_id", "tags"]
+    _emit(ctx, _client(ctx).stream_virtual_machines(), columns)
+
+
+@vm.command("show")
+@click.argument("virtual_machine_id")
+@click.pass_context
+def vm_show(ctx: click.Context, virtual_machine_id: str) -> None:
+    _emit(ctx, [_client(ctx).get_virtual_machine(virtual_machine_id)])
+
+
+@vm.command("locations")
+@click.pass_context
+def vm_locations(ctx: click.Context) -> None:
+    locations = _client(ctx).get_virtual_machine_locations().results
+    presets = (
+        {"location_id": location.id} | preset.model_dump(mode="json")
+        for location in locations
+        for preset in location.available_presets
+    )
+    columns = ["location_id", "id", "operating_system", "compute_rate_hourly"]
+    _emit(ctx, presets, [*columns, "available_vms"])
+
+
+@vm.command("create")
+@click.argument("config_id")
+@click.argument("name")
+@click.option("--password", help="A password for the default user.")
+@_access_options
+@click.pass_context
+def vm_create(  # noqa: PLR0913
+    ctx: click.Context,
+    config_id: str,
+    name: str,
+    password: str | None,
+    ssh_keys: tuple[str, ...],
+    org_ssh_key_ids: tuple[str, ...],
+    all_org_ssh_keys: bool,  # noqa: FBT001
+    tags: tuple[str, ...],
+    cloud_init: IO[str] | None,
+) -> None:
+    """Deploy a VM from the preset CONFIG_ID (see `vp vm locations`)."""
+    response = _client(ctx).post_virtual_machine(
+        config_id,
+        name,
+        password=password,
+        organization_ssh_keys=_organization_ssh_keys(org_ssh_key_ids, all_org_ssh_keys),
+        ssh_keys=list(ssh_keys) or None,
+        cloud_init=_load_json(cloud_init),
+        tags=list(tags) or None,
+    )
+    _emit(ctx, [response])
+
+
+@vm.command("update")
+@click.argument("virtual_machine_id")
+@click.option("--name", help="A new name.")
+@_TAGS
+@click.pass_context
+def vm_update(
+    ctx: click.Context, virtual_machine_id: str, name: str | None, tags: tuple[str, ...]
+) -> None:
+    """Rename a VM or replace its tags."""
+    client = _client(ctx)
+    response = client.patch_virtual_machine(
+        virtual_machine_id, name=name, tags=list(tags) or None
+    )
+    _emit(ctx, [response])
+
+
+@vm.command("relocate")
+@click.argument("virtual_machine_id")
+@click.pass_context
+def vm_relocate(ctx: click.Context, virtual_machine_id: str) -> None:
+    _client(ctx).post_relocate_virtual_machine(virtual_machine_id)
+
+
+@vm.command("power")
+@click.argument("virtual_machine_id")
+@click.argument("status", type=click.Choice(VM_POWER_STATUSES))
+@click.pass_context
+def vm_power(ctx: click.Context, virtual_machine_id: str, status: Any) -> None:
+    _emit(ctx, [_client(ctx).put_vm_power_status(virtual_machine_id, status)])
+
+
+@vm.command("rm")
+@click.argument("virtual_machine_id")
+@_YES
+@click.pass_context
+def vm_rm(ctx: click.Context, virtual_machine_id: str, yes: bool) -> None:  # noqa: FBT001
+    _confirm(yes, f"Delete virtual machine {virtual_machine_id}?")
+    _client(ctx).delete_virtual_machine(virtual_machine_id)
+
+
+######################
+# Bare-metal rentals #
+######################
+
+
+@main.group()
+def bm() -> None:
+    """Bare-metal rentals."""
+
+
+@bm.command("ls")
+@click.pass_context
+def bm_ls(ctx: click.Context) -> None:
+    columns = ["id", "name", "status", "power_status", "node_count", "tags"]
+    _emit(ctx, _client(ctx).stream_baremetal_rentals(), columns)
+
+
+@bm.command("locations")
+@click.pass_context
+def bm_locations(ctx: click.Context) -> None:
+    columns = ["id", "gpu_count_ethernet", "gpu_price_ethernet"]
+    columns += ["gpu_count_infiniband", "gpu_price_infiniband"]
+    _emit(ctx, _client(ctx).get_baremetal_locations().results, columns)
+
+
+@bm.command("create")
+@click.argument("location_id")
+@click.argument("gpu_count", type=click.IntRange(min=1))
+@click.argument("name")
+@click.option(
+    "--network",
+    "network_type",
+    type=click.Choice(NETWORK_TYPES),
+    default="ethernet",
+    show_default=True,
+)
+@click.option("--storage-id", help="A storage volume to attach.")
+@_access_options
+@click.pass_context
+def bm_create(  # noqa: PLR0913
+    ctx: click.Context,
+    location_id: str,
+    gpu_count: int,
+    name: str,
+    network_type: Any,
+    storage_id: str | None,
+    ssh_keys: tuple[str, ...],
+    org_ssh_key_ids: tuple[str, ...],
+    all_org_ssh_keys: bool,  # noqa: FBT001
+    tags: tuple[str, ...],
+    cloud_init: IO[str] | None,
+) -> None:
+    """Rent GPU_COUNT GPUs at LOCATION_ID (see `vp bm locations`)."""
+    response = _client(ctx).post_baremetal_rental(
+        location_id,
+        gpu_count,
+        name,
+        network_type,
+        organization_ssh_keys=_organization_ssh_keys(org_ssh_key_ids, all_org_ssh_keys),
+        ssh_keys=list(ssh_keys) or None,
+        storage_id=storage_id,
+        tags=list(tags) or None,
+        cloudinit_script=_load_json(cloud_init),
+    )
+    _emit(ctx, [response])
+
+
+@bm.command("update")
+@click.argument("baremetal_rental_id")
+@click.option("--name", help="A new name.")
+@_TAGS
+@click.pass_context
+def bm_update(
+    ctx: click.Context,
+    baremetal_rental_id: str,
+    name: str | None,
+    tags: tuple[str, ...],
+) -> None:
+    """Rename a rental or replace its tags."""
+    client = _client(ctx)
+    response = client.patch_baremetal_rental(
+        baremetal_rental_id, name=name, tags=list(tags) or None
+    )
+    _emit(ctx, [response])
+
+
+@bm.command("reboot")
+@click.argument("baremetal_rental_id")
+@click.argument("public_ips", nargs=-1, required=True)
+@click.pass_context
+def bm_reboot(
+    ctx: click.Context, baremetal_rental_id: str, public_ips: tuple[str, ...]
+) -> None:
+    """Reboot the nodes of a rental with the given public IPs."""
+    _client(ctx).post_reboot_baremetal_rental_nodes(
+        baremetal_rental_id, list(public_ips)
+    )
+
+
+@bm.command("remove-nodes")
+@click.argument("baremetal_rental_id")
+@click.argument("public_ips", nargs=-1, required=True)
+@_YES
+@click.pass_context
+def bm_remove_nodes(
+    ctx: click.Context,
+    baremetal_rental_id: str,
+    public_ips: tuple[str, ...],
+    yes: bool,  # noqa: FBT001
+) -> None:
+    """Remove the nodes with the given public IPs from a rental."""
+    _confirm(yes, f"Remove {len(public_ips)} node(s) from {baremetal_rental_id}?")
+    _client(ctx).patch_remove_baremetal_rental_nodes(
+        baremetal_rental_id, list(public_ips)
+    )
+
+
+@bm.command("power")
+@click.argument("baremetal_rental_id")
+@click.argument("status", type=click.Choice(BAREMETAL_POWER_STATUSES))
+@click.pass_context
+def bm_power(ctx: click.Context, baremetal_rental_id: str, status: Any) -> None:
+    _client(ctx).put_baremetal_rental_power_status(baremetal_rental_id, status)
+
+
+@bm.command("rm")
+@click.argument("baremetal_rental_id")
+@_YES
+@click.pass_context
+def bm_rm(ctx: click.Context, baremetal_rental_id: str, yes: bool) -> None:  # noqa: FBT001
+    _confirm(yes, f"Delete bare-metal rental {baremetal_rental_id}?")
+    _client(ctx).delete_baremetal_rental(baremetal_rental_id)
+
+
+###########
+# Billing #
+###########
+
+
+@main.group()
+def billing() -> None:
+    """Billing rates, transactions and reports."""
+
+
+@billing.command("rate")
+@click.pass_context
+def billing_rate(ctx: click.Context) -> None:
+    _emit(ctx, [_client(ctx).get_billing_hourly_rate()])
+
+
+@billing.command("transactions")
+@click.option("--type", "types", multiple=True, type=click.Choice(BILLING_TYPES))
+@click.option("--earliest", help="Only transactions from this date (YYYY-MM-DD).")
+@click.option("--latest", help="Only transactions until this date (YYYY-MM-DD).")
+@click.pass_context
+def billing_transactions(
+    ctx: click.Context,
+    types: tuple[Any, ...],
+    earliest: str | None,
+    latest: str | None,
+) -> None:
+    transactions = _client(ctx).stream_billing_transactions(
+        types=list(types) or None, earliest=earliest, latest=latest
+    )
+    columns = ["id", "timestamp_creation", "total_amount", "details.type"]
+    _emit(ctx, transactions, columns)
+
+
+@billing.command("report")
+@click.argument("year", type=int)
+@click.argument("month", type=click.IntRange(1, 12))
+@click.pass_context
+def billing_report(ctx: click.Context, year: int, month: int) -> None:
+    transactions = _client(ctx).stream_monthly_billing_report(year, month)
+    columns = ["id", "timestamp_creation", "total_amount", "details.type"]
+    _emit(ctx, transactions, columns)
+
+
+###########
+# Storage #
+###########
+
+
+@main.group()
+def storage() -> None:
+    """Storage volumes."""
+
+
+@storage.command("ls")
+@click.pass_context
+def storage_ls(ctx: click.Context) -> None:
+    columns = ["id", "name", "status", "size_in_gb", "rate_hourly"]
+    _emit(ctx, _client(ctx).iter_storage_volumes(), columns)
+
+
+@storage.command("show")
+@click.argument("storage_id")
+@click.pass_context
+def storage_show(ctx: click.Context, storage_id: str) -> None:
+    _emit(ctx, [_client(ctx).get_storage_volume(storage_id)])
+
+
+@storage.command("rate")
+@click.pass_context
+def storage_rate(ctx: click.Context) -> None:
+    _emit(ctx, [_client(ctx).get_storage_hourly_rate()])
+
+
+@storage.command("create")
+@click.argument("name")
+@click.argument("size_in_gb", type=click.IntRange(min=1))
+@click.option(
+    "--order-id",
+    "order_ids",
+    multiple=True,
+    help="A rental to attach the volume to. Repeat for more.",
+)
+@click.pass_context
+def storage_create(
+    ctx: click.Context, name: str, size_in_gb: int, order_ids: tuple[str, ...]
+) -> None:
+    response = _client(ctx).post_new_storage_volume(size_in_gb, name, list(order_ids))
+    _emit(ctx, [response])
+
+
+@storage.command("update")
+@click.argument("storage_id")
+@click.option("--name", help="A new name.")
+@click.option("--size", "size_in_gb", type=click.IntRange(min=1), help="In GB.")
+@click.option(
+    "--order-id",
+    "order_ids",
+    multiple=True,
+    help="Attach the volume to these rentals instead. Repeat for more.",
+)
+@click.pass_context
+def storage_update(
+    ctx: click.Context,
+    storage_id: str,
+    name: str | None,
+    size_in_gb: int | None,
+    order_ids: tuple[str, ...],
+) -> None:
+    response = _client(ctx).patch_storage_volume(
+        storage_id, size_in_gb=size_in_gb, name=name, order_ids=list(order_ids) or None
+    )
+    _emit(ctx, [response])
+
+
+@storage.command("rm")
+@click.argument("storage_id")
+@_YES
+@click.pass_context
+def storage_rm(ctx: click.Context, storage_id: str, yes: bool) -> None:  # noqa: FBT001
+    _confirm(yes, f"Delete storage volume {storage_id}?")
+    _client(ctx).delete_storage_volume(storage_id)
+
+
+##############
+# Validation #
+##############
+
+
+@main.group()
+def validate() -> None:
+    """Check inputs before using them."""
+
+
+@validate.command("cloud-init")
+@click.argument("type_", metavar="TYPE", type=click.Choice(CLOUDINIT_TYPES))
+@click.argument("script", type=click.File())
+@click.pass_context
+def validate_cloud_init(ctx: click.Context, type_: Any, script: IO[str]) -> None:
+    """Validate the cloud-init SCRIPT, or - for stdin.
+
+    Exits with status 1 if the API rejects it.
+    """
+    response = _client(ctx).post_validate_cloudinit_script(type_, script.read())
+    _emit(ctx, [response])
+    if response.error:
+        ctx.exit(1)
+
+
+###################
+# Private helpers #
+###################
+
+
+def _client(ctx: click.Context) -> "VoltageParkClient":
+    # Tests pass a ready-made client in the context object.
+    if ctx.obj.get("client") is None:
+        if not ctx.obj["token"]:
+            msg = "Pass --token or set VOLTAGE_PARK_TOKEN."
+            raise click.UsageError(msg, ctx)
+        from voltage_park_sdk.client import VoltageParkClient
+
+        ctx.obj["client"] = VoltageParkClient(ctx.obj["token"])
+        ctx.call_on_close(ctx.obj["client"].close)
+    client: VoltageParkClient = ctx.obj["client"]
+    return client
+
+
+def _organization_ssh_keys(
+    ids: tuple[str, ...],
+    all_keys: bool,  # noqa: FBT001
+) -> dict[str, Any] | None:
+    if ids and all_keys:
+        msg = "Pass either --org-ssh-key or --all-org-ssh-keys, not both."
+        raise click.UsageError(msg)
+    if ids:
+        return {"mode": "selective", "ssh_key_ids": list(ids)}
+    if all_keys:
+        return {"mode": "all"}
+    return None
+
+
+def _load_json(file: IO[str] | None) -> dict[str, Any] | None:
+    if file is None:
+        return None
+    try:
+        value = json.load(file)
+    except ValueError as e:
+        msg = f"{file.name} is not valid JSON: {e}"
+        raise click.BadParameter(msg) from e
+    if not isinstance(value, dict):
+        msg = f"{file.name} must contain a JSON object."
+        raise click.BadParameter(msg)
+    return value
+
+
+def _confirm(yes: bool, prompt: str) -> None:  # noqa: FBT001
+    if not yes:
+        click.confirm(prompt, abort=True)
+
+
+def _describe_http_error(error: "requests.HTTPError") -> str:
+    # The status and the API's own message, which is usually in "detail".
+    response = error.response
+    if response is None:
+        return str(error)
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    detail = body.get("detail") if isinstance(body, dict) else None
+    message = " ".join(filter(None, [str(response.status_code), response.reason]))
+    if detail is None:
+        detail = response.text.strip()
+    if detail:
+        message += f": {detail if isinstance(detail, str) else json.dumps(detail)}"
+    return message
+
+
+def _emit(
+    ctx: click.Context, items: Iterable[Any], columns: Sequence[str] | None = None
+) -> None:
+    # Writes each item as soon as it arrives. Without columns, a table shows
+    # the top-level fields of the first item.
+    ndjson = ctx.obj["output"] == "ndjson"
+    for index, item in enumerate(items):
+        record = item if isinstance(item, dict) else item.model_dump(mode="json")
+        if ndjson:
+            sys.stdout.write(json.dumps(record) + "\n")
+        else:
+            if index == 0:
+                columns = columns or list(record)
+                sys.stdout.write(_row([c.rsplit(".", 1)[-1].upper() for c in columns]))
+            sys.stdout.write(_row([_cell(record, c) for c in columns or []]))
+        sys.stdout.flush()
+
+
+def _cell(record: dict[str, Any], column: str) -> str:
+    value: Any = record
+    for key in column.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    if value is None:
+        return "-"
+    if isinstance(value, list):
+        return ",".join(map(str, value)) or "-"
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return str(value)
+
+
+def _row(cells: list[str]) -> str:
+    # Columns are padded to a fixed width so that rows streamed one at a
+    # time still line up, unless a value is wider than its column.
+    return "  ".join(cell.ljust(20) for cell in cells).rstrip() + "\n"
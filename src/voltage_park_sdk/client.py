@@ -3,17 +3,30 @@
 # args and variables for the time being.
 # ruff: noqa: ARG002, F841
 import json
-from datetime import datetime
+import time
+from collections.abc import Callable, Iterator
+from http.cookiejar import DefaultCookiePolicy
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Self
 
 import requests
-from pydantic import ValidationError
-
+from pydantic import BaseModel, TypeAdapter
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from voltage_park_sdk.base import (
+    API_URL,
+    BaseVoltageParkClient,
+    Operation,
+    _type_adapter,
+)
+from voltage_park_sdk.cache import Cache
 from voltage_park_sdk.datamodel.baremetal import (
     BaremetalCloudInit,
     BaremetalLocations,
     BaremetalNetworkTypeOptions,
+    BaremetalRental,
     BaremetalRentalCreatePayload,
     BaremetalRentalCreateResponse,
     BaremetalRentalPatchPayload,
@@ -27,6 +40,7 @@ from voltage_park_sdk.datamodel.baremetal import (
 from voltage_park_sdk.datamodel.billing import (
     BillingHourlyRate,
     BillingResourceTypeOptions,
+    BillingTransaction,
     BillingTransactionsPayload,
     BillingTransactionsResponse,
     MonthlyBillingReport,
@@ -35,16 +49,19 @@ from voltage_park_sdk.datamodel.organization import (
     Organization,
     OrganizationPatchPayload,
     OrganizationPatchResponse,
+    SSHKey,
     SSHKeyCreatePayload,
     SSHKeyCreateResponse,
     SSHKeys,
 )
 from voltage_park_sdk.datamodel.shared import (
+    ListResponse,
     OrganizationSSHKey,
     get_organization_ssh_key,
 )
 from voltage_park_sdk.datamodel.storage import (
     StorageHourlyRate,
+    StorageVolume,
     StorageVolumeCreatePayload,
     StorageVolumeCreateResponse,
     StorageVolumeGetResponse,
@@ -71,12 +88,66 @@ from voltage_park_sdk.datamodel.virtual_machines import (
     VirtualMachinePowerStatusResponse,
     VirtualMachines,
 )
+from voltage_park_sdk.metrics import MetricsRegistry
+from voltage_park_sdk.pagination import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    fetch_all,
+    iter_items,
+)
+from voltage_park_sdk.profiling import Profiler, current_profile
+from voltage_park_sdk.retry import RateLimiter, RetryPolicy, attempting
+from voltage_park_sdk.streaming import STREAM_CHUNK_SIZE, StreamedList
 
 
-class VoltageParkClient:
-    def __init__(self, token: str | Path) -> None:
-        self._api_url = "https://cloud-api.voltagepark.com/api/v1/"
-        self._token = token
+class VoltageParkClient(BaseVoltageParkClient):
+    def __init__(  # noqa: PLR0913
+        self,
+        token: str | Path,
+        *,
+        timeout: float | tuple[float, float] = 10,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: Cache | None = None,
+        metrics: MetricsRegistry | None = None,
+        profiler: Profiler | None = None,
+        api_url: str = API_URL,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        transport: BaseAdapter | None = None,
+    ) -> None:
+        super().__init__(
+            token,
+            timeout=timeout,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            metrics=metrics,
+            profiler=profiler,
+            api_url=api_url,
+        )
+        self._pool_maxsize = pool_maxsize
+
+        # A single session shares its connection pool between threads. We
+        # authenticate with a bearer token, so refuse cookies to avoid any
+        # shared mutable state on the session.
+        self._session = requests.Session()
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        # A transport, such as a RecordingAdapter or ReplayAdapter, replaces
+        # the connection pool.
+        if transport is None:
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+            )
+            if profiler is not None:
+                adapter.poolmanager.pool_classes_by_scheme = {
+                    "http": _ProfiledHTTPConnectionPool,
+                    "https": _ProfiledHTTPSConnectionPool,
+                }
+            transport = adapter
+        self._session.mount("https://", transport)
+        self._session.mount("http://", transport)
 
     ################
     # Organization #
@@ -84,8 +155,7 @@ class VoltageParkClient:
 
     def get_organization(self) -> Organization:
         endpoint = "organization"
-        response = self.get(endpoint)
-        return Organization(**response)
+        return self._get_model(endpoint, Organization)
 
     def patch_organization(
         self,
@@ -95,8 +165,9 @@ class VoltageParkClient:
             billing_notification_target_emails=billing_notification_target_emails,
         )
         endpoint = "organization"
-        response = self.patch(endpoint, **payload.model_dump())
-        return self._format_response(response, OrganizationPatchResponse)
+        return self._request_model(
+            "patch", endpoint, OrganizationPatchResponse, payload=payload
+        )
 
     def get_ssh_keys(
         self,
@@ -104,8 +175,16 @@ class VoltageParkClient:
         offset: int | None = None,
     ) -> SSHKeys:
         endpoint = "organization/ssh-keys"
-        response = self.get(endpoint, limit=limit, offset=offset)
-        return self._format_response(response, SSHKeys)
+        return self._get_model(endpoint, SSHKeys, limit=limit, offset=offset)
+
+    def iter_ssh_keys(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[SSHKey]:
+        return iter_items(
+            lambda limit, offset: self.get_ssh_keys(limit=limit, offset=offset),
+            page_size,
+        )
 
     def post_ssh_key(
         self,
@@ -117,8 +196,9 @@ class VoltageParkClient:
             content=content,
         )
         endpoint = "organization/ssh-keys"
-        response = self.post(endpoint, **payload.model_dump())
-        return self._format_response(response, SSHKeyCreateResponse)
+        return self._request_model(
+            "post", endpoint, SSHKeyCreateResponse, payload=payload
+        )
 
     def delete_ssh_key(self, ssh_key_id: str) -> Any:
         endpoint = f"organization/ssh-keys/{ssh_key_id}"
@@ -132,16 +212,14 @@ class VoltageParkClient:
 
     def get_virtual_machine_locations(self) -> VirtualMachineLocations:
         endpoint = "virtual-machines/instant/locations/"
-        response = self.get(endpoint)
-        return self._format_response(response, VirtualMachineLocations)
+        return self._get_model(endpoint, VirtualMachineLocations)
 
     def get_virtual_machine_location(
         self,
         location_id: str,
     ) -> VirtualMachineLocation:
         endpoint = f"virtual-machines/instant/locations/{location_id}"
-        response = self.get(endpoint)
-        return self._format_response(response, VirtualMachineLocation)
+        return self._get_model(endpoint, VirtualMachineLocation)
 
     def post_virtual_machine(  # noqa: PLR0913
         self,
@@ -167,8 +245,9 @@ class VoltageParkClient:
             tags=tags,
         )
         endpoint = "virtual-machines/instant"
-        response = self.post(endpoint, **payload.model_dump())
-        return self._format_response(response, VirtualMachineDeployResponse)
+        return self._request_model(
+            "post", endpoint, VirtualMachineDeployResponse, payload=payload
+        )
 
     def get_virtual_machines(
         self,
@@ -176,13 +255,34 @@ class VoltageParkClient:
         offset: int | None = None,
     ) -> VirtualMachines:
         endpoint = "virtual-machines/"
-        response = self.get(endpoint, limit=limit, offset=offset)
-        return self._format_response(response, VirtualMachines)
+        return self._get_model(endpoint, VirtualMachines, limit=limit, offset=offset)
+
+    def iter_virtual_machines(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[VirtualMachine]:
+        return iter_items(
+            lambda limit, offset: self.get_virtual_machines(limit=limit, offset=offset),
+            page_size,
+        )
+
+    def stream_virtual_machines(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> StreamedList[VirtualMachine]:
+        endpoint = "virtual-machines/"
+        return self._stream_list(
+            endpoint,
+            "results",
+            _type_adapter(VirtualMachine),
+            limit=limit,
+            offset=offset,
+        )
 
     def get_virtual_machine(self, virtual_machine_id: str) -> VirtualMachine:
         endpoint = f"virtual-machines/{virtual_machine_id}"
-        response = self.get(endpoint)
-        return self._format_response(response, VirtualMachine)
+        return self._get_model(endpoint, VirtualMachine)
 
     def patch_virtual_machine(
         self,
@@ -195,8 +295,9 @@ class VoltageParkClient:
             tags=tags,
         )
         endpoint = f"virtual-machines/{virtual_machine_id}"
-        response = self.patch(endpoint, **payload.model_dump())
-        return self._format_response(response, VirtualMachinePatchResponse)
+        return self._request_model(
+            "patch", endpoint, VirtualMachinePatchResponse, payload=payload
+        )
 
     def delete_virtual_machine(self, virtual_machine_id: str) -> Any:
         endpoint = f"virtual-machines/{virtual_machine_id}"
@@ -211,8 +312,9 @@ class VoltageParkClient:
     ) -> VirtualMachinePowerStatusResponse:
         payload = VirtualMachinePowerStatusPayload(status=status)
         endpoint = f"virtual-machines/{virtual_machine_id}/power-status"
-        response = self.put(endpoint, **payload.model_dump())
-        return self._format_response(response, VirtualMachinePowerStatusResponse)
+        return self._request_model(
+            "put", endpoint, VirtualMachinePowerStatusResponse, payload=payload
+        )
 
     def post_relocate_virtual_machine(
         self,
@@ -229,8 +331,7 @@ class VoltageParkClient:
 
     def get_baremetal_locations(self) -> BaremetalLocations:
         endpoint = "bare-metal/locations/"
-        response = self.get(endpoint)
-        return self._format_response(response, BaremetalLocations)
+        return self._get_model(endpoint, BaremetalLocations)
 
     def post_baremetal_rental(  # noqa: PLR0913
         self,
@@ -262,8 +363,9 @@ class VoltageParkClient:
             tags=tags,
             cloudinit_script=cloudinit_script,
         )
-        response = self.post(endpoint, **payload.model_dump())
-        return self._format_response(response, BaremetalRentalCreateResponse)
+        return self._request_model(
+            "post", endpoint, BaremetalRentalCreateResponse, payload=payload
+        )
 
     def get_baremetal_rentals(
         self,
@@ -271,8 +373,32 @@ class VoltageParkClient:
         offset: int | None = None,
     ) -> BaremetalRentals:
         endpoint = "bare-metal/"
-        response = self.get(endpoint, limit=limit, offset=offset)
-        return self._format_response(response, BaremetalRentals)
+        return self._get_model(endpoint, BaremetalRentals, limit=limit, offset=offset)
+
+    def iter_baremetal_rentals(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[BaremetalRental]:
+        return iter_items(
+            lambda limit, offset: self.get_baremetal_rentals(
+                limit=limit, offset=offset
+            ),
+            page_size,
+        )
+
+    def stream_baremetal_rentals(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> StreamedList[BaremetalRental]:
+        endpoint = "bare-metal/"
+        return self._stream_list(
+            endpoint,
+            "results",
+            _type_adapter(BaremetalRental),
+            limit=limit,
+            offset=offset,
+        )
 
     def put_baremetal_rental_power_status(
         self,
@@ -285,7 +411,7 @@ class VoltageParkClient:
         # properly set and we want the raw response if there was an error
         # or we tried to set the power status to the same value as the current
         # power status
-        return self.put(endpoint, **payload.model_dump())
+        return self._request_json("put", endpoint, payload=payload)
 
     def delete_baremetal_rental(self, baremetal_rental_id: str) -> Any:
         endpoint = f"bare-metal/{baremetal_rental_id}"
@@ -304,8 +430,9 @@ class VoltageParkClient:
             tags=tags,
         )
         endpoint = f"bare-metal/{baremetal_rental_id}"
-        response = self.patch(endpoint, **payload.model_dump())
-        return self._format_response(response, BaremetalRentalPatchResponse)
+        return self._request_model(
+            "patch", endpoint, BaremetalRentalPatchResponse, payload=payload
+        )
 
     def post_reboot_baremetal_rental_nodes(
         self,
@@ -318,7 +445,7 @@ class VoltageParkClient:
         )
         # Don't decode the response, as it's None if the nodes were rebooted
         # and we want the raw response if there was an error
-        return self.post(endpoint, **payload.model_dump())
+        return self._request_json("post", endpoint, payload=payload)
 
     def patch_remove_baremetal_rental_nodes(
         self,
@@ -331,7 +458,7 @@ class VoltageParkClient:
         )
         # Don't decode the response, as it's None if the nodes were removed
         # and we want the raw response if there was an error
-        return self.patch(endpoint, **payload.model_dump())
+        return self._request_json("patch", endpoint, payload=payload)
 
     ###########
     # Billing #
@@ -339,8 +466,7 @@ class VoltageParkClient:
 
     def get_billing_hourly_rate(self) -> BillingHourlyRate:
         endpoint = "billing/hourly-rate"
-        response = self.get(endpoint)
-        return self._format_response(response, BillingHourlyRate)
+        return self._get_model(endpoint, BillingHourlyRate)
 
     def get_billing_transactions(
         self,
@@ -358,8 +484,48 @@ class VoltageParkClient:
             latest=latest,
         )
         endpoint = "billing/transactions/"
-        response = self.get(endpoint, **payload.model_dump())
-        return self._format_response(response, BillingTransactionsResponse)
+        return self._get_model(endpoint, BillingTransactionsResponse, payload=payload)
+
+    def iter_billing_transactions(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        types: list[BillingResourceTypeOptions] | None = None,
+        earliest: str | None = None,
+        latest: str | None = None,
+    ) -> Iterator[BillingTransaction]:
+        return iter_items(
+            lambda limit, offset: self.get_billing_transactions(
+                limit=limit,
+                offset=offset,
+                types=types,
+                earliest=earliest,
+                latest=latest,
+            ),
+            page_size,
+        )
+
+    def stream_billing_transactions(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        types: list[BillingResourceTypeOptions] | None = None,
+        earliest: str | None = None,
+        latest: str | None = None,
+    ) -> StreamedList[BillingTransaction]:
+        payload = BillingTransactionsPayload(
+            limit=limit,
+            offset=offset,
+            types=types,
+            earliest=earliest,
+            latest=latest,
+        )
+        endpoint = "billing/transactions/"
+        return self._stream_list(
+            endpoint,
+            "results",
+            _type_adapter(BillingTransaction),
+            payload=payload,
+        )
 
     def get_monthly_billing_report(
         self,
@@ -367,8 +533,20 @@ class VoltageParkClient:
         month: int,
     ) -> MonthlyBillingReport:
         endpoint = f"billing/reports/{year}/{month}/transactions"
-        response = self.get(endpoint)
-        return self._format_response(response, MonthlyBillingReport)
+        return self._get_model(endpoint, MonthlyBillingReport)
+
+    def stream_monthly_billing_report(
+        self,
+        year: int,
+        month: int,
+    ) -> StreamedList[BillingTransaction]:
+        # The balances are available in the stream's envelope once parsed.
+        endpoint = f"billing/reports/{year}/{month}/transactions"
+        return self._stream_list(
+            endpoint,
+            "transactions",
+            _type_adapter(BillingTransaction),
+        )
 
     #########################
     # Cloudinit validation #
@@ -384,8 +562,9 @@ class VoltageParkClient:
             content=content,
         )
         endpoint = "validate/cloudinit"
-        response = self.post(endpoint, **payload.model_dump())
-        return self._format_response(response, CloudinitValidationResponse)
+        return self._request_model(
+            "post", endpoint, CloudinitValidationResponse, payload=payload
+        )
 
     ###########
     # Storage #
@@ -393,8 +572,7 @@ class VoltageParkClient:
 
     def get_storage_hourly_rate(self) -> StorageHourlyRate:
         endpoint = "storage/hourly-rate"
-        response = self.get(endpoint)
-        return self._format_response(response, StorageHourlyRate)
+        return self._get_model(endpoint, StorageHourlyRate)
 
     def get_storage_volumes(
         self,
@@ -402,13 +580,22 @@ class VoltageParkClient:
         offset: int | None = None,
     ) -> StorageVolumesGetResponse:
         endpoint = "storage"
-        response = self.get(endpoint, limit=limit, offset=offset)
-        return self._format_response(response, StorageVolumesGetResponse)
+        return self._get_model(
+            endpoint, StorageVolumesGetResponse, limit=limit, offset=offset
+        )
+
+    def iter_storage_volumes(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[StorageVolume]:
+        return iter_items(
+            lambda limit, offset: self.get_storage_volumes(limit=limit, offset=offset),
+            page_size,
+        )
 
     def get_storage_volume(self, storage_id: str) -> StorageVolumeGetResponse:
         endpoint = f"storage/{storage_id}"
-        response = self.get(endpoint)
-        return self._format_response(response, StorageVolumeGetResponse)
+        return self._get_model(endpoint, StorageVolumeGetResponse)
 
     def post_new_storage_volume(
         self,
@@ -422,8 +609,9 @@ class VoltageParkClient:
             name=name,
             order_ids=order_ids,
         )
-        response = self.post(endpoint, **payload.model_dump())
-        return self._format_response(response, StorageVolumeCreateResponse)
+        return self._request_model(
+            "post", endpoint, StorageVolumeCreateResponse, payload=payload
+        )
 
     def patch_storage_volume(
         self,
@@ -440,8 +628,9 @@ class VoltageParkClient:
         )
         # Don't decode the response, as it's None if the storage volume was
         # patched and we want the raw response if there was an error
-        response = self.patch(endpoint, **payload.model_dump())
-        return self._format_response(response, StorageVolumePatchResponse)
+        return self._request_model(
+            "patch", endpoint, StorageVolumePatchResponse, payload=payload
+        )
 
     def delete_storage_volume(self, storage_id: str) -> Any:
         endpoint = f"storage/{storage_id}"
@@ -453,111 +642,258 @@ class VoltageParkClient:
     # Public helpers #
     ##################
 
-    def get(self, endpoint: str, **params: Any) -> Any:
-        params = {k: v for k, v in params.items() if v is not None}
-        response = requests.get(
-            f"{self._api_url}{endpoint}",
-            headers=self._headers("get"),
-            data=json.dumps(params),
-            timeout=10,
+    def fetch_all[ItemT: BaseModel](
+        self,
+        list_method: Callable[..., ListResponse[ItemT]],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        target_latency: float | None = None,
+        **filters: Any,
+    ) -> list[ItemT]:
+        # list_method is one of the paginated get_* methods, such as
+        # get_billing_transactions, and filters are passed through to it.
+        return fetch_all(
+            lambda limit, offset: list_method(limit=limit, offset=offset, **filters),
+            page_size=page_size,
+            max_concurrency=max_concurrency,
+            target_latency=target_latency,
         )
-        response.raise_for_status()
-        return response.json()
+
+    def get(self, endpoint: str, **params: Any) -> Any:
+        with self._profile("get", endpoint):
+            params = self._params(None, params)
+            return self._decode(self._get_content(endpoint, params))
 
     def post(self, endpoint: str, **params: Any) -> Any:
-        params = {k: v for k, v in params.items() if v is not None}
-        response = requests.post(
-            f"{self._api_url}{endpoint}",
-            headers=self._headers("post"),
-            data=json.dumps(params),
-            timeout=10,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._request_json("post", endpoint, params)
 
     def patch(self, endpoint: str, **params: Any) -> Any:
-        params = {k: v for k, v in params.items() if v is not None}
-        response = requests.patch(
-            f"{self._api_url}{endpoint}",
-            headers=self._headers("patch"),
-            data=json.dumps(params),
-            timeout=10,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._request_json("patch", endpoint, params)
 
     def delete(self, endpoint: str) -> Any:
-        response = requests.delete(
-            f"{self._api_url}{endpoint}",
-            headers=self._headers("delete"),
-            timeout=10,
-        )
-        response.raise_for_status()
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            return None
+        with self._profile("delete", endpoint):
+            response = self._request("delete", endpoint)
+            try:
+                return self._decode(response.content)
+            except json.JSONDecodeError:
+                return None
 
     def put(self, endpoint: str, **params: Any) -> Any:
-        params = {k: v for k, v in params.items() if v is not None}
-        response = requests.put(
-            f"{self._api_url}{endpoint}",
-            headers=self._headers("put"),
-            data=json.dumps(params),
-            timeout=10,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._request_json("put", endpoint, params)
+
+    def warm_up(self, connections: int = 1) -> None:
+        # Open `connections` keep-alive connections up front so the first real
+        # calls don't pay for the TCP and TLS handshakes. The API root doesn't
+        # need to return a success status for the connection to be pooled.
+        from concurrent.futures import ThreadPoolExecutor
+
+        connections = min(connections, self._pool_maxsize)
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            for response in executor.map(
+                lambda _: self._session.head(
+                    self._api_url,
+                    headers=self._headers("get"),
+                    timeout=self._timeout,
+                ),
+                range(connections),
+            ):
+                response.close()
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     ###################
     # Private helpers #
     ###################
 
-    def _headers(
-        self,
-        operation: Literal["get", "post", "put", "patch", "delete"],
-        **overrides: str,
-    ) -> dict[str, str]:
-        operation_headers: dict[str, str] = {
-            "get": {
-                "Authorization": f"Bearer {self._token}",
-                "Accept": "*/*",
-            },
-            "post": {
-                "Authorization": f"Bearer {self._token}",
-                "Content-Type": "application/json",
-            },
-            "put": {
-                "Authorization": f"Bearer {self._token}",
-                "Content-Type": "application/json",
-            },
-            "patch": {
-                "Authorization": f"Bearer {self._token}",
-                "Content-Type": "application/json",
-            },
-            "delete": {
-                "Authorization": f"Bearer {self._token}",
-                "Accept": "*/*",
-            },
-        }[operation]
-        operation_headers.update(overrides)
-        return operation_headers
+    def _get_model[ResponseT](
+        self,
+        endpoint: str,
+        response_class: type[ResponseT],
+        *,
+        payload: BaseModel | None = None,
+        **params: Any,
+    ) -> ResponseT:
+        with self._profile("get", endpoint):
+            params = self._params(payload, params)
+            content = self._get_content(endpoint, params)
+            return self._validate_content(content, response_class)
 
-    @staticmethod
-    def _validate_date_format(date_str: str | None, param_name: str) -> None:
-        if date_str is None:
+    def _request_model[ResponseT](
+        self,
+        operation: Operation,
+        endpoint: str,
+        response_class: type[ResponseT],
+        *,
+        payload: BaseModel | None = None,
+        **params: Any,
+    ) -> ResponseT:
+        with self._profile(operation, endpoint):
+            params = self._params(payload, params)
+            response = self._request(operation, endpoint, params)
+            return self._validate_content(response.content, response_class)
+
+    def _request_json(
+        self,
+        operation: Operation,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        *,
+        payload: BaseModel | None = None,
+    ) -> Any:
+        with self._profile(operation, endpoint):
+            params = self._params(payload, params or {})
+            response = self._request(operation, endpoint, params)
+            return self._decode(response.content)
+
+    def _stream_list[ItemT](
+        self,
+        endpoint: str,
+        list_key: str,
+        item_adapter: TypeAdapter[ItemT],
+        *,
+        payload: BaseModel | None = None,
+        **params: Any,
+    ) -> StreamedList[ItemT]:
+        # Only the request is profiled, as the body is read and validated
+        # while the caller iterates over it.
+        with self._profile("get", endpoint):
+            params = self._params(payload, params)
+            response = self._send("get", endpoint, params, stream=True)
+
+        def chunks() -> Iterator[bytes]:
+            with response:
+                yield from response.iter_content(STREAM_CHUNK_SIZE)
+
+        return StreamedList(chunks(), list_key, item_adapter)
+
+    def _get_content(self, endpoint: str, params: dict[str, Any]) -> bytes:
+        entry = self._cache_entry(endpoint, params)
+        if entry is None:
+            return (self._request("get", endpoint, params)).content
+        cache, key, ttl = entry
+        content = cache.get(key)
+        self._observe_cache(endpoint, hit=content is not None)
+        if content is None:
+            content = (self._request("get", endpoint, params)).content
+            cache.set(key, content, ttl)
+        return content
+
+    def _request(
+        self,
+        operation: Operation,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> requests.Response:
+        if operation == "get":
+            return self._send(operation, endpoint, params)
+        try:
+            return self._send(operation, endpoint, params)
+        finally:
+            # Invalidate even if the write failed, as it may have been applied
+            # before the error (e.g. on a read timeout).
+            self._invalidate_cache(endpoint)
+
+    def _send(
+        self,
+        operation: Operation,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
+    ) -> requests.Response:
+        data = self._serialize(params)
+        profile = current_profile()
+        attempt = 0
+        while True:
+            self._wait_for_rate_limit()
+            start = time.perf_counter() if profile is None else profile.start_attempt()
+            try:
+                with attempting(attempt):
+                    response = self._session.request(
+                        operation.upper(),
+                        f"{self._api_url}{endpoint}",
+                        headers=self._headers(operation),
+                        data=data,
+                        timeout=self._timeout,
+                        # Profiled requests read the body separately to time it.
+                        stream=stream or profile is not None,
+                    )
+            except (requests.ConnectionError, requests.Timeout):
+                self._observe_request(operation, endpoint, "error", start)
+                if not self._retry.should_retry(operation, attempt):
+                    raise
+                self._observe_retry(operation, endpoint)
+                self._backoff(self._retry.delay(attempt))
+            else:
+                if profile is not None:
+                    profile.headers_received(start, response.status_code)
+                    if not stream:
+                        downloading = time.perf_counter()
+                        _ = response.content
+                        profile.add("download", time.perf_counter() - downloading)
+                self._observe_request(operation, endpoint, response.status_code, start)
+                if not self._retry.should_retry(
+                    operation, attempt, response.status_code
+                ):
+                    if stream and not response.ok:
+                        # Read the error body so it's available on the
+                        # exception, which also releases the connection.
+                        _ = response.content
+                    response.raise_for_status()
+                    return response
+                self._observe_retry(operation, endpoint)
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+                self._backoff(self._retry.delay(attempt, retry_after))
+            attempt += 1
+
+    def _wait_for_rate_limit(self) -> None:
+        if self._rate_limiter is None:
             return
+        queued = time.perf_counter()
+        self._rate_limiter.acquire()
+        if (profile := current_profile()) is not None:
+            profile.add("queue", time.perf_counter() - queued)
+
+    @staticmethod
+    def _backoff(delay: float) -> None:
+        time.sleep(delay)
+        if (profile := current_profile()) is not None:
+            profile.add("backoff", delay)
+
+
+# The connections of a profiled client time how long it takes to open them,
+# including the TLS handshake, for the profile of the call that opens them.
+class _ProfiledHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
         try:
-            datetime.strptime(date_str, "%Y-%m-%d").date()  # noqa: DTZ007
-        except ValueError as e:
-            msg = f"{param_name} must be in YYYY-MM-DD format (e.g. '2024-01-01')"
-            raise ValueError(msg) from e
+            super().connect()
+        finally:
+            if (profile := current_profile()) is not None:
+                profile.add("connect", time.perf_counter() - start)
 
-    def _format_response[ResponseT](
-        self, response: Any, response_class: type[ResponseT]
-    ) -> ResponseT:
+
+class _ProfiledHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
         try:
-            return response_class(**response)
-        except ValidationError as e:
-            print(f"Raw response: {response}")  # noqa: T201
-            raise
+            super().connect()
+        finally:
+            if (profile := current_profile()) is not None:
+                profile.add("connect", time.perf_counter() - start)
+
+
+class _ProfiledHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _ProfiledHTTPConnection
+
+
+class _ProfiledHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _ProfiledHTTPSConnection
@@ -1,6 +1,6 @@
 from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
 from voltage_park_sdk.datamodel.shared import (
     CloudInitFile,
@@ -8,6 +8,7 @@ from voltage_park_sdk.datamodel.shared import (
     ListResponse,
     OrganizationSSHKey,
     OrganzationSSHKeyNone,
+    VoltageParkModel,
 )
 
 # General components
@@ -31,7 +32,7 @@ BaremetalRentalPutPowerStatusOptions = Literal[
 ]
 
 
-class BaremetalNodeSpec(BaseModel):
+class BaremetalNodeSpec(VoltageParkModel):
     gpu_model: GPUModelOptions = Field(
         description="The model of the GPU",
         default="h100-sxm5-80gb",
@@ -59,7 +60,7 @@ class BaremetalNodeSpec(BaseModel):
 
 # GET bare-metal/locations/
 # GET bare-metal/locations/{location_id}
-class BaremetalLocation(BaseModel):
+class BaremetalLocation(VoltageParkModel):
     id: str = Field(description="The ID of the location")
     gpu_count_ethernet: int = Field(
         description="The number of GPUs available on ethernet",
@@ -85,13 +86,13 @@ class BaremetalLocations(ListResponse[BaremetalLocation]):
 
 
 # POST bare-metal/
-class BaremetalCloudInit(BaseModel):
+class BaremetalCloudInit(VoltageParkModel):
     packages: list[str] | None = None
     write_files: list[CloudInitFile] | None = None
     runcmd: list[str] | None = None
 
 
-class BaremetalRentalCreatePayload(BaseModel):
+class BaremetalRentalCreatePayload(VoltageParkModel):
     location_id: str = Field(
         description="The ID of the location to create the rental on"
     )
@@ -131,7 +132,7 @@ class BaremetalRentalCreatePayload(BaseModel):
     )
 
 
-class BaremetalRentalCreateResponse(BaseModel):
+class BaremetalRentalCreateResponse(VoltageParkModel):
     rental_id: str = Field(
         description="The ID of the rental",
     )
@@ -142,7 +143,7 @@ class BaremetalRentalCreateResponse(BaseModel):
 
 
 # GET bare-metal/
-class NodeNetworking(BaseModel):
+class NodeNetworking(VoltageParkModel):
     public_ip: str = Field(
         description="The public IP of the node",
     )
@@ -151,7 +152,7 @@ class NodeNetworking(BaseModel):
     )
 
 
-class BaremetalRentalBase(BaseModel):
+class BaremetalRentalBase(VoltageParkModel):
     id: str = Field(
         description="The ID of the rental",
     )
@@ -246,14 +247,14 @@ class BaremetalRentals(ListResponse[BaremetalRental]):
 
 
 # PUT bare-metal/{baremetal_rental_id}/power-status
-class BaremetalRentalPowerStatusPayload(BaseModel):
+class BaremetalRentalPowerStatusPayload(VoltageParkModel):
     status: BaremetalRentalPutPowerStatusOptions = Field(
         description="The power status to set the rental to",
     )
 
 
 # PATCH bare-metal/{baremetal_rental_id}
-class BaremetalRentalPatchPayload(BaseModel):
+class BaremetalRentalPatchPayload(VoltageParkModel):
     name: str | None = Field(
         description="The name of the rental",
     )
@@ -262,7 +263,7 @@ class BaremetalRentalPatchPayload(BaseModel):
     )
 
 
-class BaremetalRentalPatchResponse(BaseModel):
+class BaremetalRentalPatchResponse(VoltageParkModel):
     name: str | None = Field(
         description="The name of the rental",
     )
@@ -272,14 +273,14 @@ class BaremetalRentalPatchResponse(BaseModel):
 
 
 # POST bare-metal/{baremetal_rental_id}/reboot
-class BaremetalRentalRebootNodesPayload(BaseModel):
+class BaremetalRentalRebootNodesPayload(VoltageParkModel):
     public_ips: list[str] = Field(
         description="The public IPs of the nodes to reboot",
     )
 
 
 # PATCH bare-metal/{baremetal_rental_id}/remove-nodes
-class BaremetalRentalRemoveNodesPayload(BaseModel):
+class BaremetalRentalRemoveNodesPayload(VoltageParkModel):
     public_ips: list[str] = Field(
         description="The public IPs of the nodes to remove",
     )
@@ -1,9 +1,9 @@
 from datetime import datetime
 from typing import Annotated, Literal
 
-from pydantic import AfterValidator, BaseModel, Field
+from pydantic import AfterValidator, Field
 
-from voltage_park_sdk.datamodel.shared import ListResponse
+from voltage_park_sdk.datamodel.shared import ListResponse, VoltageParkModel
 
 BillingResourceTypeOptions = Literal[
     "virtual_machine",
@@ -14,7 +14,7 @@ BillingResourceTypeOptions = Literal[
 
 
 # GET billing/hourly-rate
-class BillingHourlyRate(BaseModel):
+class BillingHourlyRate(VoltageParkModel):
     rate_hourly: str = Field(
         description="The current hourly rate for all resources in the organization",
     )
@@ -69,7 +69,7 @@ MaybeDatetime = Annotated[str | None, AfterValidator(is_valid_datetime_or_none)]
 
 
 # GET billing/transactions
-class BillingTransactionsPayload(BaseModel):
+class BillingTransactionsPayload(VoltageParkModel):
     limit: int | None = Field(
         description="The maximum number of transactions to return",
         default=None,
@@ -92,7 +92,7 @@ class BillingTransactionsPayload(BaseModel):
     )
 
 
-class TransactionLinkedInstance(BaseModel):
+class TransactionLinkedInstance(VoltageParkModel):
     id: str = Field(
         description="The ID of the linked transaction instance",
     )
@@ -104,13 +104,13 @@ class TransactionLinkedInstance(BaseModel):
     )
 
 
-class StripeDepositBillingDetails(BaseModel):
+class StripeDepositBillingDetails(VoltageParkModel):
     type: Literal["stripe_deposit"] = Field(
         description="The type of billing details",
     )
 
 
-class StoragePayoutBillingDetails(BaseModel):
+class StoragePayoutBillingDetails(VoltageParkModel):
     type: Literal["storage_payout"] = Field(
         description="The type of billing details",
     )
@@ -119,7 +119,7 @@ class StoragePayoutBillingDetails(BaseModel):
     )
 
 
-class StorageChargeBillingDetails(BaseModel):
+class StorageChargeBillingDetails(VoltageParkModel):
     type: Literal["storage_charge"] = Field(
         description="The type of billing details",
     )
@@ -128,7 +128,7 @@ class StorageChargeBillingDetails(BaseModel):
     )
 
 
-class OtherBillingDetails(BaseModel):
+class OtherBillingDetails(VoltageParkModel):
     type: Literal["other"] = Field(
         description="The type of billing details",
     )
@@ -146,7 +146,7 @@ class VMTransactionLinkedInstance(TransactionLinkedInstance):
     )
 
 
-class VMPayoutBillingDetails(BaseModel):
+class VMPayoutBillingDetails(VoltageParkModel):
     type: Literal["payout"] = Field(
         description="The type of billing details",
     )
@@ -155,7 +155,7 @@ class VMPayoutBillingDetails(BaseModel):
     )
 
 
-class VMChargeBillingDetails(BaseModel):
+class VMChargeBillingDetails(VoltageParkModel):
     type: Literal["charge"] = Field(
         description="The type of billing details",
     )
@@ -170,7 +170,7 @@ class BaremetalTransactionLinkedInstance(TransactionLinkedInstance):
     )
 
 
-class BaremetalPayoutBillingDetails(BaseModel):
+class BaremetalPayoutBillingDetails(VoltageParkModel):
     type: Literal["baremetal_payout"] = Field(
         description="The type of billing details",
     )
@@ -179,7 +179,7 @@ class BaremetalPayoutBillingDetails(BaseModel):
     )
 
 
-class BaremetalChargeBillingDetails(BaseModel):
+class BaremetalChargeBillingDetails(VoltageParkModel):
     type: Literal["baremetal_charge"] = Field(
         description="The type of billing details",
     )
@@ -201,7 +201,7 @@ BillingDetails = Annotated[
 ]
 
 
-class BillingTransaction(BaseModel):
+class BillingTransaction(VoltageParkModel):
     id: str = Field(
         description="The ID of the transaction",
     )
@@ -227,7 +227,7 @@ class BillingTransactionsResponse(ListResponse[BillingTransaction]):
 
 
 # GET billing/reports/{year}/{month}/transactions
-class MonthlyBillingReport(BaseModel):
+class MonthlyBillingReport(VoltageParkModel):
     transactions: list[BillingTransaction] = Field(
         description="The transactions for the month",
     )
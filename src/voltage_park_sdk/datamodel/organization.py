@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import Field
 
-from voltage_park_sdk.datamodel.shared import ListResponse
+from voltage_park_sdk.datamodel.shared import ListResponse, VoltageParkModel
 
 
 # GET organization
-class Organization(BaseModel):
+class Organization(VoltageParkModel):
     id: str = Field(
         description="The ID of the organization",
     )
@@ -20,7 +20,7 @@ class Organization(BaseModel):
 
 
 # PATCH organization
-class OrganizationPatchPayload(BaseModel):
+class OrganizationPatchPayload(VoltageParkModel):
     billing_notification_target_emails: list[str] = Field(
         description=(
             "A list of email addresses to which billing-related emails will "
@@ -34,7 +34,7 @@ class OrganizationPatchResponse(Organization):
 
 
 # GET organization/ssh-keys
-class SSHKey(BaseModel):
+class SSHKey(VoltageParkModel):
     id: str = Field(
         description="The ID of the SSH key",
     )
@@ -51,7 +51,7 @@ class SSHKeys(ListResponse[SSHKey]):
 
 
 # POST organization/ssh-keys
-class SSHKeyCreatePayload(BaseModel):
+class SSHKeyCreatePayload(VoltageParkModel):
     name: str = Field(
         description="The name of the SSH key",
     )
@@ -1,6 +1,6 @@
 from typing import Any, Generic, Literal, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 GPUModelOptions = Literal[
     "h100-sxm5-80gb",
@@ -57,17 +57,24 @@ GPUModelOptions = Literal[
     "geforecegt710-pcie-1gb",
 ]
 
+
+class VoltageParkModel(BaseModel):
+    # Building the validators of every model at import time is slow, and most
+    # programs only use a few of them, so build each on first use instead.
+    model_config = ConfigDict(defer_build=True)
+
+
 ResponseT = TypeVar("ResponseT", bound=BaseModel)
 
 
-class ListResponse(BaseModel, Generic[ResponseT]):
+class ListResponse(VoltageParkModel, Generic[ResponseT]):
     results: list[ResponseT]
     total_result_count: int
     has_previous: bool
     has_next: bool
 
 
-class CloudInitFile(BaseModel):
+class CloudInitFile(VoltageParkModel):
     content: str
     path: str
     encoding: str | None = None
@@ -75,15 +82,15 @@ class CloudInitFile(BaseModel):
     permissions: str | None = None
 
 
-class OrganzationSSHKeyNone(BaseModel):
+class OrganzationSSHKeyNone(VoltageParkModel):
     mode: Literal["none"] = "none"
 
 
-class OrganzationSSHKeyAll(BaseModel):
+class OrganzationSSHKeyAll(VoltageParkModel):
     mode: Literal["all"] = "all"
 
 
-class OrganzationSSHKeySelective(BaseModel):
+class OrganzationSSHKeySelective(VoltageParkModel):
     mode: Literal["selective"] = "selective"
     ssh_key_ids: list[str] = Field(
         description="A list of organization SSH keys to use for the rental",
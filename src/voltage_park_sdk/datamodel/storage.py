@@ -1,13 +1,13 @@
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
-from voltage_park_sdk.datamodel.shared import ListResponse
+from voltage_park_sdk.datamodel.shared import ListResponse, VoltageParkModel
 
 StorageVolumeStatusOptions = Literal["active", "inactive"]
 
 
-class StorageVolume(BaseModel):
+class StorageVolume(VoltageParkModel):
     id: str = Field(
         description="The ID of the created storage volume",
     )
@@ -36,14 +36,14 @@ class StorageVolume(BaseModel):
 
 
 # GET storage/hourly-rate
-class StorageHourlyRate(BaseModel):
+class StorageHourlyRate(VoltageParkModel):
     hourly_rate_per_gb: str
 
 
 # POST storage
 
 
-class StorageVolumeCreatePayload(BaseModel):
+class StorageVolumeCreatePayload(VoltageParkModel):
     size_in_gb: int = Field(
         description="The size of the storage volume in GB",
         gt=0,
@@ -66,7 +66,7 @@ class StorageVolumesGetResponse(ListResponse[StorageVolume]):
 
 
 # PATCH storage/{storage_id}
-class StorageVolumePatchPayload(BaseModel):
+class StorageVolumePatchPayload(VoltageParkModel):
     size_in_gb: int | None = Field(
         description="The size of the storage volume in GB",
     )
@@ -1,12 +1,14 @@
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+
+from voltage_park_sdk.datamodel.shared import VoltageParkModel
 
 CloudinitValidationTypeOptions = Literal["instant-vm", "vm", "baremetal"]
 
 
 # POST validate/cloudinit
-class CloudinitValidationPayload(BaseModel):
+class CloudinitValidationPayload(VoltageParkModel):
     type: CloudinitValidationTypeOptions = Field(
         description="The type of cloudinit script",
     )
@@ -15,7 +17,7 @@ class CloudinitValidationPayload(BaseModel):
     )
 
 
-class CloudinitValidationResponse(BaseModel):
+class CloudinitValidationResponse(VoltageParkModel):
     error: bool = Field(
         description="Whether the cloudinit script is valid",
     )
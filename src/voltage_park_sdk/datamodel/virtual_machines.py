@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
 from voltage_park_sdk.datamodel.shared import (
     CloudInitFile,
@@ -8,6 +8,7 @@ from voltage_park_sdk.datamodel.shared import (
     ListResponse,
     OrganizationSSHKey,
     OrganzationSSHKeyNone,
+    VoltageParkModel,
 )
 
 VirtualMachineTypeOptions = Literal[
@@ -43,14 +44,14 @@ VirtualMachineOperatingSystemOptions = Literal[
 
 
 # General components
-class GPUResource(BaseModel):
+class GPUResource(VoltageParkModel):
     count: int = Field(
         description="The number of GPUs of this type",
         gt=0,
     )
 
 
-class VirtualMachineResources(BaseModel):
+class VirtualMachineResources(VoltageParkModel):
     gpus: dict[GPUModelOptions, GPUResource] = Field(
         description="Mapping between GPU type and number of GPUs",
     )
@@ -70,7 +71,7 @@ class VirtualMachineResources(BaseModel):
 
 # GET virtual-machines/instant/locations
 # GET virtual-machines/instant/locations/{location_id}
-class VirtualMachinePreset(BaseModel):
+class VirtualMachinePreset(VoltageParkModel):
     id: str = Field(
         description="The ID of the preset",
     )
@@ -92,7 +93,7 @@ class VirtualMachinePreset(BaseModel):
     )
 
 
-class VirtualMachineLocation(BaseModel):
+class VirtualMachineLocation(VoltageParkModel):
     id: str = Field(
         description="The ID of the location",
     )
@@ -107,34 +108,28 @@ class VirtualMachineLocations(ListResponse[VirtualMachineLocation]):
 
 # GET virtual-machines/
 # GET virtual-machines/{virtual_machine_id}
-class VirtualMachinePricing(BaseModel):
+class VirtualMachinePricing(VoltageParkModel):
     gpus_per_hr: str = Field(
         description="The price of the GPUs per hour",
-        gt=0,
     )
     vcpu_per_hr: str = Field(
         description="The price of the vCPUs per hour",
-        gt=0,
     )
     ram_per_hr: str = Field(
         description="The price of the RAM per hour",
-        gt=0,
     )
     storage_per_hr: str = Field(
         description="The price of the storage per hour",
-        gt=0,
     )
     total_associated_per_hr: str = Field(
         description="The price of the total associated per hour",
-        gt=0,
     )
     total_disassociated_per_hr: str = Field(
         description="The price of the total disassociated per hour",
-        gt=0,
     )
 
 
-class PortForward(BaseModel):
+class PortForward(VoltageParkModel):
     internal_port: int = Field(
         description="The internal port of the port forward",
         ge=1,
@@ -147,7 +142,7 @@ class PortForward(BaseModel):
     )
 
 
-class VirtualMachine(BaseModel):
+class VirtualMachine(VoltageParkModel):
     id: str = Field(
         description="The ID of the virtual machine",
     )
@@ -194,13 +189,13 @@ class VirtualMachines(ListResponse[VirtualMachine]):
 
 
 # POST virtual-machines/instant
-class VirtualMachineCloudInit(BaseModel):
+class VirtualMachineCloudInit(VoltageParkModel):
     packages: list[str] | None = None
     write_files: list[CloudInitFile] | None = None
     runcmd: list[str] | None = None
 
 
-class VirtualMachineDeployPayload(BaseModel):
+class VirtualMachineDeployPayload(VoltageParkModel):
     config_id: str = Field(
         description="The ID of the config to deploy",
     )
@@ -229,14 +224,14 @@ class VirtualMachineDeployPayload(BaseModel):
     )
 
 
-class VirtualMachineDeployResponse(BaseModel):
+class VirtualMachineDeployResponse(VoltageParkModel):
     vm_id: str = Field(
         description="The ID of the virtual machine",
     )
 
 
 # PATCH virtual-machines/{virtual_machine_id}
-class VirtualMachinePatchPayload(BaseModel):
+class VirtualMachinePatchPayload(VoltageParkModel):
     name: str | None = Field(
         description="The name of the virtual machine",
     )
@@ -245,7 +240,7 @@ class VirtualMachinePatchPayload(BaseModel):
     )
 
 
-class VirtualMachinePatchResponse(BaseModel):
+class VirtualMachinePatchResponse(VoltageParkModel):
     name: str | None = Field(
         description="The name of the virtual machine",
     )
@@ -255,7 +250,7 @@ class VirtualMachinePatchResponse(BaseModel):
 
 
 # PUT virtual-machines/{virtual_machine_id}/power-status
-class VirtualMachinePowerStatus(BaseModel):
+class VirtualMachinePowerStatus(VoltageParkModel):
     status: VirtualMachinePowerStatusOptions = Field(
         description="The power status of the virtual machine"
     )
@@ -0,0 +1,261 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Literal, Self
+
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.datamodel.baremetal import (
+    BaremetalRental,
+    BaremetalRentalActive,
+)
+from voltage_park_sdk.datamodel.virtual_machines import VirtualMachine
+
+logger = logging.getLogger(__name__)
+
+type FleetResource = VirtualMachine | BaremetalRental
+type ResourceKind = Literal["virtual_machine", "baremetal_rental"]
+
+_INDEXES = ("tag", "status", "power_status", "public_ip", "private_ip", "hostnode_id")
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+def diff_snapshots[T](old: Mapping[str, T], new: Mapping[str, T]) -> SnapshotDiff:
+    return SnapshotDiff(
+        added=[key for key in new if key not in old],
+        removed=[key for key in old if key not in new],
+        modified=[key for key in new if key in old and new[key] != old[key]],
+    )
+
+
+def _index_keys(resource: FleetResource) -> Iterator[tuple[str, str]]:
+    yield "status", resource.status
+    if isinstance(resource, VirtualMachine):
+        yield "hostnode_id", resource.hostnode_id
+        yield "public_ip", resource.public_ip
+        yield "private_ip", resource.internal_ip
+        for tag in resource.tags:
+            yield "tag", tag
+    elif isinstance(resource, BaremetalRentalActive):
+        yield "power_status", resource.power_status
+        for node in resource.node_networking:
+            yield "public_ip", node.public_ip
+            yield "private_ip", node.private_ip
+        for tag in resource.tags or []:
+            yield "tag", tag
+
+
+class FleetIndex:
+    """An in-memory index of the organization's VMs and bare-metal rentals.
+
+    Lookups by ID, tag, status, power status, IP address (public, private or
+    any node's) and host node are answered from memory without calling the
+    API, and lookups that can match several resources return them all,
+    sorted by ID. Private addresses repeat between rentals and VMs can share
+    a public address, so an IP address can match more than one resource. Call `refresh` to update the index, or `start` a background thread
+    that refreshes it every `refresh_interval` seconds. Lookups keep serving
+    the previous snapshot while a refresh is in flight, and refreshes only
+    touch the index entries of resources that changed. A lookup on a stale
+    index answers from the snapshot it has and refreshes it in the background.
+    """
+
+    def __init__(
+        self,
+        client: VoltageParkClient,
+        refresh_interval: float = 30,
+        page_size: int = 100,
+    ) -> None:
+        self._client = client
+        self._refresh_interval = refresh_interval
+        self._page_size = page_size
+        self._resources: dict[str, FleetResource] = {}
+        self._indexes: dict[str, defaultdict[str, set[str]]] = {
+            name: defaultdict(set) for name in _INDEXES
+        }
+        self._lock = threading.Lock()
+        self._refreshed_at: float | None = None
+        self._revalidating = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_error: Exception | None = None
+
+    ##############
+    # Refreshing #
+    ##############
+
+    def refresh(self) -> SnapshotDiff:
+        # Fetch outside the lock so lookups keep being served meanwhile.
+        snapshot: dict[str, FleetResource] = {}
+        for virtual_machine in self._client.fetch_all(
+            self._client.get_virtual_machines, page_size=self._page_size
+        ):
+            snapshot[virtual_machine.id] = virtual_machine
+        for rental in self._client.fetch_all(
+            self._client.get_baremetal_rentals, page_size=self._page_size
+        ):
+            snapshot[rental.id] = rental
+        return self.apply(snapshot)
+
+    def apply(self, snapshot: Mapping[str, FleetResource]) -> SnapshotDiff:
+        with self._lock:
+            diff = diff_snapshots(self._resources, snapshot)
+            for resource_id in diff.removed + diff.modified:
+                self._unindex(self._resources.pop(resource_id))
+            for resource_id in diff.added + diff.modified:
+                self._resources[resource_id] = snapshot[resource_id]
+                self._index(snapshot[resource_id])
+            self._refreshed_at = time.monotonic()
+        return diff
+
+    def start(self) -> Self:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="voltage-park-fleet-index", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    @property
+    def age(self) -> float | None:
+        # Seconds since the last successful refresh.
+        if self._refreshed_at is None:
+            return None
+        return time.monotonic() - self._refreshed_at
+
+    @property
+    def is_stale(self) -> bool:
+        age = self.age
+        return age is None or age > self._refresh_interval
+
+    ###########
+    # Lookups #
+    ###########
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._resources)
+
+    def get(self, resource_id: str) -> FleetResource | None:
+        with self._lock:
+            self._revalidate()
+            return self._resources.get(resource_id)
+
+    def virtual_machines(self) -> list[VirtualMachine]:
+        with self._lock:
+            self._revalidate()
+            return [
+                r for r in self._resources.values() if isinstance(r, VirtualMachine)
+            ]
+
+    def baremetal_rentals(self) -> list[BaremetalRental]:
+        with self._lock:
+            self._revalidate()
+            return [
+                r for r in self._resources.values() if not isinstance(r, VirtualMachine)
+            ]
+
+    def by_tag(self, tag: str) -> list[FleetResource]:
+        return self._lookup("tag", tag)
+
+    def by_status(self, status: str) -> list[FleetResource]:
+        return self._lookup("status", status)
+
+    def by_power_status(self, power_status: str) -> list[FleetResource]:
+        return self._lookup("power_status", power_status)
+
+    def by_hostnode(self, hostnode_id: str) -> list[FleetResource]:
+        return self._lookup("hostnode_id", hostnode_id)
+
+    def by_public_ip(self, ip: str) -> list[FleetResource]:
+        return self._lookup("public_ip", ip)
+
+    def by_private_ip(self, ip: str) -> list[FleetResource]:
+        return self._lookup("private_ip", ip)
+
+    def by_ip(self, ip: str) -> list[FleetResource]:
+        # Resources with the address as either their public or private one.
+        with self._lock:
+            self._revalidate()
+            ids = self._indexes["public_ip"].get(ip, set())
+            ids = ids | self._indexes["private_ip"].get(ip, set())
+            return [self._resources[resource_id] for resource_id in sorted(ids)]
+
+    ###################
+    # Private helpers #
+    ###################
+
+    def _lookup(self, index: str, key: str) -> list[FleetResource]:
+        with self._lock:
+            self._revalidate()
+            return [
+                self._resources[resource_id]
+                for resource_id in sorted(self._indexes[index].get(key, ()))
+            ]
+
+    def _index(self, resource: FleetResource) -> None:
+        for index, key in _index_keys(resource):
+            self._indexes[index][key].add(resource.id)
+
+    def _unindex(self, resource: FleetResource) -> None:
+        for index, key in _index_keys(resource):
+            ids = self._indexes[index][key]
+            ids.discard(resource.id)
+            if not ids:
+                del self._indexes[index][key]
+
+    def _revalidate(self) -> None:
+        # Called with the lock held, so at most one revalidation runs at once.
+        if self._revalidating or not self.is_stale:
+            return
+        self._revalidating = True
+        threading.Thread(
+            target=self._revalidate_in_background,
+            name="voltage-park-fleet-index-revalidate",
+            daemon=True,
+        ).start()
+
+    def _revalidate_in_background(self) -> None:
+        try:
+            self._try_refresh()
+        finally:
+            with self._lock:
+                self._revalidating = False
+
+    def _try_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:  # noqa: BLE001
+            # Keep serving the last snapshot and try again next time.
+            logger.warning("Failed to refresh the fleet index: %s", e)
+            self.last_error = e
+        else:
+            self.last_error = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._try_refresh()
+            self._stop.wait(self._refresh_interval)
@@ -0,0 +1,235 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Protocol
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Path segments with a digit in them are IDs (UUIDs, years, months), which
+# are folded into a placeholder to keep the number of series bounded.
+_ID_SEGMENT = re.compile(r"[^/]*\d[^/]*")
+_TEMPLATES: dict[str, str] = {}
+_MAX_TEMPLATES = 4096
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Return `endpoint` with its IDs replaced, e.g. `virtual-machines/{id}`."""
+    template = _TEMPLATES.get(endpoint)
+    if template is None:
+        template = _ID_SEGMENT.sub("{id}", endpoint.split("?", 1)[0])
+        if len(_TEMPLATES) < _MAX_TEMPLATES:
+            _TEMPLATES[endpoint] = template
+    return template
+
+
+class MetricsHook(Protocol):
+    """Receives every observation made by a `MetricsRegistry`.
+
+    `endpoint` is always an endpoint template, and `status` is the HTTP
+    status code, or `"error"` if no response was received.
+    """
+
+    def on_request(
+        self, method: str, endpoint: str, status: int | str, duration: float
+    ) -> None: ...
+
+    def on_retry(self, method: str, endpoint: str) -> None: ...
+
+    def on_cache(self, endpoint: str, *, hit: bool) -> None: ...
+
+
+@dataclass
+class _Histogram:
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class _Series:
+    requests: defaultdict[tuple[str, str, int | str], int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+    latencies: dict[tuple[str, str], _Histogram] = field(default_factory=dict)
+    retries: defaultdict[tuple[str, str], int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+    cache: defaultdict[tuple[str, str], int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+
+
+class MetricsRegistry:
+    """Counts requests, latencies, retries and cache lookups of a client.
+
+    Pass one to a client with `metrics=` (it can be shared between clients).
+    Series are labelled by endpoint template, HTTP method and status code.
+    Each observation is a dictionary update under a lock, so the registry can
+    stay enabled in hot paths. Export the series with `to_prometheus`, or
+    forward every observation to other systems with `add_hook`.
+    """
+
+    def __init__(
+        self, buckets: Iterable[float] = DEFAULT_BUCKETS, prefix: str = "voltage_park"
+    ) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._prefix = prefix
+        self._series = _Series()
+        self._hooks: list[MetricsHook] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: MetricsHook) -> None:
+        # The list is replaced rather than appended to, so observers can
+        # iterate the one they read under the lock without holding it.
+        with self._lock:
+            self._hooks = [*self._hooks, hook]
+
+    ################
+    # Observations #
+    ################
+
+    def observe_request(
+        self, method: str, endpoint: str, status: int | str, duration: float
+    ) -> None:
+        method = method.upper()
+        endpoint = endpoint_template(endpoint)
+        bucket = bisect_left(self._buckets, duration)
+        with self._lock:
+            self._series.requests[endpoint, method, status] += 1
+            histogram = self._series.latencies.get((endpoint, method))
+            if histogram is None:
+                histogram = _Histogram([0] * (len(self._buckets) + 1))
+                self._series.latencies[endpoint, method] = histogram
+            histogram.counts[bucket] += 1
+            histogram.total += duration
+            histogram.count += 1
+            hooks = self._hooks
+        for hook in hooks:
+            hook.on_request(method, endpoint, status, duration)
+
+    def observe_retry(self, method: str, endpoint: str) -> None:
+        method = method.upper()
+        endpoint = endpoint_template(endpoint)
+        with self._lock:
+            self._series.retries[endpoint, method] += 1
+            hooks = self._hooks
+        for hook in hooks:
+            hook.on_retry(method, endpoint)
+
+    def observe_cache(self, endpoint: str, *, hit: bool) -> None:
+        endpoint = endpoint_template(endpoint)
+        with self._lock:
+            self._series.cache[endpoint, "hit" if hit else "miss"] += 1
+            hooks = self._hooks
+        for hook in hooks:
+            hook.on_cache(endpoint, hit=hit)
+
+    ###########
+    # Queries #
+    ###########
+
+    def request_count(
+        self,
+        endpoint: str | None = None,
+        method: str | None = None,
+        status: int | str | None = None,
+    ) -> int:
+        # Counts the requests matching every given label.
+        with self._lock:
+            return sum(
+                count
+                for (e, m, s), count in self._series.requests.items()
+                if (endpoint is None or e == endpoint_template(endpoint))
+                and (method is None or m == method.upper())
+                and (status is None or s == status)
+            )
+
+    def retry_count(self, endpoint: str | None = None) -> int:
+        with self._lock:
+            return sum(
+                count
+                for (e, _), count in self._series.retries.items()
+                if endpoint is None or e == endpoint_template(endpoint)
+            )
+
+    def cache_count(self, *, hit: bool, endpoint: str | None = None) -> int:
+        result = "hit" if hit else "miss"
+        with self._lock:
+            return sum(
+                count
+                for (e, r), count in self._series.cache.items()
+                if r == result
+                and (endpoint is None or e == endpoint_template(endpoint))
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series = _Series()
+
+    def to_prometheus(self) -> str:
+        """Return every series in the Prometheus text exposition format."""
+        with self._lock:
+            requests = sorted(self._series.requests.items(), key=str)
+            latencies = sorted(
+                (key, _Histogram(list(h.counts), h.total, h.count))
+                for key, h in self._series.latencies.items()
+            )
+            retries = sorted(self._series.retries.items())
+            cache = sorted(self._series.cache.items())
+        name = self._prefix
+        lines = [
+            f"# HELP {name}_requests_total Requests sent, by response status.",
+            f"# TYPE {name}_requests_total counter",
+        ]
+        for (endpoint, method, status), count in requests:
+            labels = _labels(endpoint=endpoint, method=method, status=str(status))
+            lines.append(f"{name}_requests_total{{{labels}}} {count}")
+        lines += [
+            f"# HELP {name}_request_duration_seconds Request latency.",
+            f"# TYPE {name}_request_duration_seconds histogram",
+        ]
+        for (endpoint, method), histogram in latencies:
+            labels = _labels(endpoint=endpoint, method=method)
+            cumulative = 0
+            for bound, count in zip(
+                [*map(str, self._buckets), "+Inf"], histogram.counts, strict=True
+            ):
+                cumulative += count
+                lines.append(
+                    f'{name}_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f"{name}_request_duration_seconds_sum{{{labels}}} {histogram.total}"
+            )
+            lines.append(
+                f"{name}_request_duration_seconds_count{{{labels}}} {histogram.count}"
+            )
+        lines += [
+            f"# HELP {name}_retries_total Requests retried.",
+            f"# TYPE {name}_retries_total counter",
+        ]
+        for (endpoint, method), count in retries:
+            labels = _labels(endpoint=endpoint, method=method)
+            lines.append(f"{name}_retries_total{{{labels}}} {count}")
+        lines += [
+            f"# HELP {name}_cache_lookups_total Response cache lookups.",
+            f"# TYPE {name}_cache_lookups_total counter",
+        ]
+        for (endpoint, result), count in cache:
+            labels = _labels(endpoint=endpoint, result=result)
+            lines.append(f"{name}_cache_lookups_total{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    # Label values escape backslashes, double quotes and line feeds.
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
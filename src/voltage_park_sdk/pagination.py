@@ -0,0 +1,251 @@
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from voltage_park_sdk.datamodel.shared import ListResponse
+
+# asyncio and concurrent.futures take a while to import, so they're imported
+# by the functions that use them rather than by every program using the SDK.
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+DEFAULT_PAGE_SIZE = 100
+
+# Fetch a single page given (limit, offset).
+type PageFetcher[ItemT: BaseModel] = Callable[[int, int], ListResponse[ItemT]]
+type AsyncPageFetcher[ItemT: BaseModel] = Callable[
+    [int, int], Awaitable[ListResponse[ItemT]]
+]
+
+
+def _check_page_size(page_size: int) -> None:
+    if page_size <= 0:
+        msg = f"page_size must be positive, got {page_size}"
+        raise ValueError(msg)
+
+
+def _is_last_page(page: ListResponse[Any]) -> bool:
+    return not page.has_next or not page.results
+
+
+def iter_pages[ItemT: BaseModel](
+    fetch_page: PageFetcher[ItemT],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[ListResponse[ItemT]]:
+    """Lazily yield pages, fetching the next page while the caller works."""
+    return _prefetch_pages(fetch_page, page_size)
+
+
+def iter_items[ItemT: BaseModel](
+    fetch_page: PageFetcher[ItemT],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[ItemT]:
+    for page in iter_pages(fetch_page, page_size):
+        yield from page.results
+
+
+def iter_raw_items(
+    fetch_page: Callable[[int, int], dict[str, Any]],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[dict[str, Any]]:
+    # Like iter_items, for pages that are decoded from JSON but not
+    # validated, e.g. to load them straight into arrays.
+    for page in _prefetch_pages(fetch_page, page_size):
+        yield from page["results"]
+
+
+async def aiter_pages[ItemT: BaseModel](
+    fetch_page: AsyncPageFetcher[ItemT],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncIterator[ListResponse[ItemT]]:
+    """Async counterpart of `iter_pages`."""
+    import asyncio
+
+    _check_page_size(page_size)
+    offset = 0
+    pending = asyncio.ensure_future(fetch_page(page_size, offset))
+    try:
+        while True:
+            page = await pending
+            if _is_last_page(page):
+                yield page
+                return
+            offset += len(page.results)
+            pending = asyncio.ensure_future(fetch_page(page_size, offset))
+            yield page
+    finally:
+        pending.cancel()
+
+
+async def aiter_items[ItemT: BaseModel](
+    fetch_page: AsyncPageFetcher[ItemT],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncIterator[ItemT]:
+    async for page in aiter_pages(fetch_page, page_size):
+        for item in page.results:
+            yield item
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+MAX_ADAPTIVE_PAGE_SIZE = 1000
+
+
+def _adapt_page_size(page_size: int, elapsed: float, target_latency: float) -> int:
+    # Assume latency grows roughly linearly with page size and rescale the
+    # page size so that each remaining request takes about target_latency.
+    scaled = round(page_size * target_latency / max(elapsed, 1e-3))
+    return max(1, min(scaled, MAX_ADAPTIVE_PAGE_SIZE))
+
+
+def _cap_page_size(page_size: int, requested: int, first: ListResponse[Any]) -> int:
+    # A short first page that still has a next page means the server caps the
+    # page size, so there's no point asking for more than that.
+    if len(first.results) < requested:
+        return min(page_size, len(first.results))
+    return page_size
+
+
+def _plan_requests(start: int, total: int, page_size: int) -> list[tuple[int, int]]:
+    return [(offset, page_size) for offset in range(start, total, page_size)]
+
+
+def _follow_up(
+    offset: int, limit: int, page: ListResponse[Any], total: int
+) -> tuple[int, int] | None:
+    # The server may cap the page size below what we asked for. If it does,
+    # request whatever is missing from the planned range.
+    received = len(page.results)
+    if received == 0 or received >= limit or offset + received >= total:
+        return None
+    return offset + received, limit - received
+
+
+def _check_concurrency(max_concurrency: int) -> None:
+    if max_concurrency <= 0:
+        msg = f"max_concurrency must be positive, got {max_concurrency}"
+        raise ValueError(msg)
+
+
+def fetch_all[ItemT: BaseModel](
+    fetch_page: PageFetcher[ItemT],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    target_latency: float | None = None,
+) -> list[ItemT]:
+    """Fetch every item, requesting the remaining pages concurrently.
+
+    The first page tells us `total_result_count`, so every other offset is
+    known up front. Items are returned in server order. If `target_latency`
+    is given, the page size for the remaining requests is tuned from the
+    latency of the first request.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    _check_page_size(page_size)
+    _check_concurrency(max_concurrency)
+    requested = page_size
+    start_time = time.perf_counter()
+    first = fetch_page(page_size, 0)
+    if _is_last_page(first):
+        return list(first.results)
+    if target_latency is not None:
+        elapsed = time.perf_counter() - start_time
+        page_size = _adapt_page_size(page_size, elapsed, target_latency)
+    page_size = _cap_page_size(page_size, requested, first)
+
+    total = first.total_result_count
+    pages: dict[int, list[ItemT]] = {0: list(first.results)}
+    planned = _plan_requests(len(first.results), total, page_size)
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        while planned:
+            futures = {
+                executor.submit(fetch_page, limit, offset): (offset, limit)
+                for offset, limit in planned
+            }
+            planned = []
+            for future, (offset, limit) in futures.items():
+                page = future.result()
+                pages[offset] = list(page.results)
+                follow_up = _follow_up(offset, limit, page, total)
+                if follow_up is not None:
+                    planned.append(follow_up)
+    return [item for offset in sorted(pages) for item in pages[offset]]
+
+
+async def afetch_all[ItemT: BaseModel](
+    fetch_page: AsyncPageFetcher[ItemT],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    target_latency: float | None = None,
+) -> list[ItemT]:
+    """Async counterpart of `fetch_all`."""
+    import asyncio
+
+    _check_page_size(page_size)
+    _check_concurrency(max_concurrency)
+    requested = page_size
+    start_time = time.perf_counter()
+    first = await fetch_page(page_size, 0)
+    if _is_last_page(first):
+        return list(first.results)
+    if target_latency is not None:
+        elapsed = time.perf_counter() - start_time
+        page_size = _adapt_page_size(page_size, elapsed, target_latency)
+    page_size = _cap_page_size(page_size, requested, first)
+
+    total = first.total_result_count
+    pages: dict[int, list[ItemT]] = {0: list(first.results)}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(offset: int, limit: int) -> ListResponse[ItemT]:
+        async with semaphore:
+            return await fetch_page(limit, offset)
+
+    planned = _plan_requests(len(first.results), total, page_size)
+    while planned:
+        results = await asyncio.gather(
+            *(fetch(offset, limit) for offset, limit in planned)
+        )
+        follow_ups = []
+        for (offset, limit), page in zip(planned, results, strict=False):
+            pages[offset] = list(page.results)
+            follow_up = _follow_up(offset, limit, page, total)
+            if follow_up is not None:
+                follow_ups.append(follow_up)
+        planned = follow_ups
+    return [item for offset in sorted(pages) for item in pages[offset]]
+
+
+def _prefetch_pages[PageT: ListResponse[Any] | dict[str, Any]](
+    fetch_page: Callable[[int, int], PageT],
+    page_size: int,
+) -> Iterator[PageT]:
+    _check_page_size(page_size)
+    # A single background worker fetches page n + 1 while page n is being
+    # consumed, so at most two pages are ever held in memory.
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        offset = 0
+        pending: Future[PageT] = executor.submit(fetch_page, page_size, offset)
+        try:
+            while True:
+                page = pending.result()
+                results, has_next = _page_state(page)
+                if not has_next or not results:
+                    yield page
+                    return
+                offset += len(results)
+                pending = executor.submit(fetch_page, page_size, offset)
+                yield page
+        finally:
+            pending.cancel()
+
+
+def _page_state(page: ListResponse[Any] | dict[str, Any]) -> tuple[list[Any], bool]:
+    # The results of a page and whether there's another one after it.
+    if isinstance(page, dict):
+        return page["results"], bool(page["has_next"])
+    return page.results, page.has_next
@@ -0,0 +1,287 @@
+import bisect
+import math
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Literal, Self
+
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.datamodel.baremetal import BaremetalLocation
+from voltage_park_sdk.datamodel.virtual_machines import VirtualMachineLocation
+
+OfferKind = Literal["virtual_machine", "baremetal"]
+
+
+@dataclass(frozen=True, slots=True)
+class Offer:
+    """A VM preset, or a bare-metal location and network type.
+
+    Resources and `unit_price` are per VM for presets and per node for
+    bare-metal locations, and `available` counts VMs or whole nodes.
+    `gpu_model` is None for CPU-only presets.
+    """
+
+    kind: OfferKind
+    id: str
+    location_id: str
+    gpu_model: str | None
+    gpu_count: int
+    ram_gb: int
+    vcpu_count: int
+    storage_gb: int
+    network_type: str | None
+    operating_system: str | None
+    unit_price: Decimal
+    available: int
+
+
+@dataclass(frozen=True, slots=True)
+class Placement:
+    offer: Offer
+    # The number of VMs or bare-metal nodes needed to meet the requirements.
+    units: int
+    hourly_price: Decimal
+
+    @property
+    def gpu_count(self) -> int:
+        return self.offer.gpu_count * self.units
+
+
+# The arguments of PlacementIndex.find, used to memoize its results.
+type _Query = tuple[
+    str | None, int, int, int, int, str | None, str | None, OfferKind | None
+]
+# Offers are bucketed by the fields queries match exactly or by prefix: GPU
+# model, kind, network type and operating system.
+type _BucketKey = tuple[str | None, OfferKind, str | None, str | None]
+
+
+class PlacementIndex:
+    """An index of where a workload can run, and how much it would cost.
+
+    Build it once from a snapshot of the VM and bare-metal locations, then
+    query it with `find` or `cheapest` as often as needed. Prices are parsed
+    into exact `Decimal`s when the index is built, offers are bucketed by GPU
+    model, kind, network type and operating system and sorted by how many
+    GPUs they can provide, and the results of the last `max_cached_queries`
+    queries are memoized until the index is rebuilt.
+
+    CPU-only VM presets are indexed and only match queries without a GPU
+    model. Bare-metal locations without GPUs are left out, since bare-metal
+    capacity and prices are only published per GPU.
+    """
+
+    def __init__(self, offers: Iterable[Offer], max_cached_queries: int = 1024) -> None:
+        buckets: defaultdict[_BucketKey, list[Offer]] = defaultdict(list)
+        for offer in offers:
+            key = (
+                offer.gpu_model,
+                offer.kind,
+                offer.network_type,
+                offer.operating_system,
+            )
+            buckets[key].append(offer)
+        # Each bucket is kept with the GPU capacity of its offers, to bisect on.
+        self._buckets: dict[_BucketKey, tuple[list[int], list[Offer]]] = {}
+        for key, bucket in buckets.items():
+            bucket.sort(key=lambda offer: (_gpu_capacity(offer), offer.unit_price))
+            self._buckets[key] = [_gpu_capacity(offer) for offer in bucket], bucket
+        self._max_cached_queries = max_cached_queries
+        self._results: OrderedDict[_Query, tuple[Placement, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_locations(
+        cls,
+        virtual_machine_locations: Iterable[VirtualMachineLocation] = (),
+        baremetal_locations: Iterable[BaremetalLocation] = (),
+    ) -> Self:
+        offers: list[Offer] = []
+        for vm_location in virtual_machine_locations:
+            for preset in vm_location.available_presets:
+                price = Decimal(preset.compute_rate_hourly) + Decimal(
+                    preset.storage_rate_hourly
+                )
+                gpus: dict[str | None, int] = {
+                    gpu_model: gpu.count
+                    for gpu_model, gpu in preset.resources.gpus.items()
+                }
+                for gpu_model, gpu_count in (gpus or {None: 0}).items():
+                    offers.append(
+                        Offer(
+                            kind="virtual_machine",
+                            id=preset.id,
+                            location_id=vm_location.id,
+                            gpu_model=gpu_model,
+                            gpu_count=gpu_count,
+                            ram_gb=preset.resources.ram_gb,
+                            vcpu_count=preset.resources.vcpu_count,
+                            storage_gb=preset.resources.storage_gb,
+                            network_type=None,
+                            operating_system=preset.operating_system,
+                            unit_price=price,
+                            available=preset.available_vms,
+                        )
+                    )
+        for location in baremetal_locations:
+            spec = location.specs_per_node
+            if not spec.gpu_count:
+                continue
+            for network_type, gpu_count, gpu_price in (
+                ("ethernet", location.gpu_count_ethernet, location.gpu_price_ethernet),
+                (
+                    "infiniband",
+                    location.gpu_count_infiniband,
+                    location.gpu_price_infiniband,
+                ),
+            ):
+                offers.append(
+                    Offer(
+                        kind="baremetal",
+                        id=location.id,
+                        location_id=location.id,
+                        gpu_model=spec.gpu_model,
+                        gpu_count=spec.gpu_count,
+                        ram_gb=spec.ram_gb,
+                        vcpu_count=spec.cpu_count,
+                        storage_gb=spec.storage_gb,
+                        network_type=network_type,
+                        operating_system=None,
+                        unit_price=Decimal(gpu_price) * spec.gpu_count,
+                        available=gpu_count // spec.gpu_count,
+                    )
+                )
+        return cls(offers)
+
+    @classmethod
+    def from_client(cls, client: VoltageParkClient) -> Self:
+        return cls.from_locations(
+            client.get_virtual_machine_locations().results,
+            client.get_baremetal_locations().results,
+        )
+
+    def find(  # noqa: PLR0913
+        self,
+        *,
+        gpu_model: str | None = None,
+        gpu_count: int = 0,
+        ram_gb: int = 0,
+        vcpu_count: int = 0,
+        storage_gb: int = 0,
+        network_type: str | None = None,
+        operating_system: str | None = None,
+        kind: OfferKind | None = None,
+    ) -> tuple[Placement, ...]:
+        # Returns every placement with at least the requested resources, from
+        # cheapest to most expensive. gpu_model may be a prefix, such as
+        # "h100". A VM placement is a single VM, while a bare-metal placement
+        # is as many whole nodes as the requirements need.
+        query: _Query = (
+            gpu_model,
+            gpu_count,
+            ram_gb,
+            vcpu_count,
+            storage_gb,
+            network_type,
+            operating_system,
+            kind,
+        )
+        with self._lock:
+            if query in self._results:
+                self._results.move_to_end(query)
+                return self._results[query]
+        placements = tuple(
+            sorted(self._search(*query), key=lambda placement: placement.hourly_price)
+        )
+        with self._lock:
+            self._results[query] = placements
+            while len(self._results) > self._max_cached_queries:
+                self._results.popitem(last=False)
+        return placements
+
+    def cheapest(  # noqa: PLR0913
+        self,
+        *,
+        gpu_model: str | None = None,
+        gpu_count: int = 0,
+        ram_gb: int = 0,
+        vcpu_count: int = 0,
+        storage_gb: int = 0,
+        network_type: str | None = None,
+        operating_system: str | None = None,
+        kind: OfferKind | None = None,
+    ) -> Placement | None:
+        placements = self.find(
+            gpu_model=gpu_model,
+            gpu_count=gpu_count,
+            ram_gb=ram_gb,
+            vcpu_count=vcpu_count,
+            storage_gb=storage_gb,
+            network_type=network_type,
+            operating_system=operating_system,
+            kind=kind,
+        )
+        return placements[0] if placements else None
+
+    ###################
+    # Private helpers #
+    ###################
+
+    def _search(  # noqa: PLR0913
+        self,
+        gpu_model: str | None,
+        gpu_count: int,
+        ram_gb: int,
+        vcpu_count: int,
+        storage_gb: int,
+        network_type: str | None,
+        operating_system: str | None,
+        kind: OfferKind | None,
+    ) -> Iterable[Placement]:
+        for (model, offer_kind, offer_network, offer_os), (
+            capacities,
+            bucket,
+        ) in self._buckets.items():
+            if (
+                (gpu_model is not None and not (model or "").startswith(gpu_model))
+                or (kind is not None and offer_kind != kind)
+                or (network_type is not None and offer_network != network_type)
+                or (operating_system is not None and offer_os != operating_system)
+            ):
+                continue
+            # Skip the offers that can't provide enough GPUs.
+            for offer in bucket[bisect.bisect_left(capacities, gpu_count) :]:
+                units = _units_needed(offer, gpu_count, ram_gb, vcpu_count, storage_gb)
+                if units is not None:
+                    yield Placement(offer, units, offer.unit_price * units)
+
+
+def _gpu_capacity(offer: Offer) -> int:
+    # The most GPUs a single placement on the offer can have.
+    if offer.kind == "virtual_machine":
+        return offer.gpu_count
+    return offer.gpu_count * offer.available
+
+
+def _units_needed(
+    offer: Offer, gpu_count: int, ram_gb: int, vcpu_count: int, storage_gb: int
+) -> int | None:
+    # VMs can't be combined, so a preset either fits in one VM or not at all.
+    # Bare-metal nodes add up, up to the number of nodes available.
+    units = 1
+    for requested, per_unit in (
+        (gpu_count, offer.gpu_count),
+        (ram_gb, offer.ram_gb),
+        (vcpu_count, offer.vcpu_count),
+        (storage_gb, offer.storage_gb),
+    ):
+        if not requested:
+            continue
+        if not per_unit:
+            return None
+        units = max(units, math.ceil(requested / per_unit))
+    if units > offer.available or (offer.kind == "virtual_machine" and units > 1):
+        return None
+    return units
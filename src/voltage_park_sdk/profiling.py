@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from voltage_park_sdk.metrics import endpoint_template
+
+# The phases of a client call, in the order they happen. serialize is
+# dumping the payload model and encoding the request body, queue is waiting
+# for the rate limiter, connect
+# includes the TLS handshake, ttfb is the wait for the response headers
+# after connecting, download is reading the body and backoff is sleeping
+# between retries. decode and validate are json.loads and the pydantic
+# validation of the decoded body.
+PHASES = (
+    "serialize",
+    "queue",
+    "connect",
+    "ttfb",
+    "download",
+    "backoff",
+    "decode",
+    "validate",
+)
+
+DEFAULT_MAX_RECORDS = 10_000
+
+_CURRENT: ContextVar["CallProfile | None"] = ContextVar("_CURRENT", default=None)
+
+
+@dataclass(slots=True)
+class CallProfile:
+    # Phases that happen once per attempt add up over retries. Time that no
+    # phase accounts for, such as a failed connection attempt, is only part
+    # of total.
+    method: str
+    endpoint: str
+    phases: dict[str, float] = field(default_factory=dict)
+    status: int | str | None = None
+    attempts: int = 0
+    cached: bool = False
+    total: float = 0.0
+    _connect_before: float = 0.0
+
+    def add(self, phase: str, duration: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    def start_attempt(self) -> float:
+        self.attempts += 1
+        self._connect_before = self.phases.get("connect", 0.0)
+        return time.perf_counter()
+
+    def headers_received(self, start: float, status: int) -> None:
+        # The connection, if one was opened, is timed separately.
+        connect = self.phases.get("connect", 0.0) - self._connect_before
+        self.status = status
+        self.add("ttfb", time.perf_counter() - start - connect)
+
+    @property
+    def other(self) -> float:
+        return max(self.total - sum(self.phases.values()), 0.0)
+
+
+@dataclass(frozen=True)
+class ProfileSummary:
+    method: str
+    endpoint: str
+    calls: int
+    # Summed over every call.
+    total: float
+    phases: dict[str, float]
+
+    @property
+    def other(self) -> float:
+        return max(self.total - sum(self.phases.values()), 0.0)
+
+    def share(self, phase: str) -> float:
+        # The fraction of the total time spent in phase.
+        duration = self.other if phase == "other" else self.phases.get(phase, 0.0)
+        return duration / self.total if self.total else 0.0
+
+
+class Profiler:
+    """Records where the time of each client call goes.
+
+    Pass one to a client with `profiler=` to record a `CallProfile` per call,
+    splitting its time into the `PHASES`. While profiling, bodies are decoded
+    with `json.loads` and then validated, rather than in a single
+    `validate_json` pass, so that both steps can be timed. Read the raw
+    records from `records`, aggregate them per endpoint with `summary`, or
+    print `report()`.
+    """
+
+    def __init__(self, max_records: int = DEFAULT_MAX_RECORDS) -> None:
+        self._records: deque[CallProfile] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    @property
+    def records(self) -> list[CallProfile]:
+        with self._lock:
+            return list(self._records)
+
+    @contextmanager
+    def record(self, method: str, endpoint: str) -> Iterator[CallProfile]:
+        profile = CallProfile(method.upper(), endpoint_template(endpoint))
+        token = _CURRENT.set(profile)
+        start = time.perf_counter()
+        try:
+            yield profile
+        finally:
+            profile.total = time.perf_counter() - start
+            _CURRENT.reset(token)
+            with self._lock:
+                self._records.append(profile)
+
+    def summary(self) -> list[ProfileSummary]:
+        # One summary per method and endpoint template, slowest first.
+        totals: dict[tuple[str, str], tuple[int, float, dict[str, float]]] = {}
+        for record in self.records:
+            key = record.method, record.endpoint
+            calls, total, phases = totals.get(key, (0, 0.0, {}))
+            for phase, duration in record.phases.items():
+                phases[phase] = phases.get(phase, 0.0) + duration
+            totals[key] = calls + 1, total + record.total, phases
+        summaries = [
+            ProfileSummary(method, endpoint, calls, total, phases)
+            for (method, endpoint), (calls, total, phases) in totals.items()
+        ]
+        return sorted(summaries, key=lambda summary: -summary.total)
+
+    def report(self) -> str:
+        """Return a table of the mean time per call and phase, in ms."""
+        columns = [*PHASES, "other"]
+        lines = [
+            f"{'ENDPOINT':<40} {'CALLS':>6} {'TOTAL':>9}"
+            + "".join(f" {column.upper():>9}" for column in columns)
+        ]
+        for summary in self.summary():
+            means = [
+                (summary.other if column == "other" else summary.phases.get(column, 0))
+                * 1000
+                / summary.calls
+                for column in columns
+            ]
+            lines.append(
+                f"{summary.method + ' ' + summary.endpoint:<40} {summary.calls:>6} "
+                f"{summary.total * 1000 / summary.calls:>9.2f}"
+                + "".join(f" {mean:>9.2f}" for mean in means)
+            )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+def current_profile() -> CallProfile | None:
+    # The profile of the call running in this thread or task, if any.
+    return _CURRENT.get()
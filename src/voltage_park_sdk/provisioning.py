@@ -0,0 +1,218 @@
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any
+
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.pagination import DEFAULT_MAX_CONCURRENCY
+
+# Each spec is the keyword arguments of one post_baremetal_rental or
+# post_virtual_machine call.
+type ProvisionSpec = Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class CapacityShortfall:
+    resource: str
+    requested: int
+    available: int
+
+
+class InsufficientCapacityError(RuntimeError):
+    """Raised when there is not enough capacity for a provisioning batch."""
+
+    def __init__(self, shortfalls: list[CapacityShortfall]) -> None:
+        details = ", ".join(
+            f"{s.resource}: requested {s.requested}, available {s.available}"
+            for s in shortfalls
+        )
+        super().__init__(f"Insufficient capacity ({details})")
+        self.shortfalls = shortfalls
+
+
+@dataclass(frozen=True)
+class ProvisionResult:
+    # index is the position of spec in the batch.
+    index: int
+    spec: ProvisionSpec
+    id: str | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+##################
+# Public helpers #
+##################
+
+
+def check_baremetal_capacity(
+    client: VoltageParkClient, specs: Iterable[ProvisionSpec]
+) -> list[CapacityShortfall]:
+    return _Capacity.for_baremetal(client).shortfalls(specs)
+
+
+def check_virtual_machine_capacity(
+    client: VoltageParkClient, specs: Iterable[ProvisionSpec]
+) -> list[CapacityShortfall]:
+    return _Capacity.for_virtual_machines(client).shortfalls(specs)
+
+
+def provision_baremetal_rentals(
+    client: VoltageParkClient,
+    specs: Iterable[ProvisionSpec],
+    *,
+    max_workers: int = DEFAULT_MAX_CONCURRENCY,
+    allow_partial: bool = False,
+) -> Iterator[ProvisionResult]:
+    """Create many bare-metal rentals concurrently.
+
+    The GPUs requested per location and network type are checked against
+    `get_baremetal_locations` before anything is submitted. If they don't
+    fit, `InsufficientCapacityError` is raised, or with `allow_partial` the
+    specs that fit are submitted and the others fail with that error. The
+    creates are submitted before this returns, whether or not the returned
+    iterator is consumed, and it yields a result per spec as soon as it is
+    known.
+    """
+    return _provision(
+        _Capacity.for_baremetal(client),
+        specs,
+        lambda spec: client.post_baremetal_rental(**spec).rental_id,
+        max_workers=max_workers,
+        allow_partial=allow_partial,
+    )
+
+
+def provision_virtual_machines(
+    client: VoltageParkClient,
+    specs: Iterable[ProvisionSpec],
+    *,
+    max_workers: int = DEFAULT_MAX_CONCURRENCY,
+    allow_partial: bool = False,
+) -> Iterator[ProvisionResult]:
+    # Same as provision_baremetal_rentals, checking the available_vms of
+    # each preset from get_virtual_machine_locations.
+    return _provision(
+        _Capacity.for_virtual_machines(client),
+        specs,
+        lambda spec: client.post_virtual_machine(**spec).vm_id,
+        max_workers=max_workers,
+        allow_partial=allow_partial,
+    )
+
+
+###################
+# Private helpers #
+###################
+
+
+class _Capacity:
+    # How much each capacity pool has available, and what each spec needs
+    # from which pool.
+    def __init__(
+        self,
+        available: Mapping[str, int],
+        demand: Callable[[ProvisionSpec], tuple[str, int]],
+    ) -> None:
+        self.available = available
+        self.demand = demand
+
+    @classmethod
+    def for_baremetal(cls, client: VoltageParkClient) -> "_Capacity":
+        available: dict[str, int] = {}
+        for location in client.get_baremetal_locations().results:
+            available[f"{location.id} (ethernet)"] = location.gpu_count_ethernet
+            available[f"{location.id} (infiniband)"] = location.gpu_count_infiniband
+        return cls(
+            available,
+            lambda spec: (
+                f"{spec['location_id']} ({spec['network_type']})",
+                spec["gpu_count"],
+            ),
+        )
+
+    @classmethod
+    def for_virtual_machines(cls, client: VoltageParkClient) -> "_Capacity":
+        available: Counter[str] = Counter()
+        for location in client.get_virtual_machine_locations().results:
+            for preset in location.available_presets:
+                available[preset.id] += preset.available_vms
+        return cls(available, lambda spec: (spec["config_id"], 1))
+
+    def shortfalls(self, specs: Iterable[ProvisionSpec]) -> list[CapacityShortfall]:
+        requested: Counter[str] = Counter()
+        for spec in specs:
+            pool, amount = self.demand(spec)
+            requested[pool] += amount
+        return [
+            CapacityShortfall(pool, amount, self.available.get(pool, 0))
+            for pool, amount in requested.items()
+            if amount > self.available.get(pool, 0)
+        ]
+
+    def split(self, specs: list[ProvisionSpec]) -> tuple[list[int], list[int]]:
+        # Returns the indexes of the specs that fit, in order, and the rest.
+        remaining = Counter(self.available)
+        fits: list[int] = []
+        rest: list[int] = []
+        for index, spec in enumerate(specs):
+            pool, amount = self.demand(spec)
+            if amount <= remaining[pool]:
+                remaining[pool] -= amount
+                fits.append(index)
+            else:
+                rest.append(index)
+        return fits, rest
+
+
+def _provision(
+    capacity: _Capacity,
+    specs: Iterable[ProvisionSpec],
+    create: Callable[[ProvisionSpec], str],
+    *,
+    max_workers: int,
+    allow_partial: bool,
+) -> Iterator[ProvisionResult]:
+    # Checks capacity and submits the creates eagerly, so that the error is
+    # raised by the provision_* call rather than on the first iteration, and
+    # the creates run while the caller gets on with something else.
+    specs = list(specs)
+    fits, rest = capacity.split(specs)
+    if not rest:
+        return _submit(specs, fits, create, max_workers)
+    error = InsufficientCapacityError(capacity.shortfalls(specs))
+    if not allow_partial:
+        raise error
+    rejected = [ProvisionResult(i, specs[i], error=error) for i in rest]
+    return chain(rejected, _submit(specs, fits, create, max_workers))
+
+
+def _submit(
+    specs: list[ProvisionSpec],
+    indexes: list[int],
+    create: Callable[[ProvisionSpec], str],
+    max_workers: int,
+) -> Iterator[ProvisionResult]:
+    if not indexes:
+        return iter(())
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(create, specs[i]): i for i in indexes}
+    # The workers exit once every submitted create is done.
+    executor.shutdown(wait=False)
+    return _results(specs, futures)
+
+
+def _results(
+    specs: list[ProvisionSpec], futures: dict[Future[str], int]
+) -> Iterator[ProvisionResult]:
+    for future in as_completed(futures):
+        index = futures[future]
+        try:
+            yield ProvisionResult(index, specs[index], id=future.result())
+        except Exception as e:  # noqa: BLE001
+            yield ProvisionResult(index, specs[index], error=e)
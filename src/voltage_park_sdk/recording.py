@@ -0,0 +1,303 @@
+import gzip
+import io
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from voltage_park_sdk.base import API_URL
+from voltage_park_sdk.retry import current_attempt
+
+if TYPE_CHECKING:
+    from voltage_park_sdk.client import VoltageParkClient
+
+# Response headers that affect how the client handles a response. Others,
+# such as Date or Set-Cookie, would only make cassettes bigger.
+RECORDED_HEADERS = frozenset(
+    {"content-type", "retry-after", "etag", "last-modified", "cache-control"}
+)
+_REPLAYED_METHODS = frozenset({"get", "post", "put", "patch", "delete"})
+
+
+@dataclass(frozen=True, slots=True)
+class Interaction:
+    method: str
+    # The path and query of the URL, without the scheme and host.
+    path: str
+    body: str | None
+    status: int
+    headers: dict[str, str]
+    content: str
+    # When the request was sent, in seconds since recording started, and how
+    # long it took until the whole response body was read.
+    start: float
+    duration: float
+    # 0 for the first request of a client call, and counting up with each
+    # retry of it.
+    attempt: int = 0
+
+
+class UnrecordedRequestError(LookupError):
+    """Raised when a replayed request isn't in the cassette."""
+
+    def __init__(self, request: requests.PreparedRequest) -> None:
+        super().__init__(f"No recorded response for {request.method} {request.url}")
+        self.request = request
+
+
+class Cassette:
+    """Recorded request and response pairs, with their timing.
+
+    Cassettes are saved as gzipped JSON lines, one interaction per line. The
+    request headers, including the API token, are never recorded, but the
+    request and response bodies are, so treat cassettes of production traffic
+    as sensitive.
+    """
+
+    def __init__(self, interactions: Iterable[Interaction] = ()) -> None:
+        self._interactions = list(interactions)
+        self._lock = threading.Lock()
+
+    @property
+    def interactions(self) -> list[Interaction]:
+        with self._lock:
+            return list(self._interactions)
+
+    def add(self, interaction: Interaction) -> None:
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Cassette":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls(Interaction(**json.loads(line)) for line in f)
+
+    def save(self, path: str | Path) -> None:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(asdict(interaction), separators=(",", ":")) + "\n")
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends requests through another adapter and records them in a cassette.
+
+    Pass one to `VoltageParkClient` with `transport=`, then `save` its
+    `cassette`. Responses are read in full before they're recorded, so
+    streamed listings are buffered while recording. Requests that fail
+    without a response aren't recorded, and retries by the client are
+    recorded with their `attempt`.
+    """
+
+    def __init__(
+        self, cassette: Cassette | None = None, adapter: BaseAdapter | None = None
+    ) -> None:
+        super().__init__()
+        self.cassette = cassette if cassette is not None else Cassette()
+        self._adapter = adapter if adapter is not None else HTTPAdapter()
+        self._started = time.perf_counter()
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        start = time.perf_counter()
+        attempt = current_attempt()
+        response = self._adapter.send(request, **kwargs)
+        content = response.content
+        self.cassette.add(
+            Interaction(
+                method=request.method or "GET",
+                path=request.path_url,
+                body=_text(request.body),
+                status=response.status_code,
+                headers={
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() in RECORDED_HEADERS
+                },
+                content=content.decode("utf-8", "surrogateescape"),
+                start=start - self._started,
+                duration=time.perf_counter() - start,
+                attempt=attempt,
+            )
+        )
+        return response
+
+    def close(self) -> None:
+        self._adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests with the responses recorded in a cassette.
+
+    Requests are matched on their method, path and body, falling back to
+    the method and path alone, and identical requests get their recorded
+    responses in order, starting over once they're used up. Each response
+    takes its recorded duration divided by `speed`, or comes back at once if
+    `speed` is None.
+    """
+
+    def __init__(self, cassette: Cassette, speed: float | None = 1.0) -> None:
+        if speed is not None and speed <= 0:
+            msg = f"speed must be positive or None, got {speed}"
+            raise ValueError(msg)
+        super().__init__()
+        self._speed = speed
+        self._exact: dict[tuple[str, str, str | None], list[Interaction]] = {}
+        self._loose: dict[tuple[str, str], list[Interaction]] = {}
+        for interaction in cassette.interactions:
+            key = interaction.method, interaction.path
+            self._exact.setdefault((*key, interaction.body), []).append(interaction)
+            self._loose.setdefault(key, []).append(interaction)
+        self._replayed: defaultdict[tuple[Any, ...], int] = defaultdict(int)
+        self._lock = threading.Lock()
+        # Only used to turn recorded responses into requests responses.
+        self._builder = HTTPAdapter()
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **_kwargs: Any
+    ) -> requests.Response:
+        interaction = self._match(request)
+        if self._speed is not None:
+            time.sleep(interaction.duration / self._speed)
+        raw = HTTPResponse(
+            body=io.BytesIO(interaction.content.encode("utf-8", "surrogateescape")),
+            headers=interaction.headers,
+            status=interaction.status,
+            reason=_reason(interaction.status),
+            preload_content=False,
+        )
+        return self._builder.build_response(request, raw)
+
+    def close(self) -> None:
+        # The builder never opens a connection, so there's nothing to close.
+        pass
+
+    def _match(self, request: requests.PreparedRequest) -> Interaction:
+        method, path = request.method or "GET", request.path_url
+        exact = method, path, _text(request.body)
+        for key, candidates in (
+            (exact, self._exact.get(exact)),
+            ((method, path), self._loose.get((method, path))),
+        ):
+            if candidates:
+                with self._lock:
+                    index = self._replayed[key]
+                    self._replayed[key] += 1
+                return candidates[index % len(candidates)]
+        raise UnrecordedRequestError(request)
+
+
+@dataclass(frozen=True)
+class ReplayStats:
+    # The latency of each replayed request, in the order they were recorded.
+    latencies: list[float]
+    # Requests that failed, whether with an error status, an undecodable
+    # body or no response at all.
+    errors: int
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def replay_traffic(
+    client: "VoltageParkClient",
+    cassette: Cassette,
+    *,
+    speed: float | None = 1.0,
+    max_workers: int = 10,
+    api_url: str = API_URL,
+) -> ReplayStats:
+    """Send the requests recorded in `cassette` again through `client`.
+
+    Requests are sent at their recorded offsets divided by `speed`, or back
+    to back if `speed` is None, on up to `max_workers` threads so that
+    overlapping requests overlap again. Recorded retries are skipped, as the
+    client retries the calls itself, so each client call is replayed once.
+    Use a client with a `ReplayAdapter` to replay production traffic offline
+    and compare SDK versions.
+    """
+    # concurrent.futures is slow to import, as in the client.
+    from concurrent.futures import ThreadPoolExecutor
+
+    api_path = urlsplit(api_url).path
+    interactions = sorted(
+        (
+            i
+            for i in cassette.interactions
+            if i.method.lower() in _REPLAYED_METHODS and i.attempt == 0
+        ),
+        key=lambda i: i.start,
+    )
+    latencies = [0.0] * len(interactions)
+    errors = 0
+    errors_lock = threading.Lock()
+
+    def send(index: int, interaction: Interaction) -> None:
+        nonlocal errors
+        method = getattr(client, interaction.method.lower())
+        endpoint = interaction.path.removeprefix(api_path)
+        start = time.perf_counter()
+        try:
+            if interaction.method == "DELETE":
+                method(endpoint)
+            else:
+                method(endpoint, **_params(interaction.body))
+        except Exception:  # noqa: BLE001
+            with errors_lock:
+                errors += 1
+        finally:
+            latencies[index] = time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for index, interaction in enumerate(interactions):
+            if speed is not None:
+                wait = interaction.start / speed - (time.perf_counter() - started)
+                if wait > 0:
+                    time.sleep(wait)
+            futures.append(executor.submit(send, index, interaction))
+    # send counts request failures itself, so this only re-raises bugs.
+    for future in futures:
+        future.result()
+    return ReplayStats(latencies, errors, time.perf_counter() - started)
+
+
+def _text(body: bytes | str | None) -> str | None:
+    if isinstance(body, bytes):
+        return body.decode("utf-8", "surrogateescape")
+    return body
+
+
+def _params(body: str | None) -> dict[str, Any]:
+    params = json.loads(body) if body else {}
+    return params if isinstance(params, dict) else {}
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
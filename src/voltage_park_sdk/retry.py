@@ -0,0 +1,176 @@
+import math
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import ClassVar
+
+IDEMPOTENT_OPERATIONS = frozenset({"get", "put", "delete"})
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_ATTEMPT: ContextVar[int] = ContextVar("_ATTEMPT", default=0)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Only idempotent operations are retried by default, except after a 429,
+    which is retried for every operation. Waits use exponential
+    backoff with full jitter so that many clients retrying at once spread
+    out, and a `Retry-After` header from the server takes precedence. No
+    wait is longer than `max_backoff`, whatever the server asks for.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    status_codes: frozenset[int] = RETRYABLE_STATUS_CODES
+    operations: frozenset[str] = IDEMPOTENT_OPERATIONS
+    respect_retry_after: bool = True
+
+    def should_retry(
+        self,
+        operation: str,
+        attempt: int,
+        status_code: int | None = None,
+    ) -> bool:
+        # A status code of None means the request failed before we got a
+        # response, e.g. a connection error or timeout.
+        if attempt >= self.max_retries:
+            return False
+        # A 429 means the server rejected the request without processing it,
+        # so it's safe to retry even if the operation isn't idempotent.
+        if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            return status_code in self.status_codes
+        if operation not in self.operations:
+            return False
+        return status_code is None or status_code in self.status_codes
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        if self.respect_retry_after and retry_after is not None:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                # Add a little jitter so clients told to wait the same amount
+                # of time don't all come back at once.
+                jitter = random.uniform(0, self.backoff_factor)  # noqa: S311
+                return min(seconds + jitter, self.max_backoff)
+        ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, ceiling)  # noqa: S311
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+def parse_retry_after(value: str) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date. Values
+    # that aren't finite, such as "inf" or "nan", are ignored.
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class RateLimiter:
+    """A thread-safe token bucket shared by every request made through it.
+
+    `rate` tokens are added per second up to `burst`, and each request
+    (including retries) takes one token. Use `for_token` to share a single
+    request budget between every client using the same API token. Every
+    caller must then ask for the same rate and burst.
+    """
+
+    _shared: ClassVar[dict[str, "RateLimiter"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0 or burst <= 0:
+            msg = f"rate and burst must be positive, got {rate=} and {burst=}"
+            raise ValueError(msg)
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_token(cls, token: str, rate: float, burst: int = 1) -> "RateLimiter":
+        with cls._shared_lock:
+            if token not in cls._shared:
+                cls._shared[token] = cls(rate, burst)
+            limiter = cls._shared[token]
+        if (limiter.rate, limiter.burst) != (rate, burst):
+            msg = (
+                f"The rate limiter of this token has rate={limiter.rate} and "
+                f"burst={limiter.burst}, not {rate=} and {burst=}"
+            )
+            raise ValueError(msg)
+        return limiter
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        # asyncio is slow to import and only needed by async clients.
+        import asyncio
+
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _reserve(self) -> float:
+        # Take a token now, letting the bucket go into debt, and return how
+        # long the caller has to wait for that token to have been refilled.
+        # Reserving under the lock and sleeping outside it keeps callers
+        # queued in order without holding the lock while they wait.
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+
+@contextmanager
+def attempting(attempt: int) -> Iterator[None]:
+    # Marks the request sent inside as the given attempt at its call, so that
+    # transports such as RecordingAdapter can tell retries apart.
+    token = _ATTEMPT.set(attempt)
+    try:
+        yield
+    finally:
+        _ATTEMPT.reset(token)
+
+
+def current_attempt() -> int:
+    # Which attempt at its call the request being sent in this thread or task
+    # is, counting from 0.
+    return _ATTEMPT.get()
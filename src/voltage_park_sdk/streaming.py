@@ -0,0 +1,199 @@
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from enum import Enum, auto
+from typing import Any
+
+from pydantic import TypeAdapter
+
+STREAM_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+# Drop consumed text from the buffer once this much of it has piled up.
+_COMPACT_THRESHOLD = 1 << 16
+
+
+class _State(Enum):
+    START = auto()
+    KEY = auto()
+    COLON = auto()
+    VALUE = auto()
+    LIST = auto()
+    DONE = auto()
+
+
+class ListStreamParser:
+    """Incrementally parse a JSON object containing one large list.
+
+    Feed it chunks of the response body as they arrive. Each element of the
+    `list_key` list is returned as soon as it is complete, and every other
+    top-level field is recorded in `envelope`. Only the element currently
+    being parsed is buffered, so memory stays bounded however long the list
+    is.
+    """
+
+    def __init__(self, list_key: str) -> None:
+        self.list_key = list_key
+        self.envelope: dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._state = _State.START
+        self._key = ""
+
+    def feed(self, chunk: bytes, *, final: bool = False) -> list[Any]:
+        self._buffer += self._utf8.decode(chunk, final=final)
+        items = self._parse(final=final)
+        if self._position > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._position :]
+            self._position = 0
+        if final and self._state is not _State.DONE:
+            msg = "Response body ended before the JSON document was complete"
+            raise json.JSONDecodeError(msg, self._buffer, self._position)
+        return items
+
+    def _parse(self, *, final: bool) -> list[Any]:  # noqa: C901, PLR0912
+        items: list[Any] = []
+        while True:
+            self._skip_whitespace()
+            if self._position >= len(self._buffer):
+                return items
+            char = self._buffer[self._position]
+            if self._state is _State.START:
+                self._expect(char, "{")
+                self._state = _State.KEY
+            elif self._state is _State.KEY:
+                if char == ",":
+                    self._position += 1
+                elif char == "}":
+                    self._position += 1
+                    self._state = _State.DONE
+                else:
+                    key = self._decode(final=final)
+                    if key is None:
+                        return items
+                    self._key = key
+                    self._state = _State.COLON
+            elif self._state is _State.COLON:
+                self._expect(char, ":")
+                self._state = _State.VALUE
+            elif self._state is _State.VALUE:
+                if self._key == self.list_key and char == "[":
+                    self._position += 1
+                    self._state = _State.LIST
+                else:
+                    value = self._decode(final=final)
+                    if value is None:
+                        return items
+                    self.envelope[self._key] = value
+                    self._state = _State.KEY
+            elif self._state is _State.LIST:
+                if char == ",":
+                    self._position += 1
+                elif char == "]":
+                    self._position += 1
+                    self._state = _State.KEY
+                else:
+                    item = self._decode(final=final)
+                    if item is None:
+                        return items
+                    items.append(item)
+            else:
+                msg = "Unexpected data after the end of the JSON document"
+                raise json.JSONDecodeError(msg, self._buffer, self._position)
+
+    def _skip_whitespace(self) -> None:
+        while (
+            self._position < len(self._buffer)
+            and self._buffer[self._position] in _WHITESPACE
+        ):
+            self._position += 1
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char != expected:
+            msg = f"Expected {expected!r}"
+            raise json.JSONDecodeError(msg, self._buffer, self._position)
+        self._position += 1
+
+    def _decode(self, *, final: bool) -> Any | None:
+        # Returns None if the value isn't complete yet, so JSON nulls are
+        # returned as _NULL instead.
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # A number at the very end of the buffer may continue in the next
+        # chunk, so wait for a delimiter before accepting it.
+        if end == len(self._buffer) and not final:
+            return None
+        self._position = end
+        return _NULL if value is None else value
+
+
+class _Null:
+    pass
+
+
+_NULL: Any = _Null()
+
+
+def _unwrap(value: Any) -> Any:
+    return None if value is _NULL else value
+
+
+class StreamedList[ItemT]:
+    """Validated list items, parsed from a response body as it downloads.
+
+    Iterate over it to get the items. Fields outside the list, like
+    `total_result_count`, appear in `envelope` as soon as they are parsed.
+    A StreamedList can only be iterated once.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        list_key: str,
+        item_adapter: TypeAdapter[ItemT],
+    ) -> None:
+        self._chunks = chunks
+        self._parser = ListStreamParser(list_key)
+        self._item_adapter = item_adapter
+
+    @property
+    def envelope(self) -> dict[str, Any]:
+        return {k: _unwrap(v) for k, v in self._parser.envelope.items()}
+
+    def __iter__(self) -> Iterator[ItemT]:
+        for chunk in self._chunks:
+            for item in self._parser.feed(chunk):
+                yield self._item_adapter.validate_python(item)
+        for item in self._parser.feed(b"", final=True):
+            yield self._item_adapter.validate_python(item)
+
+
+class AsyncStreamedList[ItemT]:
+    """Async counterpart of `StreamedList`."""
+
+    def __init__(
+        self,
+        chunks: AsyncIterable[bytes],
+        list_key: str,
+        item_adapter: TypeAdapter[ItemT],
+    ) -> None:
+        self._chunks = chunks
+        self._parser = ListStreamParser(list_key)
+        self._item_adapter = item_adapter
+
+    @property
+    def envelope(self) -> dict[str, Any]:
+        return {k: _unwrap(v) for k, v in self._parser.envelope.items()}
+
+    async def __aiter__(self) -> AsyncIterator[ItemT]:
+        async for chunk in self._chunks:
+            for item in self._parser.feed(chunk):
+                yield self._item_adapter.validate_python(item)
+        for item in self._parser.feed(b"", final=True):
+            yield self._item_adapter.validate_python(item)
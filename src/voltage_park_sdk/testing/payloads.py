@@ -0,0 +1,329 @@
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any, get_args
+
+from voltage_park_sdk.datamodel.shared import GPUModelOptions
+from voltage_park_sdk.datamodel.virtual_machines import (
+    VirtualMachineOperatingSystemOptions,
+    VirtualMachineStatusOptions,
+    VirtualMachineTypeOptions,
+)
+
+# Synthetic API responses and request payloads, shaped like the real ones and
+# as large as needed, for benchmarks and tests. The same seed always gives the
+# same payloads.
+
+BAREMETAL_RENTAL_STATUSES = ("Running", "Terminated", "Pending", "Failed")
+BILLING_DETAILS_TYPES = (
+    "stripe_deposit",
+    "storage_payout",
+    "storage_charge",
+    "other",
+    "payout",
+    "charge",
+    "baremetal_payout",
+    "baremetal_charge",
+)
+
+_EPOCH = datetime(2025, 1, 1, tzinfo=UTC)
+_GPU_MODELS: tuple[str, ...] = get_args(GPUModelOptions)
+_OPERATING_SYSTEMS: tuple[str, ...] = get_args(VirtualMachineOperatingSystemOptions)
+_VM_STATUSES: tuple[str, ...] = get_args(VirtualMachineStatusOptions)
+_VM_TYPES: tuple[str, ...] = get_args(VirtualMachineTypeOptions)
+_TAGS = ("training", "inference", "research", "prod", "staging", "team-a", "team-b")
+
+
+##################
+# List responses #
+##################
+
+
+def virtual_machines(count: int, seed: int = 0) -> dict[str, Any]:
+    # The body of GET virtual-machines/ listing `count` VMs.
+    rng = _rng(seed)
+    return _list_response([_virtual_machine(rng) for _ in range(count)])
+
+
+def baremetal_rentals(count: int, seed: int = 0) -> dict[str, Any]:
+    # Cycles through every rental status, so that each variant of the
+    # BaremetalRental union is validated.
+    rng = _rng(seed)
+    return _list_response(
+        [_baremetal_rental(rng, BAREMETAL_RENTAL_STATUSES[i % 4]) for i in range(count)]
+    )
+
+
+def billing_transactions(count: int, seed: int = 0) -> dict[str, Any]:
+    # Cycles through every type of billing details.
+    rng = _rng(seed)
+    return _list_response(_billing_transactions(rng, count))
+
+
+def monthly_billing_report(count: int, seed: int = 0) -> dict[str, Any]:
+    rng = _rng(seed)
+    transactions = _billing_transactions(rng, count)
+    start = _amount(rng, 1_000, 100_000)
+    delta = sum(float(t["period_amount"]) for t in transactions)
+    return {
+        "transactions": transactions,
+        "balance_at_period_start": start,
+        "balance_at_period_end": f"{float(start) + delta:.2f}",
+        "balance_delta_in_period": f"{delta:.2f}",
+    }
+
+
+def virtual_machine_locations(count: int, seed: int = 0) -> dict[str, Any]:
+    rng = _rng(seed)
+    return _list_response(
+        [
+            {
+                "id": _id(rng),
+                "available_presets": [
+                    _vm_preset(rng, gpu_count) for gpu_count in (1, 2, 4, 8)
+                ],
+            }
+            for _ in range(count)
+        ]
+    )
+
+
+def baremetal_locations(count: int, seed: int = 0) -> dict[str, Any]:
+    rng = _rng(seed)
+    return _list_response(
+        [
+            {
+                "id": _id(rng),
+                "gpu_count_ethernet": 8 * rng.randint(0, 32),
+                "gpu_price_ethernet": _amount(rng, 1.5, 2.5),
+                "gpu_count_infiniband": 8 * rng.randint(0, 32),
+                "gpu_price_infiniband": _amount(rng, 2.5, 3.5),
+                "specs_per_node": _node_spec(rng),
+            }
+            for _ in range(count)
+        ]
+    )
+
+
+###################
+# Create payloads #
+###################
+
+
+def virtual_machine_deploy_kwargs(index: int, seed: int = 0) -> dict[str, Any]:
+    # The keyword arguments of one post_virtual_machine call.
+    rng = _rng(seed, index)
+    return {
+        "config_id": _id(rng),
+        "name": f"vm-{index}",
+        "password": None,
+        "organization_ssh_keys": {
+            "mode": "selective",
+            "ssh_key_ids": [_id(rng) for _ in range(rng.randint(1, 3))],
+        },
+        "ssh_keys": [f"ssh-ed25519 {rng.randbytes(32).hex()} user@host"],
+        "cloud_init": _cloud_init(rng),
+        "tags": rng.sample(_TAGS, rng.randint(0, 3)),
+    }
+
+
+def baremetal_rental_create_kwargs(index: int, seed: int = 0) -> dict[str, Any]:
+    # The keyword arguments of one post_baremetal_rental call.
+    rng = _rng(seed, index)
+    return {
+        "location_id": _id(rng),
+        "gpu_count": 8 * rng.randint(1, 4),
+        "name": f"cluster-{index}",
+        "network_type": rng.choice(["ethernet", "infiniband"]),
+        "organization_ssh_keys": {"mode": "all"},
+        "storage_id": None,
+        "tags": rng.sample(_TAGS, rng.randint(0, 3)),
+        "cloudinit_script": _cloud_init(rng),
+    }
+
+
+###################
+# Private helpers #
+###################
+
+
+def _list_response(results: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "results": results,
+        "total_result_count": len(results),
+        "has_previous": False,
+        "has_next": False,
+    }
+
+
+def _rng(seed: int, index: int = 0) -> random.Random:
+    # Seeded per payload, so that the nth create payload doesn't depend on
+    # how many were generated before it.
+    return random.Random(seed * 1_000_003 + index)  # noqa: S311
+
+
+def _id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _timestamp(rng: random.Random) -> str:
+    # The API returns timestamps with and without fractional seconds.
+    moment = _EPOCH + timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+    if rng.getrandbits(1):
+        return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return moment.strftime("%Y-%m-%dT%H:%M:%S") + f".{rng.randint(0, 999):03d}Z"
+
+
+def _amount(rng: random.Random, low: float, high: float) -> str:
+    return f"{rng.uniform(low, high):.2f}"
+
+
+def _ip(rng: random.Random, prefix: str) -> str:
+    return f"{prefix}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+
+def _tags(rng: random.Random) -> list[str]:
+    return rng.sample(_TAGS, rng.randint(0, 3))
+
+
+def _cloud_init(rng: random.Random) -> dict[str, Any]:
+    return {
+        "packages": rng.sample(["git", "htop", "tmux", "nvtop", "jq"], 3),
+        "write_files": [
+            {
+                "path": "/etc/environment.d/90-job.conf",
+                "content": f"JOB_ID={_id(rng)}\n",
+                "permissions": "0644",
+            }
+        ],
+        "runcmd": ["nvidia-smi", "systemctl restart docker"],
+    }
+
+
+def _virtual_machine(rng: random.Random) -> dict[str, Any]:
+    gpu_count = rng.choice([1, 2, 4, 8])
+    return {
+        "id": _id(rng),
+        "hostnode_id": _id(rng),
+        "type": rng.choice(_VM_TYPES),
+        "status": rng.choice(_VM_STATUSES),
+        "name": f"vm-{rng.getrandbits(32):08x}",
+        "resources": {
+            "gpus": {rng.choice(_GPU_MODELS): {"count": gpu_count}},
+            "ram_gb": 128 * gpu_count,
+            "storage_gb": 512 * gpu_count,
+            "vcpu_count": 16 * gpu_count,
+        },
+        "operating_system": rng.choice(_OPERATING_SYSTEMS),
+        "pricing": {
+            "gpus_per_hr": _amount(rng, 1, 3 * gpu_count),
+            "vcpu_per_hr": _amount(rng, 0, 1),
+            "ram_per_hr": _amount(rng, 0, 1),
+            "storage_per_hr": _amount(rng, 0, 0.1),
+            "total_associated_per_hr": _amount(rng, 1, 4 * gpu_count),
+            "total_disassociated_per_hr": _amount(rng, 0, 0.1),
+        },
+        "public_ip": _ip(rng, "203.0"),
+        "internal_ip": _ip(rng, "10.0"),
+        "port_forwards": [
+            {"internal_port": port, "external_port": rng.randint(20000, 65535)}
+            for port in rng.sample([22, 80, 443, 6006, 8888], rng.randint(0, 3))
+        ],
+        "timestamp_creation": _timestamp(rng),
+        "tags": _tags(rng),
+    }
+
+
+def _vm_preset(rng: random.Random, gpu_count: int) -> dict[str, Any]:
+    return {
+        "id": _id(rng),
+        "resources": {
+            "gpus": {rng.choice(_GPU_MODELS): {"count": gpu_count}},
+            "ram_gb": 128 * gpu_count,
+            "storage_gb": 512 * gpu_count,
+            "vcpu_count": 16 * gpu_count,
+        },
+        "operating_system": rng.choice(_OPERATING_SYSTEMS),
+        "compute_rate_hourly": _amount(rng, 1.5 * gpu_count, 2.5 * gpu_count),
+        "storage_rate_hourly": _amount(rng, 0.01, 0.1),
+        "available_vms": rng.randint(0, 16),
+    }
+
+
+def _node_spec(rng: random.Random) -> dict[str, Any]:
+    return {
+        "gpu_model": rng.choice(["h100-sxm5-80gb", "a100-sxm4-80gb"]),
+        "gpu_count": 8,
+        "cpu_model": "Intel Xeon Platinum 8480+",
+        "cpu_count": 2,
+        "ram_gb": 2048,
+        "storage_gb": 30000,
+    }
+
+
+def _baremetal_rental(rng: random.Random, status: str) -> dict[str, Any]:
+    rental = {
+        "id": _id(rng),
+        "name": f"cluster-{rng.getrandbits(32):08x}",
+        "creation_timestamp": _timestamp(rng),
+        "rate_hourly": _amount(rng, 10, 200),
+        "suborder": None,
+        "status": status,
+    }
+    if status == "Pending":
+        return rental
+    node_count = rng.randint(1, 8)
+    return rental | {
+        "power_status": "Stopped" if status == "Terminated" else "Running",
+        "node_count": node_count,
+        "specs_per_node": _node_spec(rng),
+        "network_type": rng.choice(["ethernet", "infiniband"]),
+        "username": "ubuntu",
+        "node_networking": [
+            {"public_ip": _ip(rng, "198.51"), "private_ip": _ip(rng, "10.1")}
+            for _ in range(node_count)
+        ],
+        "sub_order": None,
+        "storage_id": rng.choice([_id(rng), None, None]),
+        "storage_pv": None,
+        "storage_pvc": None,
+        "k8s_cluster_id": None,
+        "kubeconfig": None,
+        "tags": _tags(rng),
+    }
+
+
+def _billing_transactions(rng: random.Random, count: int) -> list[dict[str, Any]]:
+    return [
+        _billing_transaction(rng, BILLING_DETAILS_TYPES[i % len(BILLING_DETAILS_TYPES)])
+        for i in range(count)
+    ]
+
+
+def _billing_transaction(rng: random.Random, details_type: str) -> dict[str, Any]:
+    details: dict[str, Any] = {"type": details_type}
+    if details_type == "other":
+        details["note_public"] = rng.choice([None, "Credit adjustment"])
+    elif details_type != "stripe_deposit":
+        linked_instance = {
+            "id": _id(rng),
+            "timestamp_creation": _timestamp(rng),
+            "timestamp_deletion": rng.choice([None, _timestamp(rng)]),
+        }
+        if details_type in ("payout", "charge"):
+            linked_instance["type"] = rng.choice(
+                ["virtual_machine_instance", "storage_block_instance"]
+            )
+            linked_instance["virtual_machine_id"] = _id(rng)
+        elif details_type.startswith("baremetal"):
+            linked_instance["baremetal_rental_id"] = _id(rng)
+        details["linked_instance"] = linked_instance
+    amount = _amount(rng, 0.01, 500)
+    return {
+        "id": _id(rng),
+        "total_amount": amount,
+        "timestamp_creation": _timestamp(rng),
+        "timestamp_completion": rng.choice([None, _timestamp(rng)]),
+        "details": details,
+        "period_amount": amount,
+    }
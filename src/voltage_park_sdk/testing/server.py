@@ -0,0 +1,879 @@
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self, cast
+from urllib.parse import urlsplit
+
+from voltage_park_sdk.base import API_URL
+from voltage_park_sdk.testing import payloads
+
+# The status, JSON body and extra headers of a response. A None body is sent
+# as an empty response.
+type FakeResponse = tuple[int, Any, dict[str, str]]
+type _Route = Callable[[re.Match[str], dict[str, Any]], FakeResponse]
+
+API_PATH = urlsplit(API_URL).path
+DEFAULT_MAX_PAGE_SIZE = 100
+
+_VM_POWER_STATUSES = {
+    "started": "Running",
+    "stopped": "Stopped",
+    "stopped_disassociated": "StoppedDisassociated",
+}
+_CENT = Decimal("0.01")
+
+
+class FakeAPIError(Exception):
+    # Raised by route handlers to answer with an error status.
+    def __init__(self, status: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class FakeVoltageParkAPI:
+    """A stateful, in-memory fake of the Voltage Park API.
+
+    It implements every endpoint `VoltageParkClient` uses, with locations,
+    capacity and prices from `testing.payloads`. Created VMs start `Running`
+    and follow power status changes, relocations and deletion to
+    `Terminated`. Bare-metal rentals stay `Pending` for `provisioning_delay`
+    seconds before `Running`. Every `billing_interval` seconds, running
+    resources are charged for the time since their last charge.
+
+    `latency` (plus up to `jitter`) seconds are added to each response,
+    `error_rate` of requests fail with a 503, requests over `rate_limit` per
+    second are throttled with a 429 and `Retry-After`, and list endpoints
+    return at most `max_page_size` items. Serve it over HTTP with `start()`
+    or as a context manager and point a client at `url`, or call `handle()`
+    directly in-process.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float | None = None,
+        max_page_size: int = DEFAULT_MAX_PAGE_SIZE,
+        provisioning_delay: float = 5.0,
+        billing_interval: float = 60.0,
+        seed: int = 0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if rate_limit is not None and rate_limit <= 0:
+            msg = f"rate_limit must be positive or None, got {rate_limit}"
+            raise ValueError(msg)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.max_page_size = max_page_size
+        self.provisioning_delay = provisioning_delay
+        self.billing_interval = billing_interval
+        self._rng = random.Random(seed)  # noqa: S311
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+        self.request_count = 0
+        self.organization: dict[str, Any] = {
+            "id": self._id(),
+            "name": "Fake Organization",
+            "billing_notification_target_emails": [],
+        }
+        self.ssh_keys: dict[str, dict[str, Any]] = {}
+        self.virtual_machine_locations: list[dict[str, Any]] = (
+            payloads.virtual_machine_locations(3, seed)["results"]
+        )
+        self.baremetal_locations: list[dict[str, Any]] = payloads.baremetal_locations(
+            3, seed
+        )["results"]
+        self.virtual_machines: dict[str, dict[str, Any]] = {}
+        self.baremetal_rentals: dict[str, dict[str, Any]] = {}
+        self.storage_volumes: dict[str, dict[str, Any]] = {}
+        self.billing_transactions: list[dict[str, Any]] = []
+        # When pending rentals and relocating VMs become Running.
+        self._ready_at: dict[str, float] = {}
+        # Until when each resource has been charged for.
+        self._billed_until: dict[str, float] = {}
+        self._last_accrual = clock()
+        self._tokens = 0.0 if rate_limit is None else max(rate_limit, 1)
+        self._last_refill = clock()
+        self._routes = self._build_routes()
+        self._deposit(Decimal(10_000))
+
+    def preload(
+        self,
+        *,
+        virtual_machines: int = 0,
+        baremetal_rentals: int = 0,
+        billing_transactions: int = 0,
+    ) -> None:
+        # Adds synthetic resources and transactions, e.g. to load-test large
+        # listings. Preloaded resources aren't charged.
+        seed = self._rng.getrandbits(32)
+        with self._lock:
+            for vm in payloads.virtual_machines(virtual_machines, seed)["results"]:
+                self.virtual_machines[vm["id"]] = vm
+            for rental in payloads.baremetal_rentals(baremetal_rentals, seed)[
+                "results"
+            ]:
+                self.baremetal_rentals[rental["id"]] = rental
+            self.billing_transactions += payloads.billing_transactions(
+                billing_transactions, seed
+            )["results"]
+
+    ###########
+    # Serving #
+    ###########
+
+    @property
+    def url(self) -> str:
+        # The api_url to pass to a client.
+        if self._server is None:
+            msg = "The fake API isn't being served, call start() first."
+            raise RuntimeError(msg)
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}{API_PATH}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> Self:
+        if self._server is None:
+            self._server = _Server((host, port), _Handler, self)
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                # So that stop() doesn't wait up to the default half second.
+                kwargs={"poll_interval": 0.05},
+                name="voltage-park-fake-api",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def handle(self, method: str, path: str, params: dict[str, Any]) -> FakeResponse:
+        # path is relative to the API root, such as "virtual-machines/", and
+        # params is the JSON body the client sends, even on GET requests. The
+        # body returned may be live state, so copy it before changing it.
+        with self._lock:
+            return self._dispatch(method, path, params)
+
+    def handle_raw(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[int, bytes, dict[str, str]]:
+        # Like handle(), with encoded bodies. The response is encoded before
+        # releasing the lock, so that concurrent requests can't change it.
+        try:
+            params = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return 400, b'{"detail": "Invalid JSON"}', {}
+        with self._lock:
+            status, response, headers = self._dispatch(method, path, params)
+            content = b"" if response is None else json.dumps(response).encode()
+        return status, content, headers
+
+    def delay(self) -> float:
+        # How long to wait before sending a response.
+        return self.latency + self._rng.uniform(0, self.jitter)
+
+    ##########
+    # Routes #
+    ##########
+
+    def _dispatch(self, method: str, path: str, params: dict[str, Any]) -> FakeResponse:
+        self.request_count += 1
+        now = self._clock()
+        if wait := self._throttle(now):
+            retry_after = {"Retry-After": f"{wait:.3f}"}
+            return 429, {"detail": "Too many requests"}, retry_after
+        if self._rng.random() < self.error_rate:
+            return 503, {"detail": "Injected failure"}, {}
+        self._advance(now)
+        for route_method, pattern, route in self._routes:
+            if route_method == method.upper() and (
+                match := pattern.fullmatch(path.split("?", 1)[0])
+            ):
+                try:
+                    return route(match, params)
+                except FakeAPIError as e:
+                    return e.status, {"detail": e.detail}, {}
+                except (KeyError, TypeError, ValueError) as e:
+                    return 422, {"detail": f"Invalid request: {e!r}"}, {}
+        return 404, {"detail": "Not found"}, {}
+
+    def _build_routes(self) -> list[tuple[str, re.Pattern[str], _Route]]:
+        routes: list[tuple[str, str, _Route]] = [
+            ("GET", r"organization", self._get_organization),
+            ("PATCH", r"organization", self._patch_organization),
+            ("GET", r"organization/ssh-keys", self._list_ssh_keys),
+            ("POST", r"organization/ssh-keys", self._post_ssh_key),
+            ("DELETE", r"organization/ssh-keys/(?P<id>[^/]+)", self._delete_ssh_key),
+            (
+                "GET",
+                r"virtual-machines/instant/locations/",
+                self._get_virtual_machine_locations,
+            ),
+            (
+                "GET",
+                r"virtual-machines/instant/locations/(?P<id>[^/]+)",
+                self._get_virtual_machine_location,
+            ),
+            ("POST", r"virtual-machines/instant", self._post_virtual_machine),
+            ("GET", r"virtual-machines/", self._list_virtual_machines),
+            ("GET", r"virtual-machines/(?P<id>[^/]+)", self._get_virtual_machine),
+            ("PATCH", r"virtual-machines/(?P<id>[^/]+)", self._patch_virtual_machine),
+            (
+                "DELETE",
+                r"virtual-machines/(?P<id>[^/]+)",
+                self._delete_virtual_machine,
+            ),
+            (
+                "PUT",
+                r"virtual-machines/(?P<id>[^/]+)/power-status",
+                self._put_vm_power_status,
+            ),
+            (
+                "POST",
+                r"virtual-machines/(?P<id>[^/]+)/relocate",
+                self._relocate_virtual_machine,
+            ),
+            ("GET", r"bare-metal/locations/", self._get_baremetal_locations),
+            ("POST", r"bare-metal/", self._post_baremetal_rental),
+            ("GET", r"bare-metal/", self._list_baremetal_rentals),
+            ("PATCH", r"bare-metal/(?P<id>[^/]+)", self._patch_baremetal_rental),
+            ("DELETE", r"bare-metal/(?P<id>[^/]+)", self._delete_baremetal_rental),
+            (
+                "PUT",
+                r"bare-metal/(?P<id>[^/]+)/power-status",
+                self._put_baremetal_power_status,
+            ),
+            ("POST", r"bare-metal/(?P<id>[^/]+)/reboot", self._reboot_nodes),
+            ("PATCH", r"bare-metal/(?P<id>[^/]+)/remove-nodes", self._remove_nodes),
+            ("GET", r"billing/hourly-rate", self._get_billing_hourly_rate),
+            ("GET", r"billing/transactions/", self._list_billing_transactions),
+            (
+                "GET",
+                r"billing/reports/(?P<year>\d+)/(?P<month>\d+)/transactions",
+                self._get_monthly_billing_report,
+            ),
+            ("POST", r"validate/cloudinit", self._validate_cloudinit),
+            ("GET", r"storage/hourly-rate", self._get_storage_hourly_rate),
+            ("GET", r"storage", self._list_storage_volumes),
+            ("POST", r"storage", self._post_storage_volume),
+            ("GET", r"storage/(?P<id>[^/]+)", self._get_storage_volume),
+            ("PATCH", r"storage/(?P<id>[^/]+)", self._patch_storage_volume),
+            ("DELETE", r"storage/(?P<id>[^/]+)", self._delete_storage_volume),
+        ]
+        return [
+            (method, re.compile(pattern), route) for method, pattern, route in routes
+        ]
+
+    # Organization
+
+    def _get_organization(
+        self, _match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, self.organization, {}
+
+    def _patch_organization(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        emails = params["billing_notification_target_emails"]
+        self.organization["billing_notification_target_emails"] = emails
+        return 200, self.organization, {}
+
+    def _list_ssh_keys(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, self._page(self.ssh_keys.values(), params), {}
+
+    def _post_ssh_key(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        key = {"id": self._id(), "name": params["name"], "content": params["content"]}
+        self.ssh_keys[key["id"]] = key
+        return 200, key, {}
+
+    def _delete_ssh_key(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        self._find(self.ssh_keys, match["id"])
+        del self.ssh_keys[match["id"]]
+        return 204, None, {}
+
+    # Virtual machines
+
+    def _get_virtual_machine_locations(
+        self, _match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, self._page(self.virtual_machine_locations, {}), {}
+
+    def _get_virtual_machine_location(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        locations = {
+            location["id"]: location for location in self.virtual_machine_locations
+        }
+        return 200, self._find(locations, match["id"]), {}
+
+    def _post_virtual_machine(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        preset = self._preset(params["config_id"])
+        if preset["available_vms"] < 1:
+            raise FakeAPIError(400, "No VMs available for this configuration")
+        preset["available_vms"] -= 1
+        compute = Decimal(preset["compute_rate_hourly"])
+        storage = Decimal(preset["storage_rate_hourly"])
+        vm_id = self._id()
+        self.virtual_machines[vm_id] = {
+            "id": vm_id,
+            "hostnode_id": self._id(),
+            "type": "ondem",
+            "status": "Running",
+            "name": params["name"],
+            "resources": preset["resources"],
+            "operating_system": preset["operating_system"],
+            "pricing": {
+                "gpus_per_hr": str(compute),
+                "vcpu_per_hr": "0.00",
+                "ram_per_hr": "0.00",
+                "storage_per_hr": str(storage),
+                "total_associated_per_hr": str(compute + storage),
+                "total_disassociated_per_hr": str(storage),
+            },
+            "public_ip": self._ip("203.0"),
+            "internal_ip": self._ip("10.0"),
+            "port_forwards": [],
+            "timestamp_creation": self._timestamp(self._clock()),
+            "tags": params.get("tags") or [],
+            # Not part of the API response, but needed to release capacity.
+            "_config_id": preset["id"],
+        }
+        self._billed_until[vm_id] = self._clock()
+        return 200, {"vm_id": vm_id}, {}
+
+    def _list_virtual_machines(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, self._page(map(_public, self.virtual_machines.values()), params), {}
+
+    def _get_virtual_machine(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, _public(self._find(self.virtual_machines, match["id"])), {}
+
+    def _patch_virtual_machine(
+        self, match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        vm = self._find(self.virtual_machines, match["id"])
+        return 200, _patch(vm, params, ("name", "tags")), {}
+
+    def _delete_virtual_machine(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        vm = self._find(self.virtual_machines, match["id"])
+        if vm["status"] != "Terminated":
+            vm["status"] = "Terminated"
+            if "_config_id" in vm:
+                self._preset(vm["_config_id"])["available_vms"] += 1
+        return 204, None, {}
+
+    def _put_vm_power_status(
+        self, match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        vm = self._find(self.virtual_machines, match["id"])
+        if vm["status"] in ("Terminated", "Relocating"):
+            raise FakeAPIError(409, f"The VM is {vm['status'].lower()}")
+        vm["status"] = _VM_POWER_STATUSES[params["status"]]
+        return 200, {"status": params["status"]}, {}
+
+    def _relocate_virtual_machine(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        vm = self._find(self.virtual_machines, match["id"])
+        if vm["status"] == "Terminated":
+            raise FakeAPIError(409, "The VM is terminated")
+        vm["status"] = "Relocating"
+        vm["hostnode_id"] = self._id()
+        self._ready_at[vm["id"]] = self._clock() + self.provisioning_delay
+        return 200, {}, {}
+
+    # Bare-metal rentals
+
+    def _get_baremetal_locations(
+        self, _match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, self._page(self.baremetal_locations, {}), {}
+
+    def _post_baremetal_rental(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        location = self._baremetal_location(params["location_id"])
+        network_type = params["network_type"]
+        gpu_count = params["gpu_count"]
+        gpus_per_node = location["specs_per_node"]["gpu_count"]
+        if gpu_count % gpus_per_node:
+            raise FakeAPIError(400, f"gpu_count must be a multiple of {gpus_per_node}")
+        if gpu_count > location[f"gpu_count_{network_type}"]:
+            raise FakeAPIError(400, "Not enough GPUs available at this location")
+        location[f"gpu_count_{network_type}"] -= gpu_count
+        node_count = gpu_count // gpus_per_node
+        price = Decimal(location[f"gpu_price_{network_type}"]) * gpu_count
+        rental_id = self._id()
+        self.baremetal_rentals[rental_id] = {
+            "id": rental_id,
+            "name": params["name"],
+            "creation_timestamp": self._timestamp(self._clock()),
+            "rate_hourly": str(price.quantize(_CENT)),
+            "suborder": None,
+            "status": "Pending",
+            "power_status": "Running",
+            "node_count": node_count,
+            "specs_per_node": location["specs_per_node"],
+            "network_type": network_type,
+            "username": "ubuntu",
+            "node_networking": [
+                {"public_ip": self._ip("198.51"), "private_ip": self._ip("10.1")}
+                for _ in range(node_count)
+            ],
+            "sub_order": None,
+            "storage_id": params.get("storage_id"),
+            "storage_pv": None,
+            "storage_pvc": None,
+            "k8s_cluster_id": None,
+            "kubeconfig": None,
+            "tags": params.get("tags") or [],
+            "_location_id": location["id"],
+        }
+        self._ready_at[rental_id] = self._clock() + self.provisioning_delay
+        return 200, {"rental_id": rental_id}, {}
+
+    def _list_baremetal_rentals(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        rentals = map(_public_rental, self.baremetal_rentals.values())
+        return 200, self._page(rentals, params), {}
+
+    def _patch_baremetal_rental(
+        self, match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        rental = self._find(self.baremetal_rentals, match["id"])
+        return 200, _patch(rental, params, ("name", "tags")), {}
+
+    def _delete_baremetal_rental(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        rental = self._find(self.baremetal_rentals, match["id"])
+        if rental["status"] != "Terminated":
+            self._release_nodes(rental, rental["node_count"])
+            rental["status"] = "Terminated"
+            rental["power_status"] = "Stopped"
+            self._ready_at.pop(rental["id"], None)
+        return 204, None, {}
+
+    def _put_baremetal_power_status(
+        self, match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        rental = self._active_rental(match["id"])
+        rental["power_status"] = (
+            "Running" if params["status"] == "started" else "Stopped"
+        )
+        return 200, {"status": params["status"]}, {}
+
+    def _reboot_nodes(
+        self, match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        rental = self._active_rental(match["id"])
+        self._nodes(rental, params["public_ips"])
+        return 200, {}, {}
+
+    def _remove_nodes(
+        self, match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        rental = self._active_rental(match["id"])
+        removed = self._nodes(rental, params["public_ips"])
+        rental["node_networking"] = [
+            node for node in rental["node_networking"] if node not in removed
+        ]
+        self._release_nodes(rental, len(removed))
+        rental["rate_hourly"] = str(
+            (
+                Decimal(rental["rate_hourly"])
+                * (rental["node_count"] - len(removed))
+                / rental["node_count"]
+            ).quantize(_CENT)
+        )
+        rental["node_count"] -= len(removed)
+        return 200, {}, {}
+
+    # Billing
+
+    def _get_billing_hourly_rate(
+        self, _match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        total = sum((rate for _, _, rate in self._billable()), Decimal(0))
+        return 200, {"rate_hourly": str(total.quantize(_CENT))}, {}
+
+    def _list_billing_transactions(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        types = set(params.get("types") or [])
+        earliest = params.get("earliest") or ""
+        # Dates compare as strings, and "~" sorts after any timestamp.
+        latest = (params.get("latest") or "~") + "~"
+        transactions = (
+            t
+            for t in self.billing_transactions
+            if (not types or _resource_type(t) in types)
+            and earliest <= t["timestamp_creation"] <= latest
+        )
+        return 200, self._page(transactions, params), {}
+
+    def _get_monthly_billing_report(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        month = f"{int(match['year']):04d}-{int(match['month']):02d}"
+        balance = Decimal(0)
+        start = None
+        transactions = []
+        for transaction in self.billing_transactions:
+            if transaction["timestamp_creation"][:7] == month:
+                start = balance if start is None else start
+                transactions.append(transaction)
+            elif transaction["timestamp_creation"][:7] > month:
+                continue
+            balance += Decimal(transaction["total_amount"])
+        start = balance if start is None else start
+        end = start + sum(
+            (Decimal(t["total_amount"]) for t in transactions), Decimal(0)
+        )
+        return (
+            200,
+            {
+                "transactions": transactions,
+                "balance_at_period_start": str(start.quantize(_CENT)),
+                "balance_at_period_end": str(end.quantize(_CENT)),
+                "balance_delta_in_period": str((end - start).quantize(_CENT)),
+            },
+            {},
+        )
+
+    # Cloud-init validation
+
+    def _validate_cloudinit(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        if params["content"].startswith("#cloud-config"):
+            return 200, {"error": False, "message": None}, {}
+        message = "Cloud-init scripts must start with #cloud-config"
+        return 200, {"error": True, "message": message}, {}
+
+    # Storage
+
+    def _get_storage_hourly_rate(
+        self, _match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, {"hourly_rate_per_gb": "0.0001"}, {}
+
+    def _list_storage_volumes(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        return 200, self._page(self.storage_volumes.values(), params), {}
+
+    def _post_storage_volume(
+        self, _match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        volume = {
+            "id": self._id(),
+            "size_in_gb": params["size_in_gb"],
+            "name": params["name"],
+            "status": "active",
+            "rate_hourly": _storage_rate(params["size_in_gb"]),
+            "order_ids": params.get("order_ids") or [],
+            "tenant_id": 1,
+            "vip": self._ip("10.2"),
+        }
+        self.storage_volumes[volume["id"]] = volume
+        return 200, volume, {}
+
+    def _get_storage_volume(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        volume = self._find(self.storage_volumes, match["id"])
+        return 200, volume | {"used_capacity_bytes": 0}, {}
+
+    def _patch_storage_volume(
+        self, match: re.Match[str], params: dict[str, Any]
+    ) -> FakeResponse:
+        volume = self._find(self.storage_volumes, match["id"])
+        _patch(volume, params, ("size_in_gb", "name", "order_ids"))
+        volume["rate_hourly"] = _storage_rate(volume["size_in_gb"])
+        return 200, volume, {}
+
+    def _delete_storage_volume(
+        self, match: re.Match[str], _params: dict[str, Any]
+    ) -> FakeResponse:
+        self._find(self.storage_volumes, match["id"])
+        del self.storage_volumes[match["id"]]
+        return 204, None, {}
+
+    ###################
+    # Private helpers #
+    ###################
+
+    def _id(self) -> str:
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def _ip(self, prefix: str) -> str:
+        return f"{prefix}.{self._rng.randint(0, 255)}.{self._rng.randint(1, 254)}"
+
+    @staticmethod
+    def _timestamp(moment: float) -> str:
+        return (
+            datetime.fromtimestamp(moment, UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+            + "Z"
+        )
+
+    @staticmethod
+    def _find(resources: dict[str, dict[str, Any]], resource_id: str) -> dict[str, Any]:
+        if resource_id not in resources:
+            raise FakeAPIError(404, "Not found")
+        return resources[resource_id]
+
+    def _page(
+        self, items: Iterable[dict[str, Any]], params: dict[str, Any]
+    ) -> dict[str, Any]:
+        items = list(items)
+        limit = min(params.get("limit") or self.max_page_size, self.max_page_size)
+        offset = params.get("offset") or 0
+        return {
+            "results": items[offset : offset + limit],
+            "total_result_count": len(items),
+            "has_previous": offset > 0,
+            "has_next": offset + limit < len(items),
+        }
+
+    def _preset(self, preset_id: str) -> dict[str, Any]:
+        for location in self.virtual_machine_locations:
+            for preset in location["available_presets"]:
+                if preset["id"] == preset_id:
+                    return cast("dict[str, Any]", preset)
+        raise FakeAPIError(404, f"Unknown config_id {preset_id!r}")
+
+    def _baremetal_location(self, location_id: str) -> dict[str, Any]:
+        locations = {location["id"]: location for location in self.baremetal_locations}
+        return self._find(locations, location_id)
+
+    def _active_rental(self, rental_id: str) -> dict[str, Any]:
+        rental = self._find(self.baremetal_rentals, rental_id)
+        if rental["status"] != "Running":
+            raise FakeAPIError(409, f"The rental is {rental['status'].lower()}")
+        return rental
+
+    @staticmethod
+    def _nodes(rental: dict[str, Any], public_ips: list[str]) -> list[dict[str, str]]:
+        nodes = {node["public_ip"]: node for node in rental["node_networking"]}
+        unknown = set(public_ips) - nodes.keys()
+        if unknown:
+            raise FakeAPIError(400, f"Unknown nodes: {', '.join(sorted(unknown))}")
+        return [nodes[ip] for ip in public_ips]
+
+    def _release_nodes(self, rental: dict[str, Any], node_count: int) -> None:
+        if "_location_id" in rental:
+            location = self._baremetal_location(rental["_location_id"])
+            gpus = node_count * rental["specs_per_node"]["gpu_count"]
+            location[f"gpu_count_{rental['network_type']}"] += gpus
+
+    def _throttle(self, now: float) -> float:
+        # A token bucket holding up to a second's worth of requests, and at
+        # least one. Returns 0 if the request can go ahead, or how long until
+        # it could.
+        if self.rate_limit is None:
+            return 0.0
+        self._tokens = min(
+            max(self.rate_limit, 1),
+            self._tokens + (now - self._last_refill) * self.rate_limit,
+        )
+        self._last_refill = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate_limit
+        self._tokens -= 1
+        return 0.0
+
+    def _advance(self, now: float) -> None:
+        # Moves state forward to now: finishes provisioning and relocations,
+        # and charges for running resources once per billing interval.
+        for resource_id, ready_at in list(self._ready_at.items()):
+            if ready_at <= now:
+                del self._ready_at[resource_id]
+                resource = self.virtual_machines.get(
+                    resource_id
+                ) or self.baremetal_rentals.get(resource_id)
+                if resource is not None:
+                    resource["status"] = "Running"
+                    self._billed_until.setdefault(resource_id, ready_at)
+        if now - self._last_accrual >= self.billing_interval:
+            self._last_accrual = now
+            self._accrue(now)
+
+    def _billable(self) -> Iterable[tuple[str, dict[str, Any], Decimal]]:
+        # The resources being charged for, and their hourly rate.
+        for vm_id, vm in self.virtual_machines.items():
+            if vm_id in self._billed_until and vm["status"] != "Terminated":
+                pricing = vm["pricing"]
+                rate = (
+                    pricing["total_associated_per_hr"]
+                    if vm["status"] in ("Running", "Relocating")
+                    else pricing["total_disassociated_per_hr"]
+                )
+                yield "charge", vm, Decimal(rate)
+        for rental_id, rental in self.baremetal_rentals.items():
+            if rental_id in self._billed_until and rental["status"] == "Running":
+                yield "baremetal_charge", rental, Decimal(rental["rate_hourly"])
+
+    def _accrue(self, now: float) -> None:
+        for details_type, resource, rate in list(self._billable()):
+            billed_until = self._billed_until[resource["id"]]
+            amount = (rate * Decimal(now - billed_until) / 3600).quantize(_CENT)
+            if amount:
+                linked_instance = {
+                    "id": self._id(),
+                    "timestamp_creation": self._timestamp(billed_until),
+                    "timestamp_deletion": None,
+                }
+                if details_type == "charge":
+                    linked_instance["type"] = "virtual_machine_instance"
+                    linked_instance["virtual_machine_id"] = resource["id"]
+                else:
+                    linked_instance["baremetal_rental_id"] = resource["id"]
+                self._add_transaction(
+                    -amount,
+                    now,
+                    {"type": details_type, "linked_instance": linked_instance},
+                )
+                self._billed_until[resource["id"]] = now
+
+    def _deposit(self, amount: Decimal) -> None:
+        self._add_transaction(amount, self._clock(), {"type": "stripe_deposit"})
+
+    def _add_transaction(
+        self, amount: Decimal, moment: float, details: dict[str, Any]
+    ) -> None:
+        timestamp = self._timestamp(moment)
+        self.billing_transactions.append(
+            {
+                "id": self._id(),
+                "total_amount": str(amount.quantize(_CENT)),
+                "timestamp_creation": timestamp,
+                "timestamp_completion": timestamp,
+                "details": details,
+                "period_amount": str(amount.quantize(_CENT)),
+            }
+        )
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        handler: type[BaseHTTPRequestHandler],
+        api: FakeVoltageParkAPI,
+    ) -> None:
+        super().__init__(address, handler)
+        self.api = api
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Otherwise each body waits for the ACK of the headers.
+    disable_nagle_algorithm = True
+
+    def _respond(self) -> None:
+        api = cast("_Server", self.server).api
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = urlsplit(self.path).path
+        if path.startswith(API_PATH):
+            path = path.removeprefix(API_PATH)
+            status, content, headers = api.handle_raw(self.command, path, body)
+        else:
+            status, content, headers = 404, b'{"detail": "Not found"}', {}
+        if delay := api.delay():
+            time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _respond  # noqa: N815
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def _public(resource: dict[str, Any]) -> dict[str, Any]:
+    # Drops the fake's own bookkeeping fields.
+    return {key: value for key, value in resource.items() if not key.startswith("_")}
+
+
+def _public_rental(rental: dict[str, Any]) -> dict[str, Any]:
+    # Pending rentals only have the fields of BaremetalRentalPending.
+    if rental["status"] == "Pending":
+        keys = ("id", "name", "creation_timestamp", "rate_hourly", "suborder", "status")
+        return {key: rental[key] for key in keys}
+    return _public(rental)
+
+
+def _patch(
+    resource: dict[str, Any], params: dict[str, Any], fields: tuple[str, ...]
+) -> dict[str, Any]:
+    for field in fields:
+        if params.get(field) is not None:
+            resource[field] = params[field]
+    return {field: resource[field] for field in fields}
+
+
+def _resource_type(transaction: dict[str, Any]) -> str:
+    # The billing transaction `types` filter value that matches transaction.
+    details = transaction["details"]
+    if details["type"] in ("payout", "charge"):
+        if details["linked_instance"]["type"] == "storage_block_instance":
+            return "storage_block"
+        return "virtual_machine"
+    if details["type"].startswith("baremetal"):
+        return "baremetal"
+    if details["type"].startswith("storage"):
+        return "storage"
+    return "other"
+
+
+def _storage_rate(size_in_gb: int) -> str:
+    return str((Decimal("0.0001") * size_in_gb).quantize(Decimal("0.0001")))
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from concurrent.futures import Future
+from typing import Any
+
+from voltage_park_sdk.async_client import AsyncVoltageParkClient
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.fleet import FleetResource, ResourceKind
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 30.0
+DEFAULT_BACKOFF = 1.5
+
+# How many listings in a row a resource can be missing from before its wait
+# fails, in case a new resource takes a moment to show up.
+_MISSING_POLLS = 3
+
+# Keeps the polling tasks of async_wait_for alive until they finish.
+_background_tasks: set[asyncio.Task[None]] = set()
+
+# A resource ID and what its future resolves to.
+type _Outcome = tuple[str, FleetResource | Exception]
+
+
+class ResourceStateError(RuntimeError):
+    """Raised when a resource reaches one of the failure states of a wait."""
+
+    def __init__(self, resource: FleetResource) -> None:
+        super().__init__(f"{resource.id} reached state {resource.status!r}")
+        self.resource = resource
+
+
+class ResourceNotFoundError(LookupError):
+    """Raised when a resource being waited on is missing from the listing."""
+
+    def __init__(self, resource_id: str) -> None:
+        super().__init__(f"{resource_id} is not in the listing")
+        self.resource_id = resource_id
+
+
+class _Tracker:
+    # The polling state shared by the sync and async loops: which resources
+    # are still pending, the deadline and the current polling interval.
+    def __init__(  # noqa: PLR0913
+        self,
+        ids: Iterable[str],
+        target_states: Collection[str],
+        fail_states: Collection[str],
+        timeout: float | None,
+        interval: float,
+        max_interval: float,
+        backoff: float,
+    ) -> None:
+        self.pending = set(ids)
+        self._target_states = target_states
+        self._fail_states = fail_states
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._min_interval = interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._interval = interval
+        self._statuses: dict[str, str] = {}
+        self._missing: dict[str, int] = {}
+        self._last_error: Exception | None = None
+
+    def update(self, resources: Iterable[FleetResource]) -> list[_Outcome]:
+        # Returns the resources that are done, and adapts the interval: poll
+        # quickly while states are changing and back off while they are not.
+        resolved: list[_Outcome] = []
+        changed = False
+        seen: set[str] = set()
+        for resource in resources:
+            if resource.id not in self.pending:
+                continue
+            seen.add(resource.id)
+            self._missing.pop(resource.id, None)
+            if self._statuses.get(resource.id) != resource.status:
+                self._statuses[resource.id] = resource.status
+                changed = True
+            if resource.status in self._target_states:
+                resolved.append((resource.id, resource))
+            elif resource.status in self._fail_states:
+                resolved.append((resource.id, ResourceStateError(resource)))
+        for resource_id in self.pending - seen:
+            self._missing[resource_id] = self._missing.get(resource_id, 0) + 1
+            if self._missing[resource_id] >= _MISSING_POLLS:
+                resolved.append((resource_id, ResourceNotFoundError(resource_id)))
+        self._last_error = None
+        self.pending.difference_update(resource_id for resource_id, _ in resolved)
+        if changed:
+            self._interval = self._min_interval
+        else:
+            self._interval = min(self._interval * self._backoff, self._max_interval)
+        return resolved
+
+    def expire(self) -> list[_Outcome]:
+        if self._deadline is None or time.monotonic() < self._deadline:
+            return []
+        expired: list[_Outcome] = []
+        for resource_id in self.pending:
+            error = TimeoutError(f"Timed out waiting for {resource_id}")
+            error.__cause__ = self._last_error
+            expired.append((resource_id, error))
+        self.pending.clear()
+        return expired
+
+    def record_error(self, error: Exception) -> None:
+        # A failed listing doesn't end the wait: keep polling, backing off as
+        # if nothing changed, until the deadline.
+        logger.warning("Failed to list resources while waiting: %s", error)
+        self._last_error = error
+        self._interval = min(self._interval * self._backoff, self._max_interval)
+
+    def prune(self, futures: Mapping[str, Any]) -> bool:
+        # Stops polling for resources whose future is already done, such as
+        # ones the caller cancelled, and returns whether any are left.
+        self.pending.difference_update(
+            resource_id
+            for resource_id in list(self.pending)
+            if futures[resource_id].done()
+        )
+        return bool(self.pending)
+
+    def next_delay(self) -> float:
+        if self._deadline is None:
+            return self._interval
+        return max(0.0, min(self._interval, self._deadline - time.monotonic()))
+
+
+##################
+# Public helpers #
+##################
+
+
+def wait_for(  # noqa: PLR0913
+    client: VoltageParkClient,
+    ids: Iterable[str],
+    target_states: Collection[str],
+    *,
+    kind: ResourceKind = "virtual_machine",
+    fail_states: Collection[str] = (),
+    timeout: float | None = None,
+    interval: float = DEFAULT_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    backoff: float = DEFAULT_BACKOFF,
+) -> dict[str, Future[FleetResource]]:
+    """Wait for many VMs or bare-metal rentals to reach one of `target_states`.
+
+    Returns a future per ID straight away. A background thread polls the
+    listing endpoint for `kind` once per tick and resolves each future with
+    the resource as soon as it reaches a target state, with
+    `ResourceStateError` if it reaches one of `fail_states` first, with
+    `ResourceNotFoundError` if it's missing from a few listings in a row, or
+    with `TimeoutError` once `timeout` seconds have passed. Failed listings
+    are logged and retried until the timeout.
+    """
+    tracker = _Tracker(
+        ids, target_states, fail_states, timeout, interval, max_interval, backoff
+    )
+    futures: dict[str, Future[FleetResource]] = {
+        resource_id: Future() for resource_id in tracker.pending
+    }
+
+    def poll() -> None:
+        while tracker.prune(futures):
+            try:
+                resolved = tracker.update(_list_resources(client, kind))
+            except Exception as e:  # noqa: BLE001
+                tracker.record_error(e)
+                resolved = []
+            _resolve(futures, [*resolved, *tracker.expire()])
+            if tracker.prune(futures):
+                time.sleep(tracker.next_delay())
+
+    threading.Thread(target=poll, name="voltage-park-wait-for", daemon=True).start()
+    return futures
+
+
+def async_wait_for(  # noqa: PLR0913
+    client: AsyncVoltageParkClient,
+    ids: Iterable[str],
+    target_states: Collection[str],
+    *,
+    kind: ResourceKind = "virtual_machine",
+    fail_states: Collection[str] = (),
+    timeout: float | None = None,
+    interval: float = DEFAULT_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    backoff: float = DEFAULT_BACKOFF,
+) -> dict[str, asyncio.Future[FleetResource]]:
+    # Same as wait_for, polling from a task on the running event loop.
+    loop = asyncio.get_running_loop()
+    tracker = _Tracker(
+        ids, target_states, fail_states, timeout, interval, max_interval, backoff
+    )
+    futures: dict[str, asyncio.Future[FleetResource]] = {
+        resource_id: loop.create_future() for resource_id in tracker.pending
+    }
+
+    async def poll() -> None:
+        while tracker.prune(futures):
+            try:
+                resolved = tracker.update(await _alist_resources(client, kind))
+            except Exception as e:  # noqa: BLE001
+                tracker.record_error(e)
+                resolved = []
+            _resolve(futures, [*resolved, *tracker.expire()])
+            if tracker.prune(futures):
+                await asyncio.sleep(tracker.next_delay())
+
+    task = loop.create_task(poll())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return futures
+
+
+###################
+# Private helpers #
+###################
+
+
+def _list_resources(
+    client: VoltageParkClient, kind: ResourceKind
+) -> Sequence[FleetResource]:
+    if kind == "virtual_machine":
+        return [*client.fetch_all(client.get_virtual_machines)]
+    return [*client.fetch_all(client.get_baremetal_rentals)]
+
+
+async def _alist_resources(
+    client: AsyncVoltageParkClient, kind: ResourceKind
+) -> Sequence[FleetResource]:
+    if kind == "virtual_machine":
+        return [*await client.fetch_all(client.get_virtual_machines)]
+    return [*await client.fetch_all(client.get_baremetal_rentals)]
+
+
+def _resolve(
+    futures: dict[str, Any],
+    resolved: Iterable[_Outcome],
+) -> None:
+    # Futures the caller cancelled are skipped.
+    for resource_id, outcome in resolved:
+        future = futures[resource_id]
+        if future.done():
+            continue
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_result(outcome)
@@ -0,0 +1,275 @@
+import abc
+import asyncio
+import logging
+import threading
+from collections.abc import AsyncGenerator, Callable, Collection, Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any, Literal, Self
+
+from voltage_park_sdk.client import VoltageParkClient
+from voltage_park_sdk.fleet import FleetResource, ResourceKind, diff_snapshots
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5.0
+DEFAULT_MAX_INTERVAL = 60.0
+DEFAULT_BACKOFF = 1.5
+
+# Statuses that resources only pass through, so a ResourceWatcher keeps
+# polling quickly while any resource is in one of them.
+TRANSITIONAL_STATUSES = frozenset({"Pending", "Relocating"})
+
+type CapacityKey = tuple[Literal["baremetal", "virtual_machine"], str, str]
+type ResourceEventType = Literal["added", "removed", "modified"]
+
+
+@dataclass(frozen=True)
+class CapacityEvent:
+    # pool is the network type for bare-metal locations and the preset ID for
+    # VM locations. previous is None the first time a pool is seen and
+    # current is 0 once it disappears.
+    kind: Literal["baremetal", "virtual_machine"]
+    location_id: str
+    pool: str
+    previous: int | None
+    current: int
+
+    @property
+    def delta(self) -> int:
+        return self.current - (self.previous or 0)
+
+
+@dataclass(frozen=True)
+class ResourceEvent:
+    # resource is the last known state of a removed resource, and previous
+    # and changed_fields are only set for modified resources.
+    type: ResourceEventType
+    resource: FleetResource
+    previous: FleetResource | None = None
+    changed_fields: tuple[str, ...] = ()
+
+
+class _Watcher[KeyT: Hashable, ValueT, EventT](abc.ABC):
+    # Polls a snapshot on a background thread, diffs it against the previous
+    # one and delivers the resulting events to every subscriber. The interval
+    # resets whenever something changed and backs off while nothing does.
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        self._min_interval = interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self.interval = interval
+        self.snapshot: dict[KeyT, ValueT] = {}
+        self._subscribers: list[Callable[[EventT], Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, callback: Callable[[EventT], Any]) -> Callable[[], None]:
+        # Returns a function that cancels the subscription.
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    async def events(self) -> AsyncGenerator[EventT]:
+        # Yields events on the running event loop until the iterator is
+        # closed. The watcher must be started separately.
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[EventT] = asyncio.Queue()
+        unsubscribe = self.subscribe(
+            lambda event: loop.call_soon_threadsafe(queue.put_nowait, event)
+        )
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    def poll(self) -> list[EventT]:
+        snapshot = self._fetch()
+        events = self._diff(self.snapshot, snapshot)
+        self.snapshot = snapshot
+        self._adapt_interval(changed=bool(events) or self._is_busy(snapshot))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception:
+                    logger.exception("Watch subscriber %r failed", callback)
+        return events
+
+    def start(self) -> Self:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"voltage-park-{type(self).__name__}",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    ###################
+    # Private helpers #
+    ###################
+
+    @abc.abstractmethod
+    def _fetch(self) -> dict[KeyT, ValueT]: ...
+
+    @abc.abstractmethod
+    def _diff(
+        self, old: Mapping[KeyT, ValueT], new: Mapping[KeyT, ValueT]
+    ) -> list[EventT]: ...
+
+    def _is_busy(self, snapshot: Mapping[KeyT, ValueT]) -> bool:  # noqa: ARG002
+        # Whether to keep polling quickly even though nothing changed.
+        return False
+
+    def _adapt_interval(self, *, changed: bool) -> None:
+        if changed:
+            self.interval = self._min_interval
+        else:
+            self.interval = min(self.interval * self._backoff, self._max_interval)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:  # noqa: BLE001
+                # Keep the previous snapshot and try again next time.
+                logger.warning("Failed to poll %s: %s", type(self).__name__, e)
+                self._adapt_interval(changed=False)
+            self._stop.wait(self.interval)
+
+
+class CapacityWatcher(_Watcher[CapacityKey, int, CapacityEvent]):
+    """Watch the available bare-metal GPUs and VMs for changes.
+
+    A single watcher polls `get_baremetal_locations` and
+    `get_virtual_machine_locations` and emits a `CapacityEvent` whenever
+    `gpu_count_ethernet`, `gpu_count_infiniband` or a preset's
+    `available_vms` changes. Subscribe with a callback, or iterate over
+    `events()` from asyncio code.
+    """
+
+    def __init__(
+        self,
+        client: VoltageParkClient,
+        interval: float = DEFAULT_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        super().__init__(interval, max_interval, backoff)
+        self._client = client
+
+    def _fetch(self) -> dict[CapacityKey, int]:
+        snapshot: dict[CapacityKey, int] = {}
+        for location in self._client.get_baremetal_locations().results:
+            snapshot["baremetal", location.id, "ethernet"] = location.gpu_count_ethernet
+            snapshot["baremetal", location.id, "infiniband"] = (
+                location.gpu_count_infiniband
+            )
+        for vm_location in self._client.get_virtual_machine_locations().results:
+            for preset in vm_location.available_presets:
+                snapshot["virtual_machine", vm_location.id, preset.id] = (
+                    preset.available_vms
+                )
+        return snapshot
+
+    def _diff(
+        self, old: Mapping[CapacityKey, int], new: Mapping[CapacityKey, int]
+    ) -> list[CapacityEvent]:
+        return [
+            CapacityEvent(*key, previous=old.get(key), current=new.get(key, 0))
+            for key in [*new, *(key for key in old if key not in new)]
+            if old.get(key) != new.get(key, 0)
+        ]
+
+
+class ResourceWatcher(_Watcher[str, FleetResource, ResourceEvent]):
+    """Watch VMs and bare-metal rentals for changes.
+
+    Every poll lists the resources of the watched `kinds`, diffs them against
+    the previous listing by ID and emits an `added`, `removed` or `modified`
+    `ResourceEvent`, the latter listing the fields that changed, such as
+    `status`, `power_status` or `node_networking`. The first poll reports
+    every existing resource as added. Polling stays fast while resources are
+    changing or in a transitional status, and backs off while all is quiet.
+    """
+
+    def __init__(
+        self,
+        client: VoltageParkClient,
+        kinds: Collection[ResourceKind] = ("virtual_machine", "baremetal_rental"),
+        interval: float = DEFAULT_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        super().__init__(interval, max_interval, backoff)
+        self._client = client
+        self._kinds = kinds
+
+    def _fetch(self) -> dict[str, FleetResource]:
+        snapshot: dict[str, FleetResource] = {}
+        if "virtual_machine" in self._kinds:
+            for virtual_machine in self._client.fetch_all(
+                self._client.get_virtual_machines
+            ):
+                snapshot[virtual_machine.id] = virtual_machine
+        if "baremetal_rental" in self._kinds:
+            for rental in self._client.fetch_all(self._client.get_baremetal_rentals):
+                snapshot[rental.id] = rental
+        return snapshot
+
+    def _diff(
+        self, old: Mapping[str, FleetResource], new: Mapping[str, FleetResource]
+    ) -> list[ResourceEvent]:
+        diff = diff_snapshots(old, new)
+        return [
+            *(ResourceEvent("added", new[key]) for key in diff.added),
+            *(
+                ResourceEvent(
+                    "modified", new[key], old[key], _changed_fields(old[key], new[key])
+                )
+                for key in diff.modified
+            ),
+            *(ResourceEvent("removed", old[key]) for key in diff.removed),
+        ]
+
+    def _is_busy(self, snapshot: Mapping[str, FleetResource]) -> bool:
+        return any(r.status in TRANSITIONAL_STATUSES for r in snapshot.values())
+
+
+def _changed_fields(old: FleetResource, new: FleetResource) -> tuple[str, ...]:
+    # A rental's model changes with its status, so fields can also appear or
+    # disappear between two snapshots.
+    before, after = vars(old), vars(new)
+    return tuple(
+        name
+        for name in [*after, *(name for name in before if name not in after)]
+        if before.get(name) != after.get(name)
+    )
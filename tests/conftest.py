@@ -0,0 +1,167 @@
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from voltage_park_sdk import VoltageParkClient
+
+Handler = Callable[[requests.PreparedRequest], tuple[int, Any]]
+
+
+class FakeAdapter(BaseAdapter):
+    """Serve canned JSON responses instead of talking to the network."""
+
+    def __init__(self, handler: Handler) -> None:
+        super().__init__()
+        self.handler = handler
+        self.requests: list[requests.PreparedRequest] = []
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        self.requests.append(request)
+        status, body = self.handler(request)
+        response = requests.Response()
+        response.status_code = status
+        response.url = request.url or ""
+        response.request = request
+        if isinstance(body, bytes):
+            response._content = body
+        else:
+            response._content = json.dumps(body).encode()
+        response._content_consumed = True  # type: ignore[attr-defined]
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def request_params(request: requests.PreparedRequest) -> dict[str, Any]:
+    # The client sends its parameters as a JSON body, even on GET requests.
+    if not request.body:
+        return {}
+    return json.loads(request.body)  # type: ignore[no-any-return]
+
+
+def list_page(items: list[Any], request: requests.PreparedRequest) -> dict[str, Any]:
+    params = request_params(request)
+    offset = params.get("offset", 0)
+    limit = params.get("limit", len(items))
+    results = items[offset : offset + limit]
+    return {
+        "results": results,
+        "total_result_count": len(items),
+        "has_previous": offset > 0,
+        "has_next": offset + limit < len(items),
+    }
+
+
+@pytest.fixture
+def make_client() -> Callable[[Handler], tuple[VoltageParkClient, FakeAdapter]]:
+    def _make_client(
+        handler: Handler, **kwargs: Any
+    ) -> tuple[VoltageParkClient, FakeAdapter]:
+        client = VoltageParkClient(token="test-token", **kwargs)
+        adapter = FakeAdapter(handler)
+        client._session.mount("https://", adapter)
+        return client, adapter
+
+    return _make_client
+
+
+def virtual_machine(vm_id: str, **overrides: Any) -> dict[str, Any]:
+    return {
+        "id": vm_id,
+        "hostnode_id": "host-1",
+        "type": "ondem",
+        "status": "Running",
+        "name": vm_id,
+        "resources": {
+            "gpus": {"h100-sxm5-80gb": {"count": 1}},
+            "ram_gb": 128,
+            "storage_gb": 512,
+            "vcpu_count": 16,
+        },
+        "operating_system": "Ubuntu 22.04 LTS",
+        "pricing": {
+            "gpus_per_hr": "2.00",
+            "vcpu_per_hr": "0.10",
+            "ram_per_hr": "0.05",
+            "storage_per_hr": "0.01",
+            "total_associated_per_hr": "2.16",
+            "total_disassociated_per_hr": "0.01",
+        },
+        "public_ip": f"203.0.113.{len(vm_id)}",
+        "internal_ip": f"10.0.0.{len(vm_id)}",
+        "port_forwards": [],
+        "timestamp_creation": "2025-01-01T00:00:00Z",
+        "tags": [],
+    } | overrides
+
+
+def baremetal_rental(rental_id: str, **overrides: Any) -> dict[str, Any]:
+    return {
+        "id": rental_id,
+        "name": rental_id,
+        "creation_timestamp": "2025-01-01T00:00:00Z",
+        "rate_hourly": "16.00",
+        "status": "Running",
+        "power_status": "Running",
+        "node_count": 1,
+        "specs_per_node": {
+            "gpu_count": 8,
+            "cpu_model": "Xeon",
+            "cpu_count": 2,
+            "ram_gb": 2048,
+            "storage_gb": 30000,
+        },
+        "network_type": "infiniband",
+        "username": "ubuntu",
+        "node_networking": [
+            {"public_ip": "198.51.100.1", "private_ip": "10.1.0.1"},
+        ],
+        "sub_order": None,
+        "storage_id": None,
+        "storage_pv": None,
+        "storage_pvc": None,
+        "k8s_cluster_id": None,
+        "kubeconfig": None,
+        "tags": [],
+    } | overrides
+
+
+def baremetal_location(location_id: str, **overrides: Any) -> dict[str, Any]:
+    return {
+        "id": location_id,
+        "gpu_count_ethernet": 16,
+        "gpu_price_ethernet": "2.00",
+        "gpu_count_infiniband": 8,
+        "gpu_price_infiniband": "2.50",
+        "specs_per_node": {
+            "gpu_count": 8,
+            "cpu_model": "Xeon",
+            "cpu_count": 2,
+            "ram_gb": 2048,
+            "storage_gb": 30000,
+        },
+    } | overrides
+
+
+def vm_preset(preset_id: str, **overrides: Any) -> dict[str, Any]:
+    return {
+        "id": preset_id,
+        "resources": {
+            "gpus": {"h100-sxm5-80gb": {"count": 1}},
+            "ram_gb": 128,
+            "storage_gb": 512,
+            "vcpu_count": 16,
+        },
+        "operating_system": "Ubuntu 22.04 LTS",
+        "compute_rate_hourly": "2.10",
+        "storage_rate_hourly": "0.01",
+        "available_vms": 2,
+    } | overrides
@@ -0,0 +1,123 @@
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pytest
+import requests
+
+from tests.conftest import FakeAdapter, list_page
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.analytics import TransactionTable, parse_amount
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+TRANSACTIONS: list[dict[str, Any]] = [
+    {
+        "id": "t-1",
+        "total_amount": "-0.10",
+        "period_amount": "-0.10",
+        "timestamp_creation": "2025-01-01T10:00:00Z",
+        "timestamp_completion": None,
+        "details": {
+            "type": "charge",
+            "linked_instance": {
+                "id": "instance-1",
+                "type": "virtual_machine_instance",
+                "timestamp_creation": "2025-01-01T00:00:00Z",
+                "timestamp_deletion": None,
+                "virtual_machine_id": "vm-1",
+            },
+        },
+    },
+    {
+        "id": "t-2",
+        "total_amount": "-0.20",
+        "period_amount": "-0.20",
+        "timestamp_creation": "2025-01-03T10:00:00.123Z",
+        "timestamp_completion": "2025-01-03T11:00:00Z",
+        "details": {
+            "type": "baremetal_charge",
+            "linked_instance": {
+                "id": "instance-2",
+                "timestamp_creation": "2025-01-01T00:00:00Z",
+                "timestamp_deletion": None,
+                "baremetal_rental_id": "rental-1",
+            },
+        },
+    },
+    {
+        "id": "t-3",
+        "total_amount": "-0.20",
+        "period_amount": "-0.20",
+        "timestamp_creation": "2025-01-03T12:00:00Z",
+        "timestamp_completion": "2025-01-03T13:00:00Z",
+        "details": {
+            "type": "charge",
+            "linked_instance": {
+                "id": "instance-1",
+                "type": "virtual_machine_instance",
+                "timestamp_creation": "2025-01-01T00:00:00Z",
+                "timestamp_deletion": None,
+                "virtual_machine_id": "vm-1",
+            },
+        },
+    },
+    {
+        "id": "t-4",
+        "total_amount": "100",
+        "period_amount": "100",
+        "timestamp_creation": "2025-01-02T00:00:00Z",
+        "timestamp_completion": "2025-01-02T00:00:00Z",
+        "details": {"type": "stripe_deposit"},
+    },
+]
+
+
+def test_details_are_flattened() -> None:
+    table = TransactionTable.from_records(TRANSACTIONS)
+
+    assert len(table) == 4
+    assert list(table.resource_id) == ["vm-1", "rental-1", "vm-1", ""]
+    assert np.isnat(table.timestamp_completion[0])
+
+
+def test_group_by_is_exact() -> None:
+    table = TransactionTable.from_records(TRANSACTIONS)
+
+    # Summed as floats, -0.1 + -0.2 would be -0.30000000000000004.
+    assert table.group_by("resource") == {
+        "": Decimal(100),
+        "rental-1": Decimal("-0.2"),
+        "vm-1": Decimal("-0.3"),
+    }
+    assert table.group_by("type")["charge"] == Decimal("-0.3")
+    assert table.total() == Decimal("99.5")
+
+
+def test_burn_rate_includes_every_day() -> None:
+    table = TransactionTable.from_records(TRANSACTIONS)
+    charges = table.filter(table.type != "stripe_deposit")
+
+    days, amounts = charges.burn_rate()
+
+    assert [str(day) for day in days] == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert amounts == [Decimal("-0.1"), Decimal(0), Decimal("-0.4")]
+
+
+def test_loads_every_page(make_client: MakeClient) -> None:
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        return 200, list_page(TRANSACTIONS, request)
+
+    client, adapter = make_client(handler)
+
+    table = TransactionTable.from_transactions(client, page_size=3)
+
+    assert list(table.id) == ["t-1", "t-2", "t-3", "t-4"]
+    assert len(adapter.requests) == 2
+
+
+def test_rejects_amounts_that_cannot_be_exact() -> None:
+    assert parse_amount("1.000001") == 1000001
+    with pytest.raises(ValueError, match="decimal places"):
+        parse_amount("0.0000001")
@@ -0,0 +1,66 @@
+import asyncio
+import inspect
+import json
+
+import httpx
+
+from voltage_park_sdk import AsyncVoltageParkClient, VoltageParkClient
+
+ORGANIZATION = {
+    "id": "org-1",
+    "name": "Test Org",
+    "billing_notification_target_emails": ["billing@example.com"],
+}
+
+
+def make_async_client() -> tuple[AsyncVoltageParkClient, list[httpx.Request]]:
+    seen: list[httpx.Request] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path.endswith("/organization"):
+            return httpx.Response(200, json=ORGANIZATION)
+        if request.url.path.endswith("/power-status"):
+            return httpx.Response(200, json=json.loads(request.content))
+        return httpx.Response(404, json={"detail": "Not found"})
+
+    client = AsyncVoltageParkClient(token="test-token")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    return client, seen
+
+
+def test_async_client_mirrors_sync_client() -> None:
+    def public_methods(cls: type) -> set[str]:
+        return {name for name in dir(cls) if not name.startswith("_")}
+
+    sync_methods = public_methods(VoltageParkClient) - {"close"}
+    async_methods = public_methods(AsyncVoltageParkClient) - {"aclose"}
+    assert sync_methods == async_methods
+    for name in async_methods - {n for n in async_methods if n.startswith("iter_")}:
+        assert inspect.iscoroutinefunction(getattr(AsyncVoltageParkClient, name))
+
+
+def test_concurrent_calls_share_one_client() -> None:
+    async def main() -> list[str]:
+        client, seen = make_async_client()
+        async with client:
+            organizations = await asyncio.gather(
+                *(client.get_organization() for _ in range(20))
+            )
+        assert len(seen) == 20
+        assert all(r.headers["Authorization"] == "Bearer test-token" for r in seen)
+        return [organization.id for organization in organizations]
+
+    assert asyncio.run(main()) == ["org-1"] * 20
+
+
+def test_payloads_are_serialized() -> None:
+    async def main() -> str:
+        client, seen = make_async_client()
+        async with client:
+            response = await client.put_vm_power_status("vm-1", "stopped")
+        assert seen[0].method == "PUT"
+        assert seen[0].url.path == "/api/v1/virtual-machines/vm-1/power-status"
+        return response.status
+
+    assert asyncio.run(main()) == "stopped"
@@ -0,0 +1,113 @@
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+
+from tests.conftest import FakeAdapter, list_page, request_params
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.billing_sync import BillingTransactionStore
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+
+def transaction(
+    transaction_id: str,
+    created: str,
+    rental_id: str = "rental-1",
+    completed: str | None = "",
+) -> dict[str, Any]:
+    return {
+        "id": transaction_id,
+        "total_amount": "-10.00",
+        "period_amount": "-10.00",
+        "timestamp_creation": created,
+        "timestamp_completion": created if completed == "" else completed,
+        "details": {
+            "type": "baremetal_charge",
+            "linked_instance": {
+                "id": f"instance-{rental_id}",
+                "timestamp_creation": created,
+                "timestamp_deletion": None,
+                "baremetal_rental_id": rental_id,
+            },
+        },
+    }
+
+
+def billing_handler(
+    transactions: list[dict[str, Any]],
+) -> Callable[[requests.PreparedRequest], tuple[int, Any]]:
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        earliest = request_params(request).get("earliest", "")
+        matching = [t for t in transactions if t["timestamp_creation"] >= earliest]
+        return 200, list_page(matching, request)
+
+    return handler
+
+
+def test_sync_is_incremental(make_client: MakeClient, tmp_path: Path) -> None:
+    transactions = [
+        transaction("t-1", "2025-01-01T00:00:00Z"),
+        transaction("t-2", "2025-01-10T00:00:00Z", completed=None),
+        transaction("t-3", "2025-01-20T00:00:00.500Z", rental_id="rental-2"),
+    ]
+    client, adapter = make_client(billing_handler(transactions))
+    store = BillingTransactionStore(tmp_path / "billing.sqlite3")
+
+    first = store.sync(client)
+    assert (first.fetched, first.inserted, first.updated) == (3, 3, 0)
+    assert first.earliest is None
+
+    # t-2 completes and a new transaction arrives.
+    transactions[1] = transaction("t-2", "2025-01-10T00:00:00Z")
+    transactions.append(transaction("t-4", "2025-01-21T00:00:00Z"))
+    second = store.sync(client)
+
+    # The sync reaches back to the pending t-2, but not to t-1.
+    assert second.earliest == "2025-01-10"
+    assert (second.fetched, second.inserted, second.updated) == (3, 1, 1)
+    assert request_params(adapter.requests[-1])["earliest"] == "2025-01-10"
+
+
+def test_local_queries(make_client: MakeClient, tmp_path: Path) -> None:
+    transactions = [
+        transaction("t-1", "2025-01-01T00:00:00Z"),
+        transaction("t-2", "2025-01-10T00:00:00Z"),
+        transaction("t-3", "2025-01-20T00:00:00Z", rental_id="rental-2"),
+    ]
+    client, _ = make_client(billing_handler(transactions))
+    with BillingTransactionStore(tmp_path / "billing.sqlite3") as store:
+        store.sync(client)
+
+        assert [t.id for t in store.query(resource_id="rental-1")] == ["t-1", "t-2"]
+        assert len(store.query(type="baremetal_charge")) == 3
+        in_range = store.query(start=date(2025, 1, 5), end=date(2025, 1, 20))
+        assert [t.id for t in in_range] == ["t-2"]
+
+
+def test_interrupted_sync_keeps_stored_pages(
+    make_client: MakeClient, tmp_path: Path
+) -> None:
+    transactions = [
+        transaction("t-1", "2025-01-01T00:00:00Z"),
+        transaction("t-2", "2025-01-10T00:00:00Z"),
+    ]
+    handler = billing_handler(transactions)
+
+    def failing_handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if request_params(request).get("offset"):
+            return 400, {"detail": "Bad request"}
+        return handler(request)
+
+    client, _ = make_client(failing_handler)
+    with BillingTransactionStore(tmp_path / "billing.sqlite3") as store:
+        with pytest.raises(requests.HTTPError):
+            store.sync(client, page_size=1)
+
+        # The first page was committed, but the watermark didn't move, so the
+        # next sync starts over.
+        assert [t.id for t in store.query()] == ["t-1"]
+        assert store.watermark is None
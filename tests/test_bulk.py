@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+from tests.conftest import FakeAdapter
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.bulk import (
+    BulkItemResult,
+    arun_bulk,
+    delete_virtual_machines,
+    run_bulk,
+    set_vm_power_status,
+)
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+
+def test_run_bulk_collects_results_and_errors() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    progress: list[tuple[str, int, int]] = []
+
+    def operation(resource_id: str) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        try:
+            if resource_id == "vm-3":
+                raise ValueError(resource_id)
+            return resource_id.upper()
+        finally:
+            with lock:
+                active -= 1
+
+    def on_progress(item: BulkItemResult[str], done: int, total: int) -> None:
+        progress.append((item.id, done, total))
+
+    ids = [f"vm-{i}" for i in range(20)]
+    result = run_bulk(operation, ids, max_workers=4, progress=on_progress)
+
+    assert [item.id for item in result.items] == ids
+    assert [item.id for item in result.failed] == ["vm-3"]
+    assert isinstance(result.failed[0].error, ValueError)
+    assert result.items[0].result == "VM-0"
+    assert not result.ok
+    assert peak <= 4
+    assert [done for _, done, _ in progress] == list(range(1, 21))
+
+
+def test_run_bulk_stops_on_failure() -> None:
+    def operation(resource_id: str) -> None:
+        if resource_id == "vm-0":
+            raise ValueError(resource_id)
+
+    ids = [f"vm-{i}" for i in range(10)]
+    result = run_bulk(operation, ids, max_workers=2, stop_on_failure=True)
+
+    assert [item.id for item in result.failed] == ["vm-0"]
+    assert len(result.items) + len(result.skipped) == 10
+    assert len(result.items) <= 3
+
+
+def test_arun_bulk_stops_on_failure() -> None:
+    async def operation(resource_id: str) -> str:
+        await asyncio.sleep(0)
+        if resource_id == "vm-1":
+            raise ValueError(resource_id)
+        return resource_id
+
+    ids = [f"vm-{i}" for i in range(10)]
+    result = asyncio.run(arun_bulk(operation, ids, max_workers=2, stop_on_failure=True))
+
+    assert [item.id for item in result.failed] == ["vm-1"]
+    assert result.items[0].result == "vm-0"
+    assert result.skipped
+
+
+def test_client_helpers(make_client: MakeClient) -> None:
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if request.url and request.url.endswith("vm-2"):
+            return 404, {"detail": "Not found"}
+        if request.method == "DELETE":
+            return 200, None
+        return 200, {"status": "stopped"}
+
+    client, adapter = make_client(handler)
+
+    stopped = set_vm_power_status(client, ["vm-1", "vm-3"], "stopped")
+    deleted = delete_virtual_machines(client, ["vm-1", "vm-2"])
+
+    assert stopped.ok
+    assert [item.id for item in deleted.failed] == ["vm-2"]
+    assert len(adapter.requests) == 4
@@ -0,0 +1,80 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+from tests.conftest import FakeAdapter
+from voltage_park_sdk import ResponseCache, VoltageParkClient
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+ORGANIZATION = {
+    "id": "org-1",
+    "name": "Test Org",
+    "billing_notification_target_emails": [],
+}
+HOURLY_RATE = {"rate_hourly": "12.50"}
+
+
+def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+    if request.url and request.url.endswith("billing/hourly-rate"):
+        return 200, HOURLY_RATE
+    return 200, ORGANIZATION
+
+
+def test_cached_endpoints_hit_the_api_once(make_client: MakeClient) -> None:
+    cache = ResponseCache()
+    client, adapter = make_client(handler, cache=cache)
+
+    for _ in range(5):
+        assert client.get_billing_hourly_rate().rate_hourly == "12.50"
+
+    assert len(adapter.requests) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (4, 1)
+
+
+def test_uncached_endpoints_always_hit_the_api(make_client: MakeClient) -> None:
+    client, adapter = make_client(handler, cache=ResponseCache(ttls={}))
+
+    client.get_organization()
+    client.get_organization()
+
+    assert len(adapter.requests) == 2
+
+
+def test_writes_invalidate_the_resource_family(make_client: MakeClient) -> None:
+    cache = ResponseCache()
+    client, adapter = make_client(handler, cache=cache)
+
+    client.get_organization()
+    client.get_billing_hourly_rate()
+    client.patch_organization(billing_notification_target_emails=[])
+    client.get_organization()
+    client.get_billing_hourly_rate()
+
+    # The organization was fetched again, but the billing rate wasn't.
+    assert [r.method for r in adapter.requests] == ["GET", "GET", "PATCH", "GET"]
+    assert cache.stats().invalidations == 1
+
+
+def test_entries_expire() -> None:
+    cache = ResponseCache()
+    cache.set("key", b"value", ttl=0.01)
+
+    assert cache.get("key") == b"value"
+    time.sleep(0.02)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", b"a", ttl=60)
+    cache.set("b", b"b", ttl=60)
+    cache.get("a")
+    cache.set("c", b"c", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a"
+    assert cache.stats().evictions == 1
@@ -0,0 +1,183 @@
+import json
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import requests
+from click.testing import CliRunner
+
+from tests.conftest import FakeAdapter, list_page, request_params, virtual_machine
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.cli import main
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+
+def vm_handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+    if (request.url or "").endswith("/power-status"):
+        return 200, request_params(request)
+    vms = [virtual_machine("vm-1", tags=["a", "b"]), virtual_machine("vm-2")]
+    return 200, list_page(vms, request)
+
+
+def test_vm_ls_ndjson(make_client: MakeClient) -> None:
+    client, _ = make_client(vm_handler)
+
+    result = CliRunner().invoke(
+        main, ["-o", "ndjson", "vm", "ls"], obj={"client": client}
+    )
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [record["id"] for record in records] == ["vm-1", "vm-2"]
+
+
+def test_vm_ls_table(make_client: MakeClient) -> None:
+    client, _ = make_client(vm_handler)
+
+    result = CliRunner().invoke(main, ["vm", "ls"], obj={"client": client})
+
+    header, first, _ = result.output.splitlines()
+    assert header.split() == [
+        "ID",
+        "NAME",
+        "STATUS",
+        "TYPE",
+        "PUBLIC_IP",
+        "HOSTNODE_ID",
+        "TAGS",
+    ]
+    assert first.split()[0] == "vm-1"
+    assert first.split()[-1] == "a,b"
+
+
+def test_vm_power(make_client: MakeClient) -> None:
+    client, adapter = make_client(vm_handler)
+
+    result = CliRunner().invoke(
+        main, ["vm", "power", "vm-1", "stopped"], obj={"client": client}
+    )
+
+    assert result.exit_code == 0, result.output
+    assert adapter.requests[0].method == "PUT"
+
+
+def test_rm_asks_for_confirmation(make_client: MakeClient) -> None:
+    client, adapter = make_client(lambda _: (204, None))
+
+    result = CliRunner().invoke(
+        main, ["vm", "rm", "vm-1"], input="n\n", obj={"client": client}
+    )
+    assert result.exit_code == 1
+    assert "Delete virtual machine vm-1?" in result.output
+    assert adapter.requests == []
+
+    for args in (["vm", "rm", "vm-1", "--yes"], ["bm", "rm", "bm-1", "-y"]):
+        result = CliRunner().invoke(main, args, obj={"client": client})
+        assert result.exit_code == 0, result.output
+    assert [r.method for r in adapter.requests] == ["DELETE", "DELETE"]
+
+
+def test_api_errors_are_reported(make_client: MakeClient) -> None:
+    client, _ = make_client(lambda _: (404, {"detail": "Not found"}))
+
+    result = CliRunner().invoke(main, ["vm", "show", "vm-1"], obj={"client": client})
+
+    assert result.exit_code == 1
+    assert result.output == "Error: 404: Not found\n"
+
+
+def create_handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+    url = request.url or ""
+    if url.endswith("virtual-machines/instant"):
+        return 200, {"vm_id": "vm-9"}
+    if url.endswith("bare-metal/"):
+        return 200, {"rental_id": "bm-9", "warning": None}
+    if url.endswith("validate/cloudinit"):
+        return 200, {"error": True, "message": "bad runcmd"}
+    return 204, None
+
+
+def test_create_commands(make_client: MakeClient, tmp_path: Path) -> None:
+    client, adapter = make_client(create_handler)
+    cloud_init = tmp_path / "cloud-init.json"
+    cloud_init.write_text('{"runcmd": ["nvidia-smi"]}')
+
+    result = CliRunner().invoke(
+        main,
+        [
+            *("-o", "ndjson", "vm", "create", "preset-1", "train", "--tag", "a"),
+            *("--org-ssh-key", "key-1", "--cloud-init", str(cloud_init)),
+        ],
+        obj={"client": client},
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == {"vm_id": "vm-9"}
+    params = request_params(adapter.requests[-1])
+    assert params["tags"] == ["a"]
+    assert params["organization_ssh_keys"] == {
+        "mode": "selective",
+        "ssh_key_ids": ["key-1"],
+    }
+    assert params["cloud_init"]["runcmd"] == ["nvidia-smi"]
+
+    result = CliRunner().invoke(
+        main,
+        ["bm", "create", "loc-1", "8", "train", "--network", "infiniband"],
+        obj={"client": client},
+    )
+    assert result.exit_code == 0, result.output
+    params = request_params(adapter.requests[-1])
+    assert (params["gpu_count"], params["network_type"]) == (8, "infiniband")
+
+
+def test_validate_cloud_init_fails_on_errors(make_client: MakeClient) -> None:
+    client, adapter = make_client(create_handler)
+
+    result = CliRunner().invoke(
+        main,
+        ["-o", "ndjson", "validate", "cloud-init", "vm", "-"],
+        input="#cloud-config\n",
+        obj={"client": client},
+    )
+
+    assert result.exit_code == 1
+    assert json.loads(result.output)["message"] == "bad runcmd"
+    assert request_params(adapter.requests[0]) == {
+        "type": "vm",
+        "content": "#cloud-config\n",
+    }
+
+
+def test_missing_token() -> None:
+    result = CliRunner().invoke(main, ["vm", "ls"], env={"VOLTAGE_PARK_TOKEN": ""})
+
+    assert result.exit_code == 2
+    assert "VOLTAGE_PARK_TOKEN" in result.output
+
+
+def test_cli_imports_lazily() -> None:
+    code = (
+        "import sys, voltage_park_sdk.cli; "
+        "print(sorted({'requests', 'httpx', 'pydantic'} & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_aborting_does_not_import_requests() -> None:
+    code = (
+        "import sys; from click.testing import CliRunner; "
+        "from voltage_park_sdk.cli import main; "
+        "CliRunner().invoke(main, ['storage', 'rm', 'vol-1'], input='n', "
+        "obj={'token': 'test-token'}); "
+        "print('requests' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,94 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import requests
+from pydantic import ValidationError
+
+from tests.conftest import FakeAdapter, Handler
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.base import _type_adapter
+from voltage_park_sdk.datamodel.organization import Organization
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+ORGANIZATION = {
+    "id": "org-1",
+    "name": "Test Org",
+    "billing_notification_target_emails": ["billing@example.com"],
+}
+
+
+def organization_handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+    return 200, ORGANIZATION
+
+
+def test_requests_share_one_session(make_client: MakeClient) -> None:
+    client, adapter = make_client(organization_handler)
+
+    for _ in range(3):
+        assert client.get_organization().id == "org-1"
+
+    assert len(adapter.requests) == 3
+    assert all(
+        r.headers["Authorization"] == "Bearer test-token" for r in adapter.requests
+    )
+
+
+def test_headers_are_built_once() -> None:
+    client = VoltageParkClient(token="test-token")
+
+    assert client._headers("get") is client._headers("get")
+    overridden = client._headers("get", Accept="application/json")
+    assert overridden["Accept"] == "application/json"
+    assert client._headers("get")["Accept"] == "*/*"
+
+
+def test_timeout_is_configurable(make_client: MakeClient) -> None:
+    timeouts: list[Any] = []
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        return 200, ORGANIZATION
+
+    client, adapter = make_client(handler, timeout=(1.5, 30))
+    original_send = adapter.send
+
+    def send(request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        timeouts.append(kwargs.get("timeout"))
+        return original_send(request, **kwargs)
+
+    adapter.send = send  # type: ignore[method-assign]
+    client.get_organization()
+
+    assert timeouts == [(1.5, 30)]
+
+
+def test_errors_are_raised(make_client: MakeClient) -> None:
+    handler: Handler = lambda request: (404, {"detail": "Not found"})  # noqa: E731
+    client, _ = make_client(handler)
+
+    with pytest.raises(requests.HTTPError) as exc_info:
+        client.get_organization()
+
+    assert exc_info.value.response.status_code == 404
+
+
+def test_invalid_responses_are_reported(
+    make_client: MakeClient, capsys: pytest.CaptureFixture[str]
+) -> None:
+    client, _ = make_client(lambda request: (200, {"id": "org-1"}))
+
+    with pytest.raises(ValidationError):
+        client.get_organization()
+
+    assert "Raw response: {'id': 'org-1'}" in capsys.readouterr().out
+
+
+def test_type_adapters_are_reused(make_client: MakeClient) -> None:
+    client, _ = make_client(organization_handler)
+
+    client.get_organization()
+    adapter = _type_adapter(Organization)
+    client.get_organization()
+
+    assert _type_adapter(Organization) is adapter
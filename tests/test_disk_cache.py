@@ -0,0 +1,55 @@
+import math
+import sqlite3
+import time
+from pathlib import Path
+
+from voltage_park_sdk import DiskCache
+from voltage_park_sdk.cache import cache_key, is_immutable
+
+REPORT = "billing/reports/2020/1/transactions"
+
+
+def test_entries_are_shared_between_instances(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    writer = DiskCache(path)
+    reader = DiskCache(path)
+    key = cache_key("token", "organization", {})
+
+    writer.set(key, b'{"id": "org-1"}', ttl=60)
+
+    assert reader.get(key) == b'{"id": "org-1"}'
+    assert reader.stats().hits == 1
+
+
+def test_entries_are_compressed(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = DiskCache(path)
+    value = b'{"results": []}' * 1000
+    cache.set(cache_key("token", "bare-metal/locations/", {}), value, ttl=60)
+
+    (stored,) = sqlite3.connect(path).execute("SELECT value FROM responses").fetchone()
+    assert len(stored) < len(value) / 10
+
+
+def test_entries_expire(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+    key = cache_key("token", "organization", {})
+    cache.set(key, b"{}", ttl=0.01)
+
+    time.sleep(0.02)
+
+    assert cache.get(key) is None
+    assert cache.prune() == 1
+
+
+def test_closed_months_are_cached_forever(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+
+    assert is_immutable(REPORT)
+    assert not is_immutable("billing/reports/2999/1/transactions")
+    assert cache.ttl_for(REPORT) == math.inf
+
+    key = cache_key("token", REPORT, {})
+    cache.set(key, b"{}", ttl=math.inf)
+    assert cache.invalidate("billing") == 0
+    assert cache.get(key) == b"{}"
@@ -0,0 +1,138 @@
+from collections.abc import Iterator
+
+import pytest
+import requests
+
+from voltage_park_sdk import RetryPolicy, VoltageParkClient
+from voltage_park_sdk.testing import payloads
+from voltage_park_sdk.testing.server import FakeVoltageParkAPI
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_760_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def api(clock: Clock) -> Iterator[FakeVoltageParkAPI]:
+    with FakeVoltageParkAPI(clock=clock, billing_interval=60) as api:
+        yield api
+
+
+@pytest.fixture
+def client(api: FakeVoltageParkAPI) -> Iterator[VoltageParkClient]:
+    retry = RetryPolicy(backoff_factor=0)
+    with VoltageParkClient(token="test-token", api_url=api.url, retry=retry) as client:
+        yield client
+
+
+def test_virtual_machine_lifecycle(
+    api: FakeVoltageParkAPI, client: VoltageParkClient, clock: Clock
+) -> None:
+    preset = client.get_virtual_machine_locations().results[0].available_presets[0]
+    kwargs = payloads.virtual_machine_deploy_kwargs(0) | {"config_id": preset.id}
+    vm_id = client.post_virtual_machine(**kwargs).vm_id
+    assert client.get_virtual_machine(vm_id).status == "Running"
+
+    client.put_vm_power_status(vm_id, "stopped")
+    assert client.get_virtual_machine(vm_id).status == "Stopped"
+    client.put_vm_power_status(vm_id, "started")
+    client.post_relocate_virtual_machine(vm_id)
+    assert client.get_virtual_machine(vm_id).status == "Relocating"
+    clock.now += api.provisioning_delay
+    assert client.get_virtual_machine(vm_id).status == "Running"
+
+    location = client.get_virtual_machine_locations().results[0]
+    assert location.available_presets[0].available_vms == preset.available_vms - 1
+    assert client.delete_virtual_machine(vm_id) is None
+    assert client.get_virtual_machine(vm_id).status == "Terminated"
+    with pytest.raises(requests.HTTPError) as e:
+        client.put_vm_power_status(vm_id, "started")
+    assert e.value.response.status_code == 409
+
+
+def test_baremetal_rental_provisioning_and_billing(
+    api: FakeVoltageParkAPI, client: VoltageParkClient, clock: Clock
+) -> None:
+    location = client.get_baremetal_locations().results[0]
+    kwargs = payloads.baremetal_rental_create_kwargs(0) | {
+        "location_id": location.id,
+        "gpu_count": location.specs_per_node.gpu_count * 2,
+        "network_type": "ethernet",
+    }
+    rental_id = client.post_baremetal_rental(**kwargs).rental_id
+    assert client.get_baremetal_rentals().results[0].status == "Pending"
+
+    clock.now += api.provisioning_delay
+    rental = client.get_baremetal_rentals().results[0]
+    assert rental.status == "Running"
+    assert rental.node_count == 2
+
+    clock.now += 3600
+    transactions = client.get_billing_transactions(types=["baremetal"]).results
+    assert [t.details.type for t in transactions] == ["baremetal_charge"]
+    assert transactions[0].total_amount == f"-{rental.rate_hourly}"
+
+    client.delete_baremetal_rental(rental_id)
+    clock.now += 3600
+    assert len(client.get_billing_transactions(types=["baremetal"]).results) == 1
+    assert client.get_billing_hourly_rate().rate_hourly == "0.00"
+
+
+def test_pagination(api: FakeVoltageParkAPI, client: VoltageParkClient) -> None:
+    api.max_page_size = 7
+    api.preload(virtual_machines=30)
+    page = client.get_virtual_machines(limit=50)
+    assert len(page.results) == 7
+    assert page.has_next
+    assert page.total_result_count == 30
+    assert len(list(client.iter_virtual_machines(page_size=7))) == 30
+
+
+def test_injected_errors_are_retried(api: FakeVoltageParkAPI) -> None:
+    api.error_rate = 0.3
+    retry = RetryPolicy(max_retries=20, backoff_factor=0)
+    with VoltageParkClient(token="test-token", api_url=api.url, retry=retry) as client:
+        for _ in range(20):
+            client.get_organization()
+    assert api.request_count > 20
+
+
+def test_rate_limit(clock: Clock) -> None:
+    api = FakeVoltageParkAPI(rate_limit=2, clock=clock)
+    assert api.handle("GET", "organization", {})[0] == 200
+    assert api.handle("GET", "organization", {})[0] == 200
+    status, _, headers = api.handle("GET", "organization", {})
+    assert status == 429
+    assert headers == {"Retry-After": "0.500"}
+    clock.now += 0.5
+    assert api.handle("GET", "organization", {})[0] == 200
+
+
+def test_rate_limit_below_one_request_per_second(clock: Clock) -> None:
+    api = FakeVoltageParkAPI(rate_limit=0.5, clock=clock)
+    assert api.handle("GET", "organization", {})[0] == 200
+    status, _, headers = api.handle("GET", "organization", {})
+    assert status == 429
+    assert headers == {"Retry-After": "2.000"}
+    clock.now += 2
+    assert api.handle("GET", "organization", {})[0] == 200
+    with pytest.raises(ValueError, match="rate_limit"):
+        FakeVoltageParkAPI(rate_limit=0)
+
+
+def test_errors(api: FakeVoltageParkAPI) -> None:
+    assert api.handle("GET", "virtual-machines/missing", {})[:2] == (
+        404,
+        {"detail": "Not found"},
+    )
+    assert api.handle("POST", "organization/ssh-keys", {"name": "key"})[0] == 422
+    assert api.handle("GET", "nowhere", {})[0] == 404
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+from tests.conftest import (
+    FakeAdapter,
+    baremetal_rental,
+    list_page,
+    virtual_machine,
+)
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.fleet import FleetIndex
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+
+def fleet_handler(
+    vms: list[dict[str, Any]], rentals: list[dict[str, Any]]
+) -> Callable[[requests.PreparedRequest], tuple[int, Any]]:
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if "bare-metal" in (request.url or ""):
+            return 200, list_page(rentals, request)
+        return 200, list_page(vms, request)
+
+    return handler
+
+
+def test_lookups(make_client: MakeClient) -> None:
+    vms = [
+        virtual_machine("vm-1", tags=["train"]),
+        virtual_machine("vm-22", hostnode_id="host-2", status="Stopped"),
+    ]
+    rentals = [baremetal_rental("bm-1", tags=["train"], power_status="Stopped")]
+    client, _ = make_client(fleet_handler(vms, rentals))
+    index = FleetIndex(client)
+    assert index.is_stale
+
+    diff = index.refresh()
+
+    assert sorted(diff.added) == ["bm-1", "vm-1", "vm-22"]
+    assert not index.is_stale
+    assert len(index) == 3
+    assert {r.id for r in index.by_tag("train")} == {"vm-1", "bm-1"}
+    assert [r.id for r in index.by_status("Stopped")] == ["vm-22"]
+    assert [r.id for r in index.by_power_status("Stopped")] == ["bm-1"]
+    assert [r.id for r in index.by_hostnode("host-2")] == ["vm-22"]
+    assert index.by_ip("10.1.0.1") == [index.get("bm-1")]
+    assert index.by_private_ip("10.0.0.4") == [index.get("vm-1")]
+    assert index.by_public_ip("10.0.0.4") == []
+    assert index.by_ip("192.0.2.1") == []
+    assert [vm.id for vm in index.virtual_machines()] == ["vm-1", "vm-22"]
+    assert [rental.id for rental in index.baremetal_rentals()] == ["bm-1"]
+
+
+def test_shared_addresses_match_every_resource(make_client: MakeClient) -> None:
+    vms = [
+        virtual_machine("vm-b", public_ip="203.0.113.7", internal_ip="10.0.0.1"),
+        virtual_machine("vm-a", public_ip="203.0.113.7", internal_ip="10.0.0.2"),
+        virtual_machine("vm-c", public_ip="203.0.113.8", internal_ip="203.0.113.7"),
+    ]
+    client, _ = make_client(fleet_handler(vms, []))
+    index = FleetIndex(client)
+    index.refresh()
+
+    assert [r.id for r in index.by_public_ip("203.0.113.7")] == ["vm-a", "vm-b"]
+    assert [r.id for r in index.by_private_ip("203.0.113.7")] == ["vm-c"]
+    assert [r.id for r in index.by_ip("203.0.113.7")] == ["vm-a", "vm-b", "vm-c"]
+
+
+def test_refresh_applies_only_changes(make_client: MakeClient) -> None:
+    vms = [virtual_machine("vm-1", tags=["a"]), virtual_machine("vm-2")]
+    client, _ = make_client(fleet_handler(vms, []))
+    index = FleetIndex(client)
+    index.refresh()
+    unchanged = index.get("vm-2")
+
+    vms[0] = virtual_machine("vm-1", tags=["b"])
+    del vms[1]
+    vms.append(virtual_machine("vm-3"))
+    diff = index.refresh()
+
+    assert (diff.added, diff.removed, diff.modified) == (["vm-3"], ["vm-2"], ["vm-1"])
+    assert index.by_tag("a") == []
+    assert [r.id for r in index.by_tag("b")] == ["vm-1"]
+    assert index.get("vm-2") is None
+    assert unchanged is not None
+    assert not index.refresh()
+
+
+def test_background_refresh_keeps_serving_on_errors(make_client: MakeClient) -> None:
+    refreshed = threading.Event()
+    fail = False
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if fail:
+            refreshed.set()
+            return 400, {"detail": "boom"}
+        return fleet_handler([virtual_machine("vm-1")], [])(request)
+
+    client, _ = make_client(handler)
+    index = FleetIndex(client, refresh_interval=0.01)
+    index.refresh()
+    fail = True
+    with index:
+        assert refreshed.wait(5)
+        assert index.get("vm-1") is not None
+    assert isinstance(index.last_error, requests.HTTPError)
+
+
+def test_stale_lookups_refresh_in_the_background(make_client: MakeClient) -> None:
+    vms = [virtual_machine("vm-1")]
+    client, adapter = make_client(fleet_handler(vms, []))
+    index = FleetIndex(client, refresh_interval=0.05)
+    index.refresh()
+    vms.append(virtual_machine("vm-2"))
+    assert index.get("vm-2") is None
+    sent = len(adapter.requests)
+
+    time.sleep(0.1)
+    assert index.is_stale
+    # The stale snapshot is served at once, and the lookup starts a refresh.
+    assert index.get("vm-2") is None
+    deadline = time.monotonic() + 5
+    while index.get("vm-2") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert index.get("vm-2") is not None
+    assert len(adapter.requests) > sent
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+# Each check runs in a fresh interpreter, as the test session has already
+# imported everything.
+
+
+def run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+# How many modules each import may load, including dependencies, with some
+# headroom for other dependency versions. Raise a budget only knowingly.
+IMPORTED_MODULES_BUDGETS = {
+    "voltage_park_sdk": 25,
+    "voltage_park_sdk.cli": 80,
+    "voltage_park_sdk.client": 425,
+    "voltage_park_sdk.async_client": 475,
+}
+
+
+def test_imported_modules_budget() -> None:
+    for module, budget in IMPORTED_MODULES_BUDGETS.items():
+        code = (
+            f"import sys; before = set(sys.modules); import {module}; "
+            "print(len(set(sys.modules) - before))"
+        )
+        assert int(run(code)) <= budget, module
+
+
+def test_package_import_is_lazy() -> None:
+    code = (
+        "import sys, voltage_park_sdk; "
+        "print(sorted({'requests', 'httpx', 'pydantic'} & set(sys.modules)))"
+    )
+    assert run(code) == "[]"
+
+
+def test_client_import_skips_async_dependencies() -> None:
+    code = (
+        "import sys, voltage_park_sdk.client; "
+        "print(sorted({'asyncio', 'httpx', 'concurrent.futures'} & set(sys.modules)))"
+    )
+    assert run(code) == "[]"
+
+
+def test_models_are_built_on_first_use() -> None:
+    code = """
+from pydantic import BaseModel
+import voltage_park_sdk.client
+from voltage_park_sdk.datamodel import baremetal, billing, virtual_machines
+
+def built():
+    return sorted(
+        name
+        for module in (baremetal, billing, virtual_machines)
+        for name, value in vars(module).items()
+        if isinstance(value, type)
+        and issubclass(value, BaseModel)
+        and value.__module__ == module.__name__
+        and value.__pydantic_complete__
+    )
+
+before = built()
+virtual_machines.VirtualMachines.model_validate(
+    {"results": [], "total_result_count": 0, "has_previous": False, "has_next": False}
+)
+print(before, "VirtualMachines" in built())
+"""
+    assert run(code) == "[] True"
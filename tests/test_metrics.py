@@ -0,0 +1,121 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import requests
+
+from tests.conftest import FakeAdapter
+from voltage_park_sdk import (
+    MetricsRegistry,
+    ResponseCache,
+    RetryPolicy,
+    VoltageParkClient,
+)
+from voltage_park_sdk.metrics import endpoint_template
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+ORGANIZATION = {
+    "id": "org-1",
+    "name": "Test Org",
+    "billing_notification_target_emails": [],
+}
+
+
+class RecordingHook:
+    def __init__(self) -> None:
+        self.events: list[tuple[Any, ...]] = []
+
+    def on_request(
+        self, method: str, endpoint: str, status: int | str, duration: float
+    ) -> None:
+        self.events.append(("request", method, endpoint, status))
+
+    def on_retry(self, method: str, endpoint: str) -> None:
+        self.events.append(("retry", method, endpoint))
+
+    def on_cache(self, endpoint: str, *, hit: bool) -> None:
+        self.events.append(("cache", endpoint, hit))
+
+
+def test_endpoint_template() -> None:
+    assert (
+        endpoint_template("virtual-machines/3f2a9c1e-0b7d-4e8a/power-status")
+        == "virtual-machines/{id}/power-status"
+    )
+    assert (
+        endpoint_template("billing/reports/2025/1/transactions")
+        == "billing/reports/{id}/{id}/transactions"
+    )
+    assert endpoint_template("bare-metal/locations/") == "bare-metal/locations/"
+
+
+def test_client_records_requests_retries_and_cache(make_client: MakeClient) -> None:
+    calls = 0
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return 503, {"detail": "Try again"}
+        if (request.url or "").endswith("vm-1"):
+            return 404, {"detail": "Not found"}
+        return 200, ORGANIZATION
+
+    metrics = MetricsRegistry()
+    hook = RecordingHook()
+    metrics.add_hook(hook)
+    client, _ = make_client(
+        handler,
+        metrics=metrics,
+        retry=RetryPolicy(backoff_factor=0),
+        cache=ResponseCache(),
+    )
+
+    client.get_organization()
+    client.get_organization()
+    with pytest.raises(requests.HTTPError):
+        client.delete_virtual_machine("vm-1")
+
+    assert metrics.request_count("organization") == 2
+    assert metrics.request_count("organization", status=503) == 1
+    assert metrics.request_count(method="delete", status=404) == 1
+    assert metrics.retry_count("organization") == 1
+    assert metrics.cache_count(hit=True) == 1
+    assert metrics.cache_count(hit=False) == 1
+    assert ("retry", "GET", "organization") in hook.events
+    assert ("request", "DELETE", "virtual-machines/{id}", 404) in hook.events
+
+
+def test_prometheus_exposition() -> None:
+    metrics = MetricsRegistry(buckets=[0.1, 1])
+    metrics.observe_request("get", "storage/vol-1", 200, 0.05)
+    metrics.observe_request("get", "storage/vol-2", 200, 0.5)
+    metrics.observe_cache("organization", hit=True)
+
+    text = metrics.to_prometheus()
+
+    assert (
+        'voltage_park_requests_total{endpoint="storage/{id}",method="GET",status="200"} 2'
+        in text
+    )
+    bucket = 'voltage_park_request_duration_seconds_bucket{endpoint="storage/{id}"'
+    assert f'{bucket},method="GET",le="0.1"}} 1' in text
+    assert f'{bucket},method="GET",le="+Inf"}} 2' in text
+    assert "# TYPE voltage_park_request_duration_seconds histogram" in text
+    assert (
+        'voltage_park_cache_lookups_total{endpoint="organization",result="hit"} 1'
+        in text
+    )
+
+
+def test_label_values_are_escaped() -> None:
+    metrics = MetricsRegistry()
+    metrics.observe_cache('odd\\"name\nhere', hit=False)
+
+    line = metrics.to_prometheus().splitlines()[-1]
+
+    assert line == (
+        'voltage_park_cache_lookups_total{endpoint="odd\\\\\\"name\\nhere",'
+        'result="miss"} 1'
+    )
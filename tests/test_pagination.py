@@ -0,0 +1,104 @@
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+import requests
+
+from tests.conftest import FakeAdapter, list_page
+from voltage_park_sdk import AsyncVoltageParkClient, VoltageParkClient
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+SSH_KEYS = [
+    {"id": f"key-{i}", "name": f"Key {i}", "content": f"ssh-ed25519 AAAA{i}"}
+    for i in range(25)
+]
+
+
+def ssh_keys_handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+    return 200, list_page(SSH_KEYS, request)
+
+
+def test_iter_yields_every_item_in_order(make_client: MakeClient) -> None:
+    client, adapter = make_client(ssh_keys_handler)
+
+    keys = [key.id for key in client.iter_ssh_keys(page_size=10)]
+
+    assert keys == [key["id"] for key in SSH_KEYS]
+    assert len(adapter.requests) == 3
+
+
+def test_iter_fetches_lazily(make_client: MakeClient) -> None:
+    client, adapter = make_client(ssh_keys_handler)
+
+    iterator = client.iter_ssh_keys(page_size=10)
+    first = next(iterator)
+
+    assert first.id == "key-0"
+    # The first page plus, at most, the prefetched second page.
+    assert len(adapter.requests) <= 2
+
+
+def test_async_iter_yields_every_item_in_order() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = json.loads(request.content)
+        offset, limit = params["offset"], params["limit"]
+        return httpx.Response(
+            200,
+            json={
+                "results": SSH_KEYS[offset : offset + limit],
+                "total_result_count": len(SSH_KEYS),
+                "has_previous": offset > 0,
+                "has_next": offset + limit < len(SSH_KEYS),
+            },
+        )
+
+    async def main() -> list[str]:
+        client = AsyncVoltageParkClient(token="test-token")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return [key.id async for key in client.iter_ssh_keys(page_size=7)]
+
+    assert asyncio.run(main()) == [key["id"] for key in SSH_KEYS]
+
+
+def test_fetch_all_keeps_server_order(make_client: MakeClient) -> None:
+    client, adapter = make_client(ssh_keys_handler)
+
+    keys = client.fetch_all(client.get_ssh_keys, page_size=4, max_concurrency=3)
+
+    assert [key.id for key in keys] == [key["id"] for key in SSH_KEYS]
+    assert len(adapter.requests) == 7
+
+
+def test_fetch_all_fills_gaps_when_server_caps_page_size(
+    make_client: MakeClient,
+) -> None:
+    calls = 0
+
+    def capped_handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal calls
+        calls += 1
+        page = list_page(SSH_KEYS, request)
+        # Only the first request is served in full, then cap at 3 items.
+        if calls > 1:
+            page["results"] = page["results"][:3]
+        return 200, page
+
+    client, _ = make_client(capped_handler)
+
+    keys = client.fetch_all(client.get_ssh_keys, page_size=10)
+
+    assert [key.id for key in keys] == [key["id"] for key in SSH_KEYS]
+
+
+def test_fetch_all_adapts_page_size(make_client: MakeClient) -> None:
+    client, adapter = make_client(ssh_keys_handler)
+
+    keys = client.fetch_all(client.get_ssh_keys, page_size=2, target_latency=60.0)
+
+    assert len(keys) == len(SSH_KEYS)
+    # A fast first page grows the page size enough to fetch the rest at once.
+    assert len(adapter.requests) == 2
@@ -0,0 +1,68 @@
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+from tests.conftest import FakeAdapter, request_params
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.datamodel.baremetal import BaremetalLocations, BaremetalRentals
+from voltage_park_sdk.datamodel.billing import (
+    BillingTransactionsResponse,
+    MonthlyBillingReport,
+)
+from voltage_park_sdk.datamodel.virtual_machines import (
+    VirtualMachineLocations,
+    VirtualMachines,
+)
+from voltage_park_sdk.testing import payloads
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+
+def test_list_responses_validate() -> None:
+    vms = VirtualMachines.model_validate(payloads.virtual_machines(50))
+    rentals = BaremetalRentals.model_validate(payloads.baremetal_rentals(50))
+    transactions = BillingTransactionsResponse.model_validate(
+        payloads.billing_transactions(50)
+    )
+    report = MonthlyBillingReport.model_validate(payloads.monthly_billing_report(50))
+
+    assert len(vms.results) == vms.total_result_count == 50
+    assert {r.status for r in rentals.results} == set(
+        payloads.BAREMETAL_RENTAL_STATUSES
+    )
+    assert {t.details.type for t in transactions.results} == set(
+        payloads.BILLING_DETAILS_TYPES
+    )
+    assert len(report.transactions) == 50
+
+    vm_locations = VirtualMachineLocations.model_validate(
+        payloads.virtual_machine_locations(3)
+    )
+    BaremetalLocations.model_validate(payloads.baremetal_locations(3))
+    assert all(location.available_presets for location in vm_locations.results)
+
+
+def test_payloads_are_deterministic() -> None:
+    assert payloads.virtual_machines(5) == payloads.virtual_machines(5)
+    assert payloads.virtual_machines(5) != payloads.virtual_machines(5, seed=1)
+    assert (
+        payloads.billing_transactions(10)["results"][:5]
+        == (payloads.billing_transactions(5)["results"])
+    )
+
+
+def test_create_kwargs_are_accepted_by_the_client(make_client: MakeClient) -> None:
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if request.path_url.endswith("instant"):
+            return 200, {"vm_id": "vm-1"}
+        return 200, {"rental_id": "rental-1"}
+
+    client, adapter = make_client(handler)
+
+    client.post_virtual_machine(**payloads.virtual_machine_deploy_kwargs(0))
+    client.post_baremetal_rental(**payloads.baremetal_rental_create_kwargs(0))
+
+    deploy, create = map(request_params, adapter.requests)
+    assert deploy["organization_ssh_keys"]["mode"] == "selective"
+    assert create["gpu_count"] % 8 == 0
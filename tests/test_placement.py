@@ -0,0 +1,134 @@
+from decimal import Decimal
+
+from tests.conftest import baremetal_location, vm_preset
+from voltage_park_sdk.datamodel.baremetal import BaremetalLocation
+from voltage_park_sdk.datamodel.virtual_machines import VirtualMachineLocation
+from voltage_park_sdk.placement import Offer, PlacementIndex
+
+
+def make_index() -> PlacementIndex:
+    vm_location = VirtualMachineLocation.model_validate(
+        {
+            "id": "vm-loc",
+            "available_presets": [
+                vm_preset("h100-1x", compute_rate_hourly="2.10"),
+                vm_preset(
+                    "h100-8x",
+                    resources={
+                        "gpus": {"h100-sxm5-80gb": {"count": 8}},
+                        "ram_gb": 1024,
+                        "storage_gb": 4096,
+                        "vcpu_count": 128,
+                    },
+                    compute_rate_hourly="16.80",
+                    storage_rate_hourly="0.10",
+                ),
+                vm_preset("sold-out", available_vms=0, compute_rate_hourly="0.10"),
+            ],
+        }
+    )
+    baremetal = BaremetalLocation.model_validate(
+        baremetal_location(
+            "bm-loc",
+            gpu_price_ethernet="1.90",
+            gpu_count_ethernet=32,
+            gpu_count_infiniband=0,
+        )
+    )
+    return PlacementIndex.from_locations([vm_location], [baremetal])
+
+
+def test_cheapest_single_gpu() -> None:
+    placement = make_index().cheapest(gpu_model="h100", gpu_count=1)
+
+    assert placement is not None
+    assert placement.offer.id == "h100-1x"
+    assert placement.hourly_price == Decimal("2.11")
+
+
+def test_bare_metal_nodes_add_up() -> None:
+    index = make_index()
+
+    placement = index.cheapest(gpu_model="h100", gpu_count=8)
+    assert placement is not None
+    assert (placement.offer.kind, placement.units) == ("baremetal", 1)
+    assert placement.hourly_price == Decimal("15.20")
+
+    placement = index.cheapest(gpu_count=20, ram_gb=4096)
+    assert placement is not None
+    assert (placement.units, placement.gpu_count) == (3, 24)
+
+    assert index.cheapest(gpu_count=40) is None
+    assert index.cheapest(gpu_count=8, network_type="infiniband") is None
+
+
+def test_filters_and_ordering() -> None:
+    index = make_index()
+
+    placements = index.find(gpu_count=8, kind="virtual_machine")
+    assert [p.offer.id for p in placements] == ["h100-8x"]
+    assert index.find(operating_system="Windows 10") == ()
+    prices = [p.hourly_price for p in index.find(gpu_count=1)]
+    assert prices == sorted(prices)
+    assert index.find(gpu_count=1) is index.find(gpu_count=1)
+
+
+def test_cpu_only_offers() -> None:
+    vm_location = VirtualMachineLocation.model_validate(
+        {
+            "id": "vm-loc",
+            "available_presets": [
+                vm_preset(
+                    "cpu-only",
+                    resources={
+                        "gpus": {},
+                        "ram_gb": 64,
+                        "storage_gb": 256,
+                        "vcpu_count": 32,
+                    },
+                    compute_rate_hourly="0.50",
+                )
+            ],
+        }
+    )
+    index = PlacementIndex.from_locations([vm_location])
+
+    placement = index.cheapest(vcpu_count=32)
+    assert placement is not None
+    assert (placement.offer.id, placement.offer.gpu_model) == ("cpu-only", None)
+    assert index.cheapest(gpu_model="h100", vcpu_count=32) is None
+    assert index.cheapest(gpu_count=1) is None
+
+
+def test_offers_without_a_resource_never_divide_by_zero() -> None:
+    offer = Offer(
+        kind="baremetal",
+        id="bm-loc",
+        location_id="bm-loc",
+        gpu_model="h100-sxm5-80gb",
+        gpu_count=8,
+        ram_gb=0,
+        vcpu_count=0,
+        storage_gb=0,
+        network_type="ethernet",
+        operating_system=None,
+        unit_price=Decimal("15.20"),
+        available=4,
+    )
+    index = PlacementIndex([offer])
+
+    assert index.cheapest(gpu_count=8, ram_gb=1) is None
+    placement = index.cheapest(gpu_count=16)
+    assert placement is not None
+    assert placement.units == 2
+
+
+def test_query_cache_is_bounded() -> None:
+    offers = [placement.offer for placement in make_index().find()]
+    index = PlacementIndex(offers, max_cached_queries=2)
+    first = index.find(gpu_count=1)
+    index.find(gpu_count=2)
+    assert index.find(gpu_count=1) is first
+    index.find(gpu_count=3)
+    index.find(gpu_count=4)
+    assert index.find(gpu_count=1) is not first
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+import pytest
+import requests
+
+from tests.conftest import FakeAdapter, list_page, virtual_machine
+from voltage_park_sdk import (
+    AsyncVoltageParkClient,
+    Profiler,
+    ResponseCache,
+    RetryPolicy,
+    VoltageParkClient,
+)
+from voltage_park_sdk.datamodel.virtual_machines import (
+    VirtualMachinePowerStatusPayload,
+)
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+ORGANIZATION = {
+    "id": "org-1",
+    "name": "Test Org",
+    "billing_notification_target_emails": [],
+}
+
+
+class OrganizationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        # The client sends its parameters as a JSON body, even on GET requests.
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(ORGANIZATION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OrganizationHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_calls_are_split_into_phases(make_client: MakeClient) -> None:
+    vms = [virtual_machine(f"vm-{i}") for i in range(3)]
+    profiler = Profiler()
+    client, _ = make_client(
+        lambda request: (200, list_page(vms, request)), profiler=profiler
+    )
+
+    client.get_virtual_machines()
+
+    (record,) = profiler.records
+    assert (record.method, record.endpoint, record.status) == (
+        "GET",
+        "virtual-machines/",
+        200,
+    )
+    assert record.attempts == 1
+    assert {"ttfb", "download", "decode", "validate"} <= set(record.phases)
+    assert sum(record.phases.values()) <= record.total
+
+
+def test_retries_and_payloads_are_profiled(make_client: MakeClient) -> None:
+    calls = 0
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return 503, {"detail": "Try again"}
+        return 200, {"status": "stopped"}
+
+    profiler = Profiler()
+    client, _ = make_client(
+        handler, profiler=profiler, retry=RetryPolicy(backoff_factor=0)
+    )
+
+    client.put_vm_power_status("3f2a9c1e", "stopped")
+
+    (record,) = profiler.records
+    assert (record.method, record.endpoint) == (
+        "PUT",
+        "virtual-machines/{id}/power-status",
+    )
+    assert record.attempts == 2
+    assert {"serialize", "backoff", "ttfb", "validate"} <= set(record.phases)
+
+
+def test_payload_dumping_counts_as_serialize(
+    make_client: MakeClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    dump = VirtualMachinePowerStatusPayload.model_dump
+
+    def slow_dump(self: Any, **kwargs: Any) -> dict[str, Any]:
+        time.sleep(0.02)
+        return dump(self, **kwargs)
+
+    monkeypatch.setattr(VirtualMachinePowerStatusPayload, "model_dump", slow_dump)
+    profiler = Profiler()
+    client, _ = make_client(lambda _: (200, {"status": "stopped"}), profiler=profiler)
+
+    client.put_vm_power_status("3f2a9c1e", "stopped")
+
+    (record,) = profiler.records
+    assert record.phases["serialize"] >= 0.02
+
+
+def test_cache_hits_are_flagged(make_client: MakeClient) -> None:
+    profiler = Profiler()
+    client, _ = make_client(
+        lambda request: (200, ORGANIZATION), profiler=profiler, cache=ResponseCache()
+    )
+
+    client.get_organization()
+    client.get_organization()
+
+    first, second = profiler.records
+    assert not first.cached
+    assert second.cached
+    assert "ttfb" not in second.phases
+
+
+def test_connections_are_timed(server_url: str) -> None:
+    profiler = Profiler()
+    with VoltageParkClient(token="test-token", profiler=profiler) as client:
+        client._api_url = server_url
+        client.get_organization()
+        client.get_organization()
+
+    first, second = profiler.records
+    assert first.phases["connect"] > 0
+    assert "connect" not in second.phases
+
+
+def test_summary_and_report() -> None:
+    profiler = Profiler()
+    for vm_id in ("vm-1", "vm-2"):
+        with profiler.record("get", f"virtual-machines/{vm_id}") as record:
+            time.sleep(0.005)
+            record.add("ttfb", 0.002)
+            record.add("validate", 0.001)
+
+    (summary,) = profiler.summary()
+    assert (summary.method, summary.endpoint, summary.calls) == (
+        "GET",
+        "virtual-machines/{id}",
+        2,
+    )
+    assert summary.phases["ttfb"] == pytest.approx(0.004)
+    assert 0 < summary.share("validate") <= 1
+    header, row = profiler.report().splitlines()
+    assert header.split()[:3] == ["ENDPOINT", "CALLS", "TOTAL"]
+    assert row.startswith("GET virtual-machines/{id}")
+
+
+def test_async_client_is_profiled() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=ORGANIZATION)
+
+    async def main() -> None:
+        client = AsyncVoltageParkClient(token="test-token", profiler=profiler)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            await asyncio.gather(client.get_organization(), client.get("organization"))
+
+    profiler = Profiler()
+    asyncio.run(main())
+
+    records = profiler.records
+    assert len(records) == 2
+    assert all({"ttfb", "download", "decode"} <= set(r.phases) for r in records)
+    assert sum("validate" in r.phases for r in records) == 1
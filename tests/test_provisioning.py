@@ -0,0 +1,118 @@
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import requests
+
+from tests.conftest import (
+    FakeAdapter,
+    baremetal_location,
+    list_page,
+    request_params,
+    vm_preset,
+)
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.provisioning import (
+    InsufficientCapacityError,
+    check_baremetal_capacity,
+    provision_baremetal_rentals,
+    provision_virtual_machines,
+)
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+
+def provisioning_handler() -> Callable[[requests.PreparedRequest], tuple[int, Any]]:
+    lock = threading.Lock()
+    created = 0
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal created
+        url = request.url or ""
+        if url.endswith("bare-metal/locations/"):
+            return 200, list_page([baremetal_location("loc-1")], request)
+        if url.endswith("instant/locations/"):
+            location = {"id": "loc-1", "available_presets": [vm_preset("preset-1")]}
+            return 200, list_page([location], request)
+        if request_params(request)["name"] == "broken":
+            return 400, {"detail": "Bad request"}
+        with lock:
+            created += 1
+            new_id = f"new-{created}"
+        if url.endswith("bare-metal/"):
+            return 200, {"rental_id": new_id, "warning": None}
+        return 200, {"vm_id": new_id}
+
+    return handler
+
+
+def rental(name: str, gpu_count: int, network_type: str = "ethernet") -> dict[str, Any]:
+    return {
+        "location_id": "loc-1",
+        "gpu_count": gpu_count,
+        "name": name,
+        "network_type": network_type,
+    }
+
+
+def test_check_baremetal_capacity(make_client: MakeClient) -> None:
+    client, _ = make_client(provisioning_handler())
+    specs = [rental("a", 8), rental("b", 8), rental("c", 16, "infiniband")]
+
+    [shortfall] = check_baremetal_capacity(client, specs)
+
+    assert shortfall.resource == "loc-1 (infiniband)"
+    assert (shortfall.requested, shortfall.available) == (16, 8)
+
+
+def test_provision_raises_before_submitting(make_client: MakeClient) -> None:
+    client, adapter = make_client(provisioning_handler())
+
+    with pytest.raises(InsufficientCapacityError):
+        provision_baremetal_rentals(client, [rental("a", 16), rental("b", 8)])
+
+    assert all(request.method == "GET" for request in adapter.requests)
+
+
+def test_provision_yields_ids_and_errors(make_client: MakeClient) -> None:
+    client, _ = make_client(provisioning_handler())
+    specs = [rental("a", 8), rental("broken", 4), rental("c", 4)]
+
+    results = sorted(provision_baremetal_rentals(client, specs), key=lambda r: r.index)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert {r.id for r in results if r.ok} == {"new-1", "new-2"}
+    assert isinstance(results[1].error, requests.HTTPError)
+
+
+def test_provision_submits_before_iteration(make_client: MakeClient) -> None:
+    posted = threading.Event()
+    handler = provisioning_handler()
+
+    def recording_handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if request.method == "POST":
+            posted.set()
+        return handler(request)
+
+    client, adapter = make_client(recording_handler)
+
+    results = provision_baremetal_rentals(client, [rental("a", 8)])
+
+    assert posted.wait(5)
+    assert [r.id for r in results] == ["new-1"]
+    assert sum(request.method == "POST" for request in adapter.requests) == 1
+
+
+def test_provision_partial(make_client: MakeClient) -> None:
+    client, adapter = make_client(provisioning_handler())
+    specs = [
+        {"config_id": "preset-1", "name": f"vm-{i}", "password": None} for i in range(3)
+    ]
+
+    results = list(provision_virtual_machines(client, specs, allow_partial=True))
+
+    assert isinstance(results[0].error, InsufficientCapacityError)
+    assert results[0].index == 2
+    assert sorted(r.id for r in results[1:] if r.id) == ["new-1", "new-2"]
+    assert sum(request.method == "POST" for request in adapter.requests) == 2
@@ -0,0 +1,145 @@
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+
+from tests.conftest import FakeAdapter, list_page, request_params, virtual_machine
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.recording import (
+    Cassette,
+    Interaction,
+    RecordingAdapter,
+    ReplayAdapter,
+    UnrecordedRequestError,
+    replay_traffic,
+)
+from voltage_park_sdk.retry import RetryPolicy
+
+VMS = [virtual_machine(f"vm-{i}") for i in range(3)]
+
+
+def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+    if request.path_url.endswith("virtual-machines/"):
+        return 200, list_page(VMS, request)
+    if request.path_url.endswith("power-status"):
+        return 200, request_params(request)
+    return 404, {"detail": "Not found"}
+
+
+def record() -> Cassette:
+    adapter = RecordingAdapter(adapter=FakeAdapter(handler))
+    with VoltageParkClient(token="test-token", transport=adapter) as client:
+        client.get_virtual_machines(limit=2)
+        client.get_virtual_machines(limit=2, offset=2)
+        client.put_vm_power_status("vm-1", "stopped")
+        with pytest.raises(requests.HTTPError):
+            client.get_virtual_machine("missing")
+    return adapter.cassette
+
+
+def test_record_and_save(tmp_path: Path) -> None:
+    cassette = record()
+    path = tmp_path / "traffic.jsonl.gz"
+    cassette.save(path)
+    loaded = Cassette.load(path)
+
+    assert loaded.interactions == cassette.interactions
+    first = loaded.interactions[0]
+    assert (first.method, first.path) == ("GET", "/api/v1/virtual-machines/")
+    assert first.body == '{"limit": 2}'
+    assert first.headers == {"Content-Type": "application/json"}
+    assert [i.status for i in loaded.interactions] == [200, 200, 200, 404]
+    assert b"test-token" not in path.read_bytes()
+
+
+def test_replay_without_network() -> None:
+    cassette = record()
+    transport = ReplayAdapter(cassette, speed=None)
+    with VoltageParkClient(token="other-token", transport=transport) as client:
+        assert [vm.id for vm in client.iter_virtual_machines(page_size=2)] == [
+            "vm-0",
+            "vm-1",
+            "vm-2",
+        ]
+        assert [vm.id for vm in client.stream_virtual_machines(limit=2)] == [
+            "vm-0",
+            "vm-1",
+        ]
+        assert client.put_vm_power_status("vm-1", "stopped").status == "stopped"
+        # Matched on the path alone when the body differs.
+        assert client.put_vm_power_status("vm-1", "started").status == "stopped"
+        with pytest.raises(requests.HTTPError):
+            client.get_virtual_machine("missing")
+        with pytest.raises(UnrecordedRequestError):
+            client.get_organization()
+
+
+def test_replay_speed(monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    interaction = Interaction(
+        method="GET",
+        path="/api/v1/organization",
+        body="{}",
+        status=200,
+        headers={"Content-Type": "application/json"},
+        content='{"id": "org-1", "name": "Org", "billing_notification_target_emails": []}',
+        start=0.0,
+        duration=0.2,
+    )
+    for speed, expected in ((1.0, [0.2]), (4.0, [0.05]), (None, [])):
+        sleeps.clear()
+        transport = ReplayAdapter(Cassette([interaction]), speed=speed)
+        with VoltageParkClient(token="test-token", transport=transport) as client:
+            assert client.get_organization().id == "org-1"
+        assert sleeps == pytest.approx(expected)
+
+    with pytest.raises(ValueError, match="speed"):
+        ReplayAdapter(Cassette(), speed=0)
+
+
+def test_replay_traffic() -> None:
+    cassette = record()
+    transport = ReplayAdapter(cassette, speed=None)
+    with VoltageParkClient(token="test-token", transport=transport) as client:
+        stats = replay_traffic(client, cassette, speed=None, max_workers=2)
+
+    assert len(stats.latencies) == 4
+    assert stats.errors == 1
+    assert stats.throughput > 0
+    assert stats.percentile(50) <= stats.percentile(100) == max(stats.latencies)
+
+
+def test_replay_traffic_skips_retries() -> None:
+    statuses = iter([429, 200])
+    adapter = RecordingAdapter(
+        adapter=FakeAdapter(lambda request: (next(statuses), list_page(VMS, request)))
+    )
+    retry = RetryPolicy(backoff_factor=0, respect_retry_after=False)
+    with VoltageParkClient(
+        token="test-token", transport=adapter, retry=retry
+    ) as client:
+        client.get_virtual_machines()
+    cassette = adapter.cassette
+    assert [i.attempt for i in cassette.interactions] == [0, 1]
+
+    transport = ReplayAdapter(cassette, speed=None)
+    with VoltageParkClient(
+        token="test-token", transport=transport, retry=retry
+    ) as client:
+        stats = replay_traffic(client, cassette, speed=None)
+
+    assert len(stats.latencies) == 1
+    assert stats.errors == 0
+
+
+def test_replay_traffic_counts_every_failure() -> None:
+    cassette = record()
+    transport = ReplayAdapter(Cassette(), speed=None)
+    with VoltageParkClient(token="test-token", transport=transport) as client:
+        stats = replay_traffic(client, cassette, speed=None)
+
+    assert stats.errors == len(cassette)
+    assert all(latency > 0 for latency in stats.latencies)
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from typing import Any
+
+import pytest
+import requests
+
+from tests.conftest import FakeAdapter
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.retry import RateLimiter, RetryPolicy, parse_retry_after
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+NO_WAIT = RetryPolicy(backoff_factor=0, respect_retry_after=False)
+ORGANIZATION = {
+    "id": "org-1",
+    "name": "Test Org",
+    "billing_notification_target_emails": [],
+}
+
+
+def flaky_handler(
+    failures: int, status: int = 503
+) -> Callable[[requests.PreparedRequest], tuple[int, Any]]:
+    calls = 0
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal calls
+        calls += 1
+        if calls <= failures:
+            return status, {"detail": "Try again"}
+        return 200, ORGANIZATION
+
+    return handler
+
+
+def test_idempotent_requests_are_retried(make_client: MakeClient) -> None:
+    client, adapter = make_client(flaky_handler(2), retry=NO_WAIT)
+
+    assert client.get_organization().id == "org-1"
+    assert len(adapter.requests) == 3
+
+
+def test_retries_are_bounded(make_client: MakeClient) -> None:
+    client, adapter = make_client(flaky_handler(10, status=429), retry=NO_WAIT)
+
+    with pytest.raises(requests.HTTPError):
+        client.get_organization()
+    assert len(adapter.requests) == NO_WAIT.max_retries + 1
+
+
+def test_non_idempotent_requests_are_not_retried(make_client: MakeClient) -> None:
+    client, adapter = make_client(flaky_handler(1), retry=NO_WAIT)
+
+    with pytest.raises(requests.HTTPError):
+        client.post_ssh_key(name="key", content="ssh-ed25519 AAAA")
+    assert len(adapter.requests) == 1
+
+
+def test_throttled_requests_are_retried_for_every_operation(
+    make_client: MakeClient,
+) -> None:
+    client, adapter = make_client(flaky_handler(1, status=429), retry=NO_WAIT)
+
+    assert client.post("organization/ssh-keys", name="key")["id"] == "org-1"
+    assert len(adapter.requests) == 2
+
+
+def test_client_errors_are_not_retried(make_client: MakeClient) -> None:
+    client, adapter = make_client(flaky_handler(1, status=404), retry=NO_WAIT)
+
+    with pytest.raises(requests.HTTPError):
+        client.get_organization()
+    assert len(adapter.requests) == 1
+
+
+def test_retry_after_takes_precedence() -> None:
+    policy = RetryPolicy(backoff_factor=0)
+
+    assert policy.delay(attempt=0, retry_after="2") == 2
+    retry_at = datetime.now(UTC) + timedelta(seconds=30)
+    assert 25 < policy.delay(attempt=0, retry_after=format_datetime(retry_at)) <= 30
+    assert parse_retry_after("not a date") is None
+
+
+def test_backoff_is_capped() -> None:
+    policy = RetryPolicy(backoff_factor=1, max_backoff=4)
+
+    assert all(0 <= policy.delay(attempt) <= 4 for attempt in range(10))
+    assert policy.delay(attempt=0, retry_after="86400") == 4
+
+
+def test_non_finite_retry_after_is_ignored() -> None:
+    policy = RetryPolicy(backoff_factor=1, max_backoff=4)
+
+    for value in ("inf", "-inf", "nan"):
+        assert parse_retry_after(value) is None
+        assert 0 <= policy.delay(attempt=0, retry_after=value) <= 1
+
+
+def test_rate_limiter_is_shared_between_threads() -> None:
+    limiter = RateLimiter(rate=200, burst=5)
+    start = time.monotonic()
+
+    def worker() -> None:
+        for _ in range(5):
+            limiter.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 25 requests with a burst of 5 need 20 refills at 200/s.
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limiter_is_shared_per_token() -> None:
+    first = RateLimiter.for_token("token-a", rate=10)
+
+    assert RateLimiter.for_token("token-a", rate=10) is first
+    assert RateLimiter.for_token("token-b", rate=10) is not first
+    with pytest.raises(ValueError, match="rate=10"):
+        RateLimiter.for_token("token-a", rate=20)
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+import pytest
+import requests
+from pydantic import TypeAdapter
+
+from tests.conftest import FakeAdapter
+from tests.test_analytics import TRANSACTIONS
+from voltage_park_sdk import AsyncVoltageParkClient, VoltageParkClient
+from voltage_park_sdk.streaming import ListStreamParser, StreamedList
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+REPORT = {
+    "balance_at_period_start": "1000.00",
+    "transactions": TRANSACTIONS,
+    "balance_at_period_end": "999.50",
+    "balance_delta_in_period": "-0.50",
+}
+
+
+def parse_in_chunks(body: bytes, size: int, list_key: str) -> ListStreamParser:
+    parser = ListStreamParser(list_key)
+    items: list[Any] = []
+    for start in range(0, len(body), size):
+        items += parser.feed(body[start : start + size])
+    items += parser.feed(b"", final=True)
+    parser.envelope["items"] = items
+    return parser
+
+
+@pytest.mark.parametrize("size", [1, 7, 1 << 16])
+def test_parser_handles_any_chunking(size: int) -> None:
+    body = json.dumps(
+        {
+            "name": "Zoë",
+            "results": [{"id": 1}, {"id": "two"}, {"nested": [1, {"x": "]"}]}],
+            "total_result_count": 12345,
+            "has_next": False,
+        }
+    ).encode()
+
+    parser = parse_in_chunks(body, size, "results")
+
+    assert parser.envelope == {
+        "name": "Zoë",
+        "total_result_count": 12345,
+        "has_next": False,
+        "items": [{"id": 1}, {"id": "two"}, {"nested": [1, {"x": "]"}]}],
+    }
+
+
+def test_parser_rejects_truncated_bodies() -> None:
+    parser = ListStreamParser("results")
+    parser.feed(b'{"results": [{"id": 1}, {"id"')
+
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed(b"", final=True)
+
+
+def test_stream_monthly_billing_report(make_client: MakeClient) -> None:
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        return 200, REPORT
+
+    client, _ = make_client(handler)
+
+    stream = client.stream_monthly_billing_report(2025, 1)
+    ids = []
+    for transaction in stream:
+        ids.append(transaction.id)
+        if len(ids) == 1:
+            # Fields before the list are available straight away.
+            assert stream.envelope["balance_at_period_start"] == "1000.00"
+
+    assert ids == [t["id"] for t in TRANSACTIONS]
+    assert stream.envelope["balance_at_period_end"] == "999.50"
+
+
+def test_async_stream_billing_transactions() -> None:
+    body = json.dumps(
+        {
+            "results": TRANSACTIONS,
+            "total_result_count": len(TRANSACTIONS),
+            "has_previous": False,
+            "has_next": False,
+        }
+    ).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        chunks = [body[i : i + 100] for i in range(0, len(body), 100)]
+        return httpx.Response(200, stream=httpx.ByteStream(b"".join(chunks)))
+
+    async def main() -> tuple[list[str], dict[str, Any]]:
+        client = AsyncVoltageParkClient(token="test-token")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            stream = await client.stream_billing_transactions(limit=10)
+            ids = [transaction.id async for transaction in stream]
+            return ids, stream.envelope
+
+    ids, envelope = asyncio.run(main())
+    assert ids == [t["id"] for t in TRANSACTIONS]
+    assert envelope["total_result_count"] == len(TRANSACTIONS)
+
+
+def test_null_envelope_fields() -> None:
+    stream = StreamedList(
+        [b'{"results": [], "note": null}'], "results", TypeAdapter(int)
+    )
+
+    assert list(stream) == []
+    assert stream.envelope == {"note": None}
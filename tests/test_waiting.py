@@ -0,0 +1,143 @@
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+import pytest
+import requests
+
+from tests.conftest import FakeAdapter, baremetal_rental, list_page, virtual_machine
+from voltage_park_sdk import AsyncVoltageParkClient, VoltageParkClient
+from voltage_park_sdk.waiting import (
+    ResourceNotFoundError,
+    ResourceStateError,
+    async_wait_for,
+    wait_for,
+)
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+# The statuses each VM reports on successive polls; the last one sticks.
+TIMELINES = {
+    "vm-1": ["Stopped", "Running"],
+    "vm-2": ["Stopped", "Stopped", "Stopped", "Running"],
+    "vm-3": ["Stopped", "Terminated"],
+    "vm-4": ["Stopped"],
+}
+
+
+def vm_statuses(tick: int) -> list[dict[str, Any]]:
+    return [
+        virtual_machine(vm_id, status=timeline[min(tick, len(timeline) - 1)])
+        for vm_id, timeline in TIMELINES.items()
+    ]
+
+
+def test_wait_for_resolves_each_resource(make_client: MakeClient) -> None:
+    ticks = 0
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal ticks
+        ticks += 1
+        return 200, list_page(vm_statuses(ticks - 1), request)
+
+    client, _ = make_client(handler)
+    futures = wait_for(
+        client,
+        TIMELINES,
+        {"Running"},
+        fail_states={"Terminated"},
+        timeout=0.5,
+        interval=0.01,
+    )
+
+    assert futures["vm-1"].result(5).status == "Running"
+    assert futures["vm-2"].result(5).status == "Running"
+    with pytest.raises(ResourceStateError) as excinfo:
+        futures["vm-3"].result(5)
+    assert excinfo.value.resource.id == "vm-3"
+    with pytest.raises(TimeoutError):
+        futures["vm-4"].result(5)
+    # One list call per tick, however many resources are being waited on.
+    assert ticks < 60
+
+
+def test_wait_for_keeps_polling_through_api_errors(make_client: MakeClient) -> None:
+    ticks = 0
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal ticks
+        ticks += 1
+        if ticks == 1:
+            return 400, {"detail": "Bad request"}
+        return 200, list_page([baremetal_rental("bm-1")], request)
+
+    client, _ = make_client(handler)
+    futures = wait_for(
+        client, ["bm-1"], {"Running"}, kind="baremetal_rental", interval=0.01
+    )
+    assert futures["bm-1"].result(5).id == "bm-1"
+
+    client, _ = make_client(lambda _: (403, {"detail": "Forbidden"}))
+    futures = wait_for(
+        client, ["bm-1"], {"Running"}, kind="baremetal_rental", timeout=0.05
+    )
+    with pytest.raises(TimeoutError) as excinfo:
+        futures["bm-1"].result(5)
+    assert isinstance(excinfo.value.__cause__, requests.HTTPError)
+
+
+def test_wait_for_fails_missing_resources(make_client: MakeClient) -> None:
+    client, _ = make_client(lambda r: (200, list_page([virtual_machine("vm-1")], r)))
+    futures = wait_for(client, ["vm-1", "vm-gone"], {"Running"}, interval=0.01)
+    assert futures["vm-1"].result(5).id == "vm-1"
+    with pytest.raises(ResourceNotFoundError):
+        futures["vm-gone"].result(5)
+
+
+def test_polling_stops_once_every_future_is_cancelled(
+    make_client: MakeClient,
+) -> None:
+    ticks = 0
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        nonlocal ticks
+        ticks += 1
+        return 200, list_page([virtual_machine("vm-1", status="Stopped")], request)
+
+    client, _ = make_client(handler)
+    futures = wait_for(client, ["vm-1"], {"Running"}, interval=0.01, max_interval=0.01)
+    time.sleep(0.05)
+    assert ticks > 0
+    assert futures["vm-1"].cancel()
+
+    time.sleep(0.05)
+    stopped_at = ticks
+    time.sleep(0.1)
+    assert ticks == stopped_at
+
+
+def test_async_wait_for() -> None:
+    ticks = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal ticks
+        ticks += 1
+        status = "Pending" if ticks < 3 else "Running"
+        rentals = [baremetal_rental("bm-1", status=status)]
+        page = list_page(rentals, requests.Request("GET", "https://x").prepare())
+        return httpx.Response(200, json=page)
+
+    async def main() -> str:
+        client = AsyncVoltageParkClient(token="test-token")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            futures = async_wait_for(
+                client, ["bm-1"], {"Running"}, kind="baremetal_rental", interval=0.01
+            )
+            rental = await asyncio.wait_for(futures["bm-1"], 5)
+        return rental.status
+
+    assert asyncio.run(main()) == "Running"
+    assert ticks == 3
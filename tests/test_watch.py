@@ -0,0 +1,122 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+from tests.conftest import (
+    FakeAdapter,
+    baremetal_location,
+    baremetal_rental,
+    list_page,
+    virtual_machine,
+    vm_preset,
+)
+from voltage_park_sdk import VoltageParkClient
+from voltage_park_sdk.watch import CapacityEvent, CapacityWatcher, ResourceWatcher
+
+MakeClient = Callable[..., tuple[VoltageParkClient, FakeAdapter]]
+
+
+def capacity_handler(
+    capacity: dict[str, int],
+) -> Callable[[requests.PreparedRequest], tuple[int, Any]]:
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if (request.url or "").endswith("bare-metal/locations/"):
+            location = baremetal_location(
+                "loc-1",
+                gpu_count_ethernet=capacity["ethernet"],
+                gpu_count_infiniband=capacity["infiniband"],
+            )
+            return 200, list_page([location], request)
+        presets = [vm_preset("preset-1", available_vms=capacity["vms"])]
+        return 200, list_page([{"id": "loc-1", "available_presets": presets}], request)
+
+    return handler
+
+
+def test_capacity_watcher_diffs_snapshots(make_client: MakeClient) -> None:
+    capacity = {"ethernet": 0, "infiniband": 8, "vms": 2}
+    client, _ = make_client(capacity_handler(capacity))
+    watcher = CapacityWatcher(client, interval=1, max_interval=4, backoff=2)
+    received: list[CapacityEvent] = []
+    unsubscribe = watcher.subscribe(received.append)
+
+    assert [e.previous for e in watcher.poll()] == [None, None, None]
+    assert watcher.poll() == []
+    assert watcher.interval == 2
+
+    capacity["ethernet"] = 16
+    capacity["vms"] = 1
+    events = watcher.poll()
+
+    assert [(e.pool, e.previous, e.current, e.delta) for e in events] == [
+        ("ethernet", 0, 16, 16),
+        ("preset-1", 2, 1, -1),
+    ]
+    assert watcher.interval == 1
+    assert received[-2:] == events
+    unsubscribe()
+    capacity["vms"] = 0
+    watcher.poll()
+    assert len(received) == 5
+
+
+def test_capacity_watcher_async_events(make_client: MakeClient) -> None:
+    capacity = {"ethernet": 0, "infiniband": 0, "vms": 0}
+    client, _ = make_client(capacity_handler(capacity))
+    watcher = CapacityWatcher(client, interval=0.01)
+    watcher.poll()
+
+    async def main() -> CapacityEvent:
+        events = watcher.events()
+        with watcher:
+            first = asyncio.ensure_future(anext(events))
+            await asyncio.sleep(0.05)
+            capacity["infiniband"] = 8
+            event = await asyncio.wait_for(first, 5)
+        await events.aclose()
+        return event
+
+    event = asyncio.run(main())
+    assert (event.kind, event.pool, event.current) == ("baremetal", "infiniband", 8)
+
+
+def test_resource_watcher_events(make_client: MakeClient) -> None:
+    vms = [virtual_machine("vm-1"), virtual_machine("vm-2")]
+    rentals = [baremetal_rental("bm-1", status="Pending")]
+
+    def handler(request: requests.PreparedRequest) -> tuple[int, Any]:
+        if "bare-metal" in (request.url or ""):
+            return 200, list_page(rentals, request)
+        return 200, list_page(vms, request)
+
+    client, _ = make_client(handler)
+    watcher = ResourceWatcher(client, interval=1, max_interval=4, backoff=2)
+
+    assert [(e.type, e.resource.id) for e in watcher.poll()] == [
+        ("added", "vm-1"),
+        ("added", "vm-2"),
+        ("added", "bm-1"),
+    ]
+    # A pending rental keeps the interval short.
+    assert watcher.poll() == []
+    assert watcher.interval == 1
+
+    vms[0] = virtual_machine("vm-1", status="Stopped", tags=["idle"])
+    del vms[1]
+    rentals[0] = baremetal_rental("bm-1")
+    events = {e.resource.id: e for e in watcher.poll()}
+
+    assert events["vm-1"].type == "modified"
+    assert events["vm-1"].changed_fields == ("status", "tags")
+    assert events["vm-1"].previous is not None
+    assert events["vm-1"].previous.status == "Running"
+    assert events["vm-2"].type == "removed"
+    assert events["bm-1"].type == "modified"
+    assert {"status", "power_status", "node_networking"} <= set(
+        events["bm-1"].changed_fields
+    )
+
+    assert watcher.poll() == []
+    assert watcher.interval == 2